@@ -0,0 +1,74 @@
+# Genesis_AI/benchmark_ambientes.py (VELOCIDADE DOS AMBIENTES LADO A LADO)
+"""
+Mede env-steps/s dos quatro ambientes Gym (todos sobre trading_env_core.py)
+e do VecTradingEnv com ações aleatórias, no mesmo dataset sintético.
+
+Uso: python benchmark_ambientes.py
+"""
+import time
+import numpy as np
+import pandas as pd
+from crypto_env import CryptoTradingEnv
+from crypto_env_advanced import AdvancedCryptoTradingEnv
+from market_env import CryptoGenesisEnv
+from fixed_trading_env import RealisticTradingEnv
+
+N_CANDLES = 50_000
+N_FEATURES = 20
+N_PASSOS = 20_000
+LOOKBACK = 50
+
+
+def gerar_dataset(n, semente=7):
+    rng = np.random.default_rng(semente)
+    df = pd.DataFrame(rng.normal(size=(n, N_FEATURES)), columns=[f"f{i}" for i in range(N_FEATURES)])
+    df['close'] = 100 * np.exp(np.cumsum(rng.normal(0, 0.003, n)))
+    return df
+
+
+def medir(env, acoes):
+    env.reset()
+    inicio = time.perf_counter()
+    for acao in acoes:
+        if env.step(acao)[2]:
+            env.reset()
+    return len(acoes) / (time.perf_counter() - inicio)
+
+
+def main():
+    df = gerar_dataset(N_CANDLES)
+    df_norm = df.drop(columns=['close'])
+    acoes = np.random.default_rng(1).integers(0, 4, N_PASSOS)
+
+    ambientes = [
+        ("CryptoTradingEnv", lambda: CryptoTradingEnv(df)),
+        ("AdvancedCryptoTradingEnv", lambda: AdvancedCryptoTradingEnv(df, lookback_window=LOOKBACK)),
+        ("CryptoGenesisEnv", lambda: CryptoGenesisEnv(df)),
+        ("RealisticTradingEnv", lambda: RealisticTradingEnv(df_norm, df[['close']], lookback_window=LOOKBACK)),
+    ]
+
+    print(f"{'Ambiente':<26} | {'Obs':>12} | {'steps/s':>10}")
+    print("-" * 56)
+    for nome, criar in ambientes:
+        env = criar()
+        print(f"{nome:<26} | {str(env.observation_space.shape):>12} | {medir(env, acoes):>10,.0f}")
+
+    # Versão vetorizada (precisa do stable_baselines3)
+    try:
+        from vec_trading_env import VecTradingEnv
+    except ImportError:
+        print("⚠️ stable_baselines3 não instalado: VecTradingEnv fora do benchmark.")
+        return
+    for n_envs in (16, 64, 256):
+        env = VecTradingEnv(df_norm, df[['close']], n_envs=n_envs, lookback_window=LOOKBACK, seed=0)
+        env.reset()
+        lotes = np.random.default_rng(1).integers(0, 4, (N_PASSOS // n_envs, n_envs))
+        inicio = time.perf_counter()
+        for lote in lotes:
+            env.step(lote)
+        velocidade = lotes.size / (time.perf_counter() - inicio)
+        print(f"{f'VecTradingEnv x{n_envs}':<26} | {str(env.observation_space.shape):>12} | {velocidade:>10,.0f}")
+
+
+if __name__ == "__main__":
+    main()
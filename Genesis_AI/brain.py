@@ -5,6 +5,9 @@ from stable_baselines3.common.vec_env import DummyVecEnv
 from stable_baselines3.common.callbacks import BaseCallback
 from market_env import CryptoGenesisEnv
 import pandas as pd
+import sys
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from armazem_dataset import carregar_dataset
 
 class GenesisBrain:
     def __init__(self, dataset_path, model_path="cerebros/genesis_v1"):
@@ -14,7 +17,7 @@ class GenesisBrain:
         
         # Carrega dados (Memória Histórica)
         try:
-            self.df = pd.read_csv(dataset_path)
+            self.df = carregar_dataset(dataset_path)
             # Limpeza para garantir que a IA só vê números
             self.df = self.df.select_dtypes(include=['float64', 'int64'])
             if 'target' in self.df.columns:
@@ -2,13 +2,17 @@
 import pandas as pd
 import numpy as np
 from fixed_trading_env import RealisticTradingEnv
+import sys
+import os
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from armazem_dataset import carregar_dataset
 
 def debug_environment():
     print("🔧 DEBUG DO AMBIENTE DE TRADING")
     print("="*50)
     
     # Carrega dados pequenos para teste
-    df = pd.read_csv("../Binance/dataset_v11_fusion.csv").head(1000)
+    df = carregar_dataset("../Binance/dataset_v11_fusion.csv", linhas=(0, 1000))
     price_data = df['close'].values
     
     # Features normalizadas
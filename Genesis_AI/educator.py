@@ -1,6 +1,6 @@
 # Genesis_AI/educator.py
 from brain import GenesisBrain
-import os
+from armazem_dataset import existe_dataset  # brain já pôs a pasta pai no sys.path
 
 # Caminho para os dados ricos que já mineramos na pasta Binance
 DATASET_PATH = "../Binance/dataset_v11_fusion.csv"
@@ -28,7 +28,7 @@ def iniciar_educacao():
         print(f"✅ Ciclo {i+1} concluído. O cérebro está a evoluir.")
 
 if __name__ == "__main__":
-    if not os.path.exists(DATASET_PATH):
+    if not existe_dataset(DATASET_PATH):
         print(f"❌ ERRO: Não encontrei {DATASET_PATH}")
         print("   Por favor, vá na pasta 'Binance' e rode 'python gerar_dataset_v11_fusion.py' primeiro.")
     else:
@@ -1,12 +1,15 @@
 # Genesis_AI/features_engine.py
 import pandas as pd
-import pandas_ta as ta
 import numpy as np
 import sys
 import os
 
-# Tenta importar a Calculadora da pasta Binance se necessário, 
-# mas vamos re-implementar o essencial aqui para ser autônomo.
+# Kernels de indicadores (NumPy puro) ficam na pasta Binance
+_pasta_binance = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+if _pasta_binance not in sys.path:
+    sys.path.append(_pasta_binance)
+import indicadores_numpy as K
+
 class FeaturesEngine:
     """
     O Motor de Engenharia de Features do Gênesis.
@@ -43,34 +46,39 @@ class FeaturesEngine:
             # 2. ENGENHARIA DE FEATURES (V11 FUSION)
             # -----------------------------------------------------------
 
-            # A. Momentum Multi-Tempo
-            for p in [3, 5, 10, 20]:
-                df[f'mom_{p}'] = df['close'].pct_change(p)
+            close = df['close'].to_numpy(dtype=float)
+            volume = df['volume'].to_numpy(dtype=float)
+            feats = {}  # Kernels NumPy; as colunas entram no df de uma vez no final
+
+            with np.errstate(divide='ignore', invalid='ignore'):
+                # A. Momentum Multi-Tempo
+                for p in [3, 5, 10, 20]:
+                    feats[f'mom_{p}'] = K.variacao_pct(close, p)
+
+                # B. Volatilidade Relativa
+                retorno = K.variacao_pct(close, 1)
+                feats['vol_ratio'] = K.desvio_movel(retorno, 5) / K.desvio_movel(retorno, 20)
 
-            # B. Volatilidade Relativa
-            vol_curta = df['close'].pct_change().rolling(5).std()
-            vol_longa = df['close'].pct_change().rolling(20).std()
-            df['vol_ratio'] = vol_curta / vol_longa
+                # C. Posição no Canal (Donchian)
+                max_20 = K.maximo_movel(df['high'].to_numpy(dtype=float), 20)
+                min_20 = K.minimo_movel(df['low'].to_numpy(dtype=float), 20)
+                # Evita divisão por zero se max == min
+                denom = max_20 - min_20
+                feats['pos_canal'] = np.where(denom == 0, 0.5, (close - min_20) / denom)
 
-            # C. Posição no Canal (Donchian)
-            max_20 = df['high'].rolling(20).max()
-            min_20 = df['low'].rolling(20).min()
-            # Evita divisão por zero se max == min
-            denom = max_20 - min_20
-            df['pos_canal'] = np.where(denom == 0, 0.5, (df['close'] - min_20) / denom)
+                # D. Força da Tendência (EMA)
+                ema9 = K.ema(close, 9)
+                ema21 = K.ema(close, 21)
+                feats['trend_str'] = (ema9 - ema21) / ema21
 
-            # D. Força da Tendência (EMA)
-            ema9 = df.ta.ema(close=df['close'], length=9)
-            ema21 = df.ta.ema(close=df['close'], length=21)
-            df['trend_str'] = (ema9 - ema21) / ema21
+                # E. Explosão de Volume (Volume Surge)
+                feats['vol_surge'] = volume / K.media_movel(volume, 20)
 
-            # E. Explosão de Volume (Volume Surge)
-            vol_med = df['volume'].rolling(20).mean()
-            df['vol_surge'] = df['volume'] / vol_med
+                # F. Contexto Bitcoin (O Chefe)
+                feats['btc_mom'] = K.variacao_pct(df['btc_close'].to_numpy(dtype=float), 5)
+                feats['rel_str'] = feats['mom_5'] - feats['btc_mom'] # Força Relativa
 
-            # F. Contexto Bitcoin (O Chefe)
-            df['btc_mom'] = df['btc_close'].pct_change(5)
-            df['rel_str'] = df['mom_5'] - df['btc_mom'] # Força Relativa
+            df = pd.concat([df.drop(columns=list(feats), errors='ignore'), pd.DataFrame(feats, index=df.index)], axis=1)
 
             # 3. Limpeza e Tratamento
             # Remove infinitos gerados por divisão por zero
@@ -10,6 +10,8 @@ import os
 # Adiciona o diretório pai ao path para importar módulos
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'Binance')))
 from features_engine import FeaturesEngine
+from contexto_mercado import obter_contexto
+from normalizacao import obter_normalizacao
 
 # --- CONFIGURAÇÃO ---
 MODELO_PATH = "cerebros/genesis_v2_stable"
@@ -31,6 +33,7 @@ class GenesisTrader:
             exit()
             
         self.con = BinanceConnector()
+        self.contexto = obter_contexto(self.con)
         self.posicao = 0  # 0=Neutro, 1=Long, -1=Short
         
         # Carrega estatísticas de normalização do dataset de treino
@@ -39,14 +42,14 @@ class GenesisTrader:
     def _carregar_parametros_normalizacao(self):
         """Carrega médias e desvios padrão do dataset de treino para normalização"""
         try:
-            df_ref = pd.read_csv('../Binance/dataset_v11_fusion.csv')
-            
-            # Seleciona apenas as colunas numéricas que o modelo espera
+            # .meta.json do modelo; sem ele, calcula uma vez do dataset (só as colunas do modelo)
             colunas_modelo = FeaturesEngine.colunas_finais()
-            df_ref = df_ref[colunas_modelo]
+            norm = obter_normalizacao(MODELO_PATH, '../Binance/dataset_v11_fusion.csv', clip=5, colunas=colunas_modelo)
+            if norm is None:
+                raise FileNotFoundError("sem .meta.json e sem dataset de referência")
             
-            self.mean = df_ref.mean()
-            self.std = df_ref.std()
+            self.mean = norm.media
+            self.std = norm.desvio
             print("📊 Parâmetros de normalização carregados.")
             print(f"📈 {len(colunas_modelo)} features: {colunas_modelo}")
         except Exception as e:
@@ -58,8 +61,8 @@ class GenesisTrader:
     def preparar_dados_live(self, df_moeda):
         """Prepara dados para inferência usando o mesmo processamento do treino"""
         try:
-            # 1. Baixa BTC (Contexto) - mesmo período
-            df_btc = self.con.buscar_candles("BTCUSDT", TIMEFRAME, limit=len(df_moeda))
+            # 1. BTC (Contexto) - mesmo período, compartilhado e baixado 1x por candle
+            df_btc = self.contexto.btc(TIMEFRAME, limit=len(df_moeda))
             if df_btc is None:
                 print("❌ Falha ao carregar dados do BTC")
                 return None
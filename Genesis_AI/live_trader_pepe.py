@@ -14,12 +14,14 @@ sys.path.append(parent_dir)
 
 from binance_connector import BinanceConnector
 from manager import GerenciadorEstado
+import config
 
 try:
     from features_engine import FeaturesEngine
 except ImportError:
     sys.path.append(current_dir)
     from features_engine import FeaturesEngine
+from normalizacao import obter_normalizacao
 
 # --- CONFIGURAÇÃO PEPE ---
 MODELO_NOME = "genesis_pepe_v1"
@@ -48,11 +50,22 @@ def salvar_estado_local(em_posicao, preco_entrada, lado_trade, max_pnl, valor_in
         "valor_investido": valor_inv
     }
     try:
+        if config.USAR_BANCO_SQLITE:
+            from banco_dados import banco_padrao
+            banco_padrao().salvar_posicao(PAR_ALVO, dados)
+            return
         with open(ARQUIVO_POSICAO, 'w') as f:
             json.dump(dados, f)
     except: pass
 
 def carregar_estado_local():
+    if config.USAR_BANCO_SQLITE:
+        try:
+            from banco_dados import banco_padrao
+            return banco_padrao().carregar_posicao(PAR_ALVO)
+        except Exception as e:
+            print(f"⚠️ Erro ao ler posição do banco: {e}")
+            return None
     if os.path.exists(ARQUIVO_POSICAO):
         try:
             with open(ARQUIVO_POSICAO, 'r') as f:
@@ -65,6 +78,9 @@ def main():
     
     try:
         con = BinanceConnector()
+        # Candles da moeda e do BTC chegam pelo WebSocket (sem polling REST)
+        con.iniciar_stream([PAR_ALVO, "BTCUSDT"], TIMEFRAME, tamanho=200)
+        con.obter_filtros(PAR_ALVO)  # Pré-carrega o exchangeInfo antes da primeira ordem
         gerenciador = GerenciadorEstado(saldo_inicial=200.0)
         
         # Modelo
@@ -76,20 +92,13 @@ def main():
         model = PPO.load(path)
         print("🧠 Cérebro PEPE Carregado!")
         
-        # Normalização (Carrega do Treino da PEPE)
-        df_ref_path = os.path.join(parent_dir, "dataset_pepe_clean.csv")
-        if os.path.exists(df_ref_path):
-            df_ref = pd.read_csv(df_ref_path)
-            df_num = df_ref.select_dtypes(include=[np.number])
-            cols_drop = ['target', 'timestamp', 'close']
-            df_clean = df_num.drop(columns=[c for c in cols_drop if c in df_num.columns])
-            COLS_TREINO = df_clean.columns.tolist()
-            global_mean = df_clean.mean()
-            global_std = df_clean.std()
-            print(f"📊 Visão Sincronizada ({len(COLS_TREINO)} features).")
+        # Normalização (do treino da PEPE, salva junto do modelo)
+        norm = obter_normalizacao(MODELO_PATH, os.path.join(parent_dir, "dataset_pepe_clean.csv"), clip=5, window_size=WINDOW_SIZE)
+        if norm is not None:
+            print(f"📊 Visão Sincronizada ({len(norm.colunas)} features).")
         else:
-            print("⚠️ Aviso: Dataset PEPE não encontrado. Usando normalização local.")
-            global_mean, global_std, COLS_TREINO = None, None, None
+            print("⚠️ Aviso: Normalização da PEPE não encontrada. Usando normalização local.")
+        janela = norm.window_size if norm is not None and norm.window_size else WINDOW_SIZE
 
         # RECUPERA ESTADO
         state = carregar_estado_local()
@@ -123,27 +132,19 @@ def main():
 
             # Processamento
             df_proc = FeaturesEngine.processar_dados(df_raw, df_btc)
-            if df_proc is None or len(df_proc) < WINDOW_SIZE: continue
+            if df_proc is None or len(df_proc) < janela: continue
 
-            # Prepara IA
-            if COLS_TREINO:
-                for col in COLS_TREINO:
-                    if col not in df_proc.columns: df_proc[col] = 0
-                df_features = df_proc[COLS_TREINO].copy()
+            # Prepara IA e Normaliza
+            if norm is not None:
+                df_norm = norm.aplicar(df_proc)
             else:
                 # Fallback
                 cols_ignore = ['timestamp', 'close', 'target']
                 df_numeric = df_proc.select_dtypes(include=[np.number])
                 df_features = df_numeric.drop(columns=[c for c in cols_ignore if c in df_numeric.columns])
-
-            # Normaliza
-            if global_mean is not None:
-                df_norm = (df_features - global_mean) / global_std
-            else:
                 df_norm = (df_features - df_features.mean()) / df_features.std()
-            
-            df_norm = df_norm.fillna(0).clip(-5, 5)
-            obs = df_norm.tail(WINDOW_SIZE).values.flatten()
+                df_norm = df_norm.fillna(0).clip(-5, 5)
+            obs = df_norm.tail(janela).values.flatten()
 
             # Decisão
             action, _ = model.predict(obs, deterministic=True)
@@ -247,7 +248,7 @@ def main():
             time.sleep(10)
 
         except KeyboardInterrupt:
-            print("\n🛑 Parando..."); break
+            print("\n🛑 Parando..."); con.parar_stream(); break
         except Exception as e:
             print(f"❌ Erro: {e}"); time.sleep(5)
 
@@ -19,6 +19,7 @@ try:
 except ImportError:
     sys.path.append(current_dir)
     from features_engine import FeaturesEngine
+from normalizacao import obter_normalizacao
 
 # CONFIG
 MODELO_NOME = "genesis_wld_v2" 
@@ -37,6 +38,9 @@ def main():
     
     try:
         con = BinanceConnector()
+        # Candles da moeda e do BTC chegam pelo WebSocket (sem polling REST)
+        con.iniciar_stream([PAR_ALVO, "BTCUSDT"], TIMEFRAME, tamanho=200)
+        con.obter_filtros(PAR_ALVO)  # Pré-carrega o exchangeInfo antes da primeira ordem
         
         # Sincroniza Saldo Inicial
         saldo_binance = con.obter_saldo_usdt()
@@ -48,13 +52,10 @@ def main():
         if not os.path.exists(path): print(f"❌ Modelo não achado."); return
         model = PPO.load(path)
         
-        # Normalização
-        df_ref = pd.read_csv(os.path.join(parent_dir, "dataset_wld_clean.csv"))
-        df_num = df_ref.select_dtypes(include=[np.number])
-        cols_drop = ['target', 'timestamp', 'close']
-        df_clean = df_num.drop(columns=[c for c in cols_drop if c in df_num.columns])
-        COLS_TREINO = df_clean.columns.tolist()
-        global_mean = df_clean.mean(); global_std = df_clean.std()
+        # Normalização do treino (cerebros/<modelo>.meta.json)
+        norm = obter_normalizacao(MODELO_PATH, os.path.join(parent_dir, "dataset_wld_clean.csv"), clip=5, window_size=WINDOW_SIZE)
+        if norm is None: print(f"❌ Normalização do modelo não encontrada."); return
+        janela = norm.window_size or WINDOW_SIZE
 
     except Exception as e: print(f"❌ Erro init: {e}"); return
 
@@ -109,15 +110,11 @@ def main():
 
             # 2. Features
             df_proc = FeaturesEngine.processar_dados(df_raw, df_btc)
-            if df_proc is None or len(df_proc) < WINDOW_SIZE: continue
+            if df_proc is None or len(df_proc) < janela: continue
 
             # 3. Prep IA
-            for col in COLS_TREINO:
-                if col not in df_proc.columns: df_proc[col] = 0
-            df_feat = df_proc[COLS_TREINO].copy()
-            df_norm = (df_feat - global_mean) / global_std
-            df_norm = df_norm.fillna(0).clip(-5, 5)
-            obs = df_norm.tail(WINDOW_SIZE).values.flatten()
+            df_norm = norm.aplicar(df_proc)
+            obs = df_norm.tail(janela).values.flatten()
 
             # 4. Decisão
             action, _ = model.predict(obs, deterministic=True)
@@ -171,7 +168,7 @@ def main():
                     # Usa a quantidade exata da Binance
                     qtd_saida = posicao_real['qtd'] if posicao_real else qtd_posicao
                     
-                    res = con.client.futures_create_order(symbol=PAR_ALVO, side=lado_saida, type='MARKET', quantity=qtd_saida)
+                    res = con.chamar('futures_create_order', symbol=PAR_ALVO, side=lado_saida, type='MARKET', quantity=qtd_saida)
                     
                     if res and 'status' in res and res['status'] == 'FILLED':
                         preco_saida = float(res['avgPrice'])
@@ -206,7 +203,7 @@ def main():
                             # Limpa ordens velhas
                             con.cancelar_todas_ordens(PAR_ALVO)
                             
-                            ordem = con.client.futures_create_order(symbol=PAR_ALVO, side=tipo, type='MARKET', quantity=qtd)
+                            ordem = con.chamar('futures_create_order', symbol=PAR_ALVO, side=tipo, type='MARKET', quantity=qtd)
                             
                             if ordem and 'status' in ordem and ordem['status'] == 'FILLED':
                                 preco_exec = float(ordem['avgPrice'])
@@ -240,7 +237,7 @@ def main():
             time.sleep(10)
 
         except KeyboardInterrupt:
-            print("\n🛑 Parando..."); break
+            print("\n🛑 Parando..."); con.parar_stream(); break
         except Exception as e:
             print(f"❌ Erro Loop: {e}"); time.sleep(5)
 
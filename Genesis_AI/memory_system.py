@@ -1,12 +1,22 @@
 # Genesis_AI/memory_system.py (PADRONIZADO PARA 'CLOSE')
 import pandas as pd
 import os
+import sys
 from datetime import datetime
 
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+import config
+
 class MemorySystem:
     def __init__(self, filename="genesis_memory.csv"):
+        self.filename = filename
         self.memory_file = os.path.join(os.path.dirname(__file__), filename)
         self.buffer = []
+        # Com config.USAR_BANCO_SQLITE as experiências vão para a tabela `memoria` do banco
+        self.banco = None
+        if config.USAR_BANCO_SQLITE:
+            from banco_dados import banco_padrao
+            self.banco = banco_padrao()
 
     def memorizar(self, df_features, action, reward, preco_real):
         """
@@ -37,17 +47,31 @@ class MemorySystem:
     def consolidar_memoria(self):
         if not self.buffer: return
         
-        df_new = pd.DataFrame(self.buffer)
-        header = not os.path.exists(self.memory_file)
-        
-        # Modo append (adicionar ao final)
-        df_new.to_csv(self.memory_file, mode='a', header=header, index=False)
+        if self.banco is not None:
+            self.banco.memorizar(self.buffer, origem=self.filename)
+        else:
+            df_new = pd.DataFrame(self.buffer)
+            header = not os.path.exists(self.memory_file)
+            
+            # Modo append (adicionar ao final)
+            df_new.to_csv(self.memory_file, mode='a', header=header, index=False)
         print(f"🧠 Memória consolidada: {len(self.buffer)} registros.")
         self.buffer = []
 
     def carregar_memoria_recente(self):
+        if self.banco is not None:
+            df = self.banco.carregar_memoria(origem=self.filename)
+            return df if not df.empty else None
         if os.path.exists(self.memory_file):
             try:
                 return pd.read_csv(self.memory_file)
             except: return None
-        return None
\ No newline at end of file
+        return None
+
+    def esquecer(self):
+        """Apaga a memória curta já absorvida (o CSV fica só com o cabeçalho)"""
+        if self.banco is not None:
+            self.banco.esquecer_memoria(origem=self.filename)
+        elif os.path.exists(self.memory_file):
+            colunas = pd.read_csv(self.memory_file, nrows=0).columns
+            pd.DataFrame(columns=colunas).to_csv(self.memory_file, index=False)
@@ -0,0 +1,137 @@
+# Genesis_AI/normalizacao.py (ESTATÍSTICAS DE NORMALIZAÇÃO JUNTO DO MODELO)
+"""
+Z-score do treino salvo ao lado do cérebro: cerebros/<modelo>.meta.json.
+
+O arquivo guarda a lista de features (na ordem do treino), o tamanho da
+janela, média e desvio de cada feature, o clip e um hash dos dados de
+treino. Live traders e testes carregam esse arquivo em vez de reler o CSV
+de treino, e normalizam exatamente como o modelo viu no treino.
+
+Uso no treino:
+    norm = NormalizacaoModelo.ajustar(df_features, clip=5, window_size=WINDOW, dataset=DADOS)
+    df_norm = norm.aplicar(df_features)
+    ...
+    model.save(MODELO); norm.salvar(MODELO)
+
+Uso no live / teste:
+    norm = NormalizacaoModelo.carregar(MODELO)
+    obs = norm.aplicar(df_proc).tail(norm.window_size).values.flatten()
+"""
+import os
+import json
+import hashlib
+import numpy as np
+import pandas as pd
+
+EXTENSAO_META = ".meta.json"
+COLUNAS_FORA = ['target', 'timestamp', 'close']  # Nunca entram como feature
+
+
+def caminho_meta(caminho_modelo):
+    """cerebros/genesis_x(.zip) -> cerebros/genesis_x.meta.json"""
+    base = caminho_modelo[:-4] if caminho_modelo.endswith(".zip") else caminho_modelo
+    return base + EXTENSAO_META
+
+
+def hash_dados(df):
+    """Impressão digital do conteúdo (independe de CSV/Parquet e do índice)"""
+    valores = pd.util.hash_pandas_object(df, index=False).values
+    return hashlib.sha256(valores.tobytes()).hexdigest()[:16]
+
+
+class NormalizacaoModelo:
+    def __init__(self, colunas, media, desvio, clip, window_size, dataset_hash=None, dataset=None):
+        self.colunas = list(colunas)
+        self.media = pd.Series(media, index=self.colunas, dtype=float)
+        self.desvio = pd.Series(desvio, index=self.colunas, dtype=float)
+        self.clip = clip
+        self.window_size = window_size
+        self.dataset_hash = dataset_hash
+        self.dataset = dataset
+
+    @classmethod
+    def ajustar(cls, df_features, clip, window_size, dataset=None):
+        """Calcula média/desvio das features de treino (mesmo mean()/std() do pandas)"""
+        return cls(df_features.columns, df_features.mean(), df_features.std(), clip, window_size,
+                   dataset_hash=hash_dados(df_features), dataset=dataset)
+
+    def aplicar(self, df):
+        """Features do modelo na ordem do treino (faltantes = 0), z-score e clip"""
+        df_feat = df.reindex(columns=self.colunas, fill_value=0)
+        df_norm = (df_feat - self.media) / self.desvio
+        return df_norm.fillna(0).clip(-self.clip, self.clip)
+
+    def salvar(self, caminho_modelo):
+        dados = {
+            'colunas': self.colunas,
+            'window_size': self.window_size,
+            'media': self.media.tolist(),
+            'desvio': self.desvio.tolist(),
+            'clip': self.clip,
+            'dataset_hash': self.dataset_hash,
+            'dataset': self.dataset,
+        }
+        destino = caminho_meta(caminho_modelo)
+        temp = destino + ".tmp"
+        with open(temp, 'w', encoding='utf-8') as f:
+            json.dump(dados, f, indent=2)
+        os.replace(temp, destino)
+        print(f"📐 Normalização salva: {destino}")
+
+    @classmethod
+    def carregar(cls, caminho_modelo):
+        """Normalização do modelo, ou None se o .meta.json não existir"""
+        origem = caminho_meta(caminho_modelo)
+        if not os.path.exists(origem):
+            return None
+        try:
+            with open(origem, 'r', encoding='utf-8') as f:
+                dados = json.load(f)
+            return cls(dados['colunas'], dados['media'], dados['desvio'], dados['clip'],
+                       dados['window_size'], dados.get('dataset_hash'), dados.get('dataset'))
+        except Exception as e:
+            print(f"⚠️ Erro ao ler {origem}: {e}")
+            return None
+
+
+def features_numericas(df, colunas_fora=COLUNAS_FORA):
+    """Colunas numéricas do dataset menos as que não são input da IA"""
+    df_num = df.select_dtypes(include=[np.number])
+    return df_num.drop(columns=[c for c in colunas_fora if c in df_num.columns])
+
+
+def obter_normalizacao(caminho_modelo, dataset, clip=5, window_size=None, colunas=None):
+    """
+    Normalização do modelo pelo .meta.json. Modelos antigos (sem meta) caem no
+    cálculo a partir do dataset de treino uma única vez, e o meta é gravado
+    para as próximas partidas. Retorna None se nem o dataset existir.
+    """
+    norm = NormalizacaoModelo.carregar(caminho_modelo)
+    if norm is not None:
+        return norm
+
+    from armazem_dataset import carregar_dataset, existe_dataset
+    if not existe_dataset(dataset):
+        return None
+    print(f"⚠️ {os.path.basename(caminho_meta(caminho_modelo))} não encontrado: calculando a partir de {dataset}")
+    df_ref = carregar_dataset(dataset, colunas=colunas)
+    df_feat = df_ref[colunas] if colunas else features_numericas(df_ref)
+    norm = NormalizacaoModelo.ajustar(df_feat, clip, window_size, dataset=dataset)
+    try:
+        norm.salvar(caminho_modelo)
+    except Exception as e:
+        print(f"⚠️ Não foi possível salvar a normalização: {e}")
+    return norm
+
+
+def normalizar_com_modelo(caminho_modelo, df_features, clip=5):
+    """
+    Normaliza dados de teste com as estatísticas do treino do modelo. Sem
+    .meta.json, cai no z-score dos próprios dados (comportamento antigo) e avisa.
+    """
+    norm = NormalizacaoModelo.carregar(caminho_modelo)
+    if norm is not None:
+        return norm.aplicar(df_features)
+    print("⚠️ Modelo sem .meta.json: normalizando com as estatísticas do próprio período de teste.")
+    df_norm = (df_features - df_features.mean()) / df_features.std()
+    return df_norm.fillna(0).clip(-clip, clip)
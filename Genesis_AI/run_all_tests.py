@@ -10,6 +10,7 @@ import matplotlib.pyplot as plt
 # Importa as classes necessárias
 from test_genesis_performance import PerformanceTester
 from fixed_trading_env import RealisticTradingEnv
+from armazem_dataset import existe_dataset  # test_genesis_performance já pôs a pasta pai no sys.path
 
 def run_comprehensive_test_suite():
     print("🧪 INICIANDO SUITE DE TESTES GENESIS (WLD V2)")
@@ -23,10 +24,10 @@ def run_comprehensive_test_suite():
     data_path = "../Binance/dataset_wld_clean.csv"
     
     # Verificação de segurança do caminho dos dados
-    if not os.path.exists(data_path):
-        if os.path.exists("dataset_wld_clean.csv"):
+    if not existe_dataset(data_path):
+        if existe_dataset("dataset_wld_clean.csv"):
             data_path = "dataset_wld_clean.csv"
-        elif os.path.exists("Binance/dataset_wld_clean.csv"):
+        elif existe_dataset("Binance/dataset_wld_clean.csv"):
             data_path = "Binance/dataset_wld_clean.csv"
     
     try:
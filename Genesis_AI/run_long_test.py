@@ -9,6 +9,10 @@ import sys
 # Importa ambiente
 sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 from fixed_trading_env import RealisticTradingEnv
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from decimacao import decimar
+from armazem_dataset import carregar_dataset, existe_dataset
+from normalizacao import normalizar_com_modelo
 
 # CONFIG
 MODELO_PATH = "Genesis_AI/cerebros/genesis_wld_veteran"
@@ -18,21 +22,20 @@ WINDOW_SIZE = 30
 def run_long_test():
     print("⏳ INICIANDO TESTE DE STRESS (DIAGNÓSTICO COMPLETO)...")
     
-    if not os.path.exists(DADOS_PATH):
+    if not existe_dataset(DADOS_PATH):
         print(f"❌ Erro: Dataset {DADOS_PATH} não encontrado.")
         return
 
     model = PPO.load(MODELO_PATH)
-    df = pd.read_csv(DADOS_PATH)
+    df = carregar_dataset(DADOS_PATH)
     
     # Separa Preço Real e Features
     price_data = df['close'].values
     cols_drop = ['timestamp', 'close', 'target']
     df_obs = df.drop(columns=[c for c in cols_drop if c in df.columns])
     
-    # Normaliza (Global)
-    df_norm = (df_obs - df_obs.mean()) / df_obs.std()
-    df_norm = df_norm.fillna(0).clip(-5, 5)
+    # Normaliza (estatísticas do treino do modelo)
+    df_norm = normalizar_com_modelo(MODELO_PATH, df_obs)
     
     # Ambiente
     env = DummyVecEnv([lambda: RealisticTradingEnv(
@@ -90,7 +93,7 @@ def run_long_test():
 
     # Gráfico
     plt.figure(figsize=(12, 6))
-    plt.plot(equity, label="Patrimônio", linewidth=1, color='red')
+    plt.plot(*decimar(equity), label="Patrimônio", linewidth=1, color='red')
     plt.axhline(y=10000, color='blue', linestyle='--', label="Inicial")
     plt.title(f"Stress Test 1 Ano (Drawdown: {lucro_pct:.2f}%)")
     plt.savefig("long_run_result.png")
@@ -9,6 +9,10 @@ import sys
 # Garante que encontra o ambiente
 sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 from fixed_trading_env import RealisticTradingEnv
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from decimacao import decimar
+from armazem_dataset import carregar_dataset, existe_dataset
+from normalizacao import normalizar_com_modelo
 
 # CONFIGURAÇÃO
 MODELO_PATH = "Genesis_AI/cerebros/genesis_pepe_v1"
@@ -18,7 +22,7 @@ WINDOW_SIZE = 50 # O treino da PEPE usou 50
 def run():
     print("🐸 TESTANDO GÊNESIS PEPE (Janela 50)...")
     
-    if not os.path.exists(DADOS_PATH):
+    if not existe_dataset(DADOS_PATH):
         print(f"❌ Erro: Dataset {DADOS_PATH} não encontrado.")
         return
 
@@ -28,7 +32,7 @@ def run():
 
     # 1. Carrega e Prepara
     model = PPO.load(MODELO_PATH)
-    df = pd.read_csv(DADOS_PATH)
+    df = carregar_dataset(DADOS_PATH)
     
     # Separa Teste (Últimos 20%)
     split = int(len(df) * 0.8)
@@ -40,9 +44,8 @@ def run():
     cols_drop = ['timestamp', 'close', 'target']
     df_obs = df_test.drop(columns=[c for c in cols_drop if c in df_test.columns])
     
-    # Normalização (Z-Score)
-    df_norm = (df_obs - df_obs.mean()) / df_obs.std()
-    df_norm = df_norm.fillna(0).clip(-5, 5)
+    # Normalização (Z-Score com as estatísticas do treino)
+    df_norm = normalizar_com_modelo(MODELO_PATH, df_obs)
     
     # 2. Ambiente
     env = DummyVecEnv([lambda: RealisticTradingEnv(
@@ -73,7 +76,7 @@ def run():
     # Gráfico
     try:
         plt.figure(figsize=(10, 6))
-        plt.plot(equity, label="Patrimônio PEPE", color='green')
+        plt.plot(*decimar(equity), label="Patrimônio PEPE", color='green')
         plt.axhline(y=10000, color='r', linestyle='--', label="Inicial")
         plt.title(f"Performance PEPE Specialist (Lucro: {lucro_pct:.2f}%)")
         plt.xlabel("Trades/Candles")
@@ -6,6 +6,11 @@ from fixed_trading_env import RealisticTradingEnv
 import matplotlib.pyplot as plt
 import os
 import numpy as np
+import sys
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from decimacao import decimar
+from armazem_dataset import carregar_dataset
+from normalizacao import normalizar_com_modelo
 
 def run_test():
     print("🧪 TESTANDO MODELO V13...")
@@ -14,15 +19,14 @@ def run_test():
     data_path = "../Binance/dataset_v11_fusion.csv"
     
     # Carrega Dados
-    raw = pd.read_csv(data_path)
+    raw = carregar_dataset(data_path)
     price = raw[['close']].copy()
     
     feat = raw.select_dtypes(include=[np.number])
     cols_drop = ['target', 'timestamp', 'close']
     feat = feat.drop(columns=[c for c in cols_drop if c in feat.columns])
     
-    norm = (feat - feat.mean()) / feat.std()
-    norm = norm.fillna(0).clip(-5, 5)
+    norm = normalizar_com_modelo(model_path, feat)
     
     # Teste nos últimos 20%
     test_size = int(0.2 * len(norm))
@@ -44,7 +48,7 @@ def run_test():
         
     print(f"💰 Saldo Final: ${equity[-1]:.2f}")
     
-    plt.plot(equity)
+    plt.plot(*decimar(equity))
     plt.title("Performance V13")
     plt.savefig("Genesis_AI/chart_v13.png")
     print("📉 Gráfico salvo.")
@@ -5,6 +5,11 @@ from stable_baselines3.common.vec_env import DummyVecEnv
 from fixed_trading_env import RealisticTradingEnv
 import matplotlib.pyplot as plt
 import os
+import sys
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from decimacao import decimar
+from armazem_dataset import carregar_dataset
+from normalizacao import normalizar_com_modelo
 
 def run():
     print("🧪 TESTANDO GÊNESIS WLD (Janela 50)...")
@@ -17,7 +22,7 @@ def run():
         return
 
     model = PPO.load(model_path)
-    df = pd.read_csv(data_path)
+    df = carregar_dataset(data_path)
     
     # Separa os últimos 20% para teste
     split = int(len(df) * 0.8)
@@ -29,9 +34,8 @@ def run():
     cols_drop = ['timestamp', 'close', 'target']
     df_obs = df_test.drop(columns=[c for c in cols_drop if c in df_test.columns])
     
-    # Normaliza
-    df_norm = (df_obs - df_obs.mean()) / df_obs.std()
-    df_norm = df_norm.fillna(0).clip(-5, 5)
+    # Normaliza (estatísticas do treino do modelo)
+    df_norm = normalizar_com_modelo(model_path, df_obs)
     
     # --- CORREÇÃO AQUI: Janela de 50 para bater com o treino ---
     env = DummyVecEnv([lambda: RealisticTradingEnv(
@@ -61,7 +65,7 @@ def run():
     
     # Gráfico
     plt.figure(figsize=(10, 6))
-    plt.plot(equity, label="Patrimônio")
+    plt.plot(*decimar(equity), label="Patrimônio")
     plt.axhline(y=10000, color='r', linestyle='--', label="Inicial")
     plt.title(f"Performance WLD Specialist (Lucro: {lucro_pct:.2f}%)")
     plt.xlabel("Trades/Candles")
@@ -2,11 +2,18 @@
 import pandas as pd
 import numpy as np
 import os
+import sys
 import shutil
 from datetime import datetime
 from stable_baselines3 import PPO
-from stable_baselines3.common.vec_env import DummyVecEnv
-from fixed_trading_env import RealisticTradingEnv
+from treino_paralelo import criar_ambiente_treino, MedidorVelocidade
+from normalizacao import obter_normalizacao
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+import config
+from diario_trades import DiarioTrades
+from armazem_dataset import carregar_dataset, existe_dataset
+from memory_system import MemorySystem
 
 # --- CONFIGURAÇÃO ---
 BASE_DIR = os.path.dirname(os.path.abspath(__file__))
@@ -15,20 +22,31 @@ ARQUIVO_FINANCEIRO = os.path.join(BASE_DIR, "..", "trades_history.csv")
 MEMORIA_RECENTE = os.path.join(BASE_DIR, "genesis_memory.csv")
 MODELO_ATUAL = os.path.join(BASE_DIR, "cerebros", "genesis_wld_v2") # Usamos a V2
 WINDOW_SIZE = 30
+N_WORKERS = None      # Processos de coleta (None = núcleos - 1; 1 = sem subprocessos)
+ENVS_POR_WORKER = 4   # Partidas por processo
+N_STEPS = 2048        # Tamanho do rollout (somando todas as partidas)
 
 def reconciliar_experiencias():
     """Cruza o que a IA viu com o que realmente aconteceu no bolso"""
-    if not os.path.exists(MEMORIA_RECENTE) or not os.path.exists(ARQUIVO_FINANCEIRO):
+    memoria = MemorySystem(os.path.basename(MEMORIA_RECENTE))
+    if config.USAR_BANCO_SQLITE:
+        from banco_dados import banco_padrao
+        diario = banco_padrao()
+    elif os.path.exists(ARQUIVO_FINANCEIRO):
+        diario = DiarioTrades(ARQUIVO_FINANCEIRO)
+    else:
         return None
     
     try:
         # Memória Sensorial (O que ela viu)
-        df_mem = pd.read_csv(MEMORIA_RECENTE)
-        # Memória Financeira (O resultado)
-        df_fin = pd.read_csv(ARQUIVO_FINANCEIRO)
-        
+        df_mem = memoria.carregar_memoria_recente()
+        if df_mem is None or df_mem.empty:
+            return df_mem
         # Converte timestamps para datetime para facilitar cruzamento (tolerância de 1 min)
         df_mem['dt'] = pd.to_datetime(df_mem['timestamp'], unit='s')
+        
+        # Memória Financeira (O resultado): só os trades do período da memória, pelo índice do diário
+        df_fin = diario.consultar(desde=df_mem['dt'].min().floor('D'))
         df_fin['dt'] = pd.to_datetime(df_fin['data']) # Assume formato YYYY-MM-DD HH:MM:SS
         
         # Vamos atribuir recompensa aos passos que levaram ao trade
@@ -48,7 +66,7 @@ def reconciliar_experiencias():
         
     except Exception as e:
         print(f"⚠️ Erro na reconciliação: {e}")
-        return pd.read_csv(MEMORIA_RECENTE) # Retorna memória bruta se falhar cruzamento
+        return memoria.carregar_memoria_recente() # Retorna memória bruta se falhar cruzamento
 
 def ciclo_de_sono():
     print("🌙 INICIANDO CICLO DE SONO (AUTO-APRIMORAMENTO V2)...")
@@ -63,13 +81,12 @@ def ciclo_de_sono():
     print(f"🧠 Processando {len(df_recente)} memórias consolidadas...")
 
     # 2. Carrega Conhecimento Base (Para estabilidade)
-    if os.path.exists(DATASET_TREINO_ORIGINAL):
-        df_antigo = pd.read_csv(DATASET_TREINO_ORIGINAL)
-        cols_comuns = [c for c in df_antigo.columns if c in df_recente.columns]
-        
-        # Mistura: 2000 candles antigos + O dia de hoje
+    if existe_dataset(DATASET_TREINO_ORIGINAL):
+        # Mistura: 2000 candles antigos + O dia de hoje (só a cauda é lida do armazém)
         # Foco maior no recente para adaptação rápida
-        df_treino_mix = pd.concat([df_antigo[cols_comuns].tail(2000), df_recente[cols_comuns]], ignore_index=True)
+        df_antigo = carregar_dataset(DATASET_TREINO_ORIGINAL, linhas=(-2000, None))
+        cols_comuns = [c for c in df_antigo.columns if c in df_recente.columns]
+        df_treino_mix = pd.concat([df_antigo[cols_comuns], df_recente[cols_comuns]], ignore_index=True)
     else:
         df_treino_mix = df_recente
 
@@ -81,15 +98,19 @@ def ciclo_de_sono():
 
         price_data = df_treino_mix['close'].values
 
-        # Features e Normalização
-        df_num = df_treino_mix.select_dtypes(include=[np.number])
-        cols_drop = ['target', 'timestamp', 'close', 'action', 'reward', 'pnl_pct', 'dt']
-        df_features = df_num.drop(columns=[c for c in cols_drop if c in df_num.columns])
-        
-        df_norm = (df_features - df_features.mean()) / df_features.std()
-        df_norm = df_norm.fillna(0).clip(-5, 5)
+        # Features e Normalização: as mesmas estatísticas que o live usa (.meta.json do modelo)
+        norm = obter_normalizacao(MODELO_ATUAL, DATASET_TREINO_ORIGINAL, clip=5, window_size=WINDOW_SIZE)
+        if norm is not None:
+            df_norm = norm.aplicar(df_treino_mix)
+        else:
+            df_num = df_treino_mix.select_dtypes(include=[np.number])
+            cols_drop = ['target', 'timestamp', 'close', 'action', 'reward', 'pnl_pct', 'dt']
+            df_features = df_num.drop(columns=[c for c in cols_drop if c in df_num.columns])
+            df_norm = (df_features - df_features.mean()) / df_features.std()
+            df_norm = df_norm.fillna(0).clip(-5, 5)
         
-        env = DummyVecEnv([lambda: RealisticTradingEnv(df_norm, price_data, lookback_window=WINDOW_SIZE)])
+        env = criar_ambiente_treino(df_norm, price_data, n_workers=N_WORKERS, envs_por_worker=ENVS_POR_WORKER,
+                                    lookback_window=WINDOW_SIZE)
         
     except Exception as e:
         print(f"❌ Erro preparação: {e}"); return
@@ -98,10 +119,11 @@ def ciclo_de_sono():
     print("🧘 Meditando sobre os lucros e perdas...")
     try:
         path = MODELO_ATUAL + ".zip" if not os.path.exists(MODELO_ATUAL) else MODELO_ATUAL
-        model = PPO.load(path, env=env)
+        # n_steps por partida ajustado ao número de partidas (rollout total de N_STEPS)
+        model = PPO.load(path, env=env, custom_objects={'n_steps': max(1, N_STEPS // env.num_envs)})
         
         # Treino Rápido de Adaptação
-        model.learn(total_timesteps=30000)
+        model.learn(total_timesteps=30000, callback=MedidorVelocidade())
         
         # 5. Salvar
         timestamp = datetime.now().strftime("%Y%m%d")
@@ -110,15 +132,14 @@ def ciclo_de_sono():
         
         print(f"✨ EVOLUÇÃO CONCLUÍDA! Cérebro atualizado com sucesso.")
         
-        # Limpeza
-        if os.path.exists(MEMORIA_RECENTE):
-            os.remove(MEMORIA_RECENTE) # Apaga memória curta pois já foi absorvida
-            # Cria arquivo vazio para amanhã
-            pd.DataFrame(columns=df_recente.columns).to_csv(MEMORIA_RECENTE, index=False)
-            print("🧹 Mente limpa para o novo dia.")
+        # Limpeza: apaga memória curta pois já foi absorvida (arquivo vazio / tabela limpa para amanhã)
+        MemorySystem(os.path.basename(MEMORIA_RECENTE)).esquecer()
+        print("🧹 Mente limpa para o novo dia.")
 
     except Exception as e:
         print(f"❌ Pesadelo: {e}")
+    finally:
+        env.close()
 
 if __name__ == "__main__":
     ciclo_de_sono()
\ No newline at end of file
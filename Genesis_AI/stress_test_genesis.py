@@ -10,6 +10,10 @@ import sys
 # Importa o ambiente correto
 sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 from fixed_trading_env import RealisticTradingEnv
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from decimacao import decimar
+from armazem_dataset import carregar_dataset, existe_dataset
+from normalizacao import NormalizacaoModelo, normalizar_com_modelo
 
 class StressTester:
     def __init__(self, model_path, data_path="../Binance/dataset_wld_clean.csv"):
@@ -17,20 +21,19 @@ class StressTester:
         self.data_path = data_path
         
     def _carregar_dados(self):
-        if not os.path.exists(self.data_path):
+        if not existe_dataset(self.data_path):
             print("❌ Dataset não encontrado.")
             return None, None
             
-        df = pd.read_csv(self.data_path)
+        df = carregar_dataset(self.data_path)
         price_data = df['close'].values
         
         # Remove colunas não-features
         cols_drop = ['timestamp', 'close', 'target']
         df_obs = df.drop(columns=[c for c in cols_drop if c in df.columns])
         
-        # Normalização (Z-Score Global)
-        df_norm = (df_obs - df_obs.mean()) / df_obs.std()
-        df_norm = df_norm.fillna(0).clip(-5, 5)
+        # Normalização (Z-Score do treino do modelo)
+        df_norm = normalizar_com_modelo(self.model_path, df_obs)
         
         return df_norm, price_data
 
@@ -41,9 +44,9 @@ class StressTester:
         df_norm, price_data = self._carregar_dados()
         if df_norm is None: return []
 
-        # Usa JANELA 30 (Do modelo WLD) ou 50 (Do PEPE) - Ajuste conforme o modelo
-        # Vamos tentar detectar ou usar padrão 30
-        WINDOW = 30 
+        # Usa JANELA 30 (Do modelo WLD) ou 50 (Do PEPE): lida do .meta.json do modelo, ou padrão 30
+        norm = NormalizacaoModelo.carregar(self.model_path)
+        WINDOW = norm.window_size if norm is not None and norm.window_size else 30
         
         env = DummyVecEnv([lambda: RealisticTradingEnv(df_norm, price_data, initial_balance=10000, lookback_window=WINDOW)])
         model = PPO.load(self.model_path)
@@ -104,7 +107,7 @@ class StressTester:
             # Plota apenas as primeiras 50 para não poluir
             if i < 50:
                 color = 'red' if curve[-1] < capital_inicial else 'green'
-                plt.plot(curve, color=color, alpha=0.1)
+                plt.plot(*decimar(curve), color=color, alpha=0.1)
 
         # Estatísticas
         prob_ruina = (falencias / simulacoes) * 100
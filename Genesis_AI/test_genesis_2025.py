@@ -6,6 +6,11 @@ from stable_baselines3.common.vec_env import DummyVecEnv
 from fixed_trading_env import RealisticTradingEnv
 import matplotlib.pyplot as plt
 import os
+import sys
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from decimacao import decimar
+from armazem_dataset import carregar_dataset, existe_dataset
+from normalizacao import NormalizacaoModelo
 
 # CONFIG
 MODELO_NOME = "genesis_wld_v2"
@@ -27,26 +32,32 @@ def run_test():
     print(f"🧠 Carregando modelo...")
     model = PPO.load(modelo_path)
 
-    # 2. Encontra Dataset de Referência (Treino) para copiar a estrutura
-    ref_path = None
-    possible_refs = [
-        os.path.join(base_dir, "..", "Binance", NOME_ARQUIVO_TREINO),
-        os.path.join(base_dir, NOME_ARQUIVO_TREINO),
-        NOME_ARQUIVO_TREINO
-    ]
-    for p in possible_refs:
-        if os.path.exists(p): ref_path = p; break
-        
-    if not ref_path:
-        print("❌ Erro: Dataset de treino original não encontrado para referência de colunas.")
-        return
-        
-    print(f"📋 Lendo esquema do treino: {ref_path}")
-    df_ref = pd.read_csv(ref_path)
-    df_ref_num = df_ref.select_dtypes(include=[np.number])
-    cols_drop_ref = ['target', 'timestamp', 'close']
-    df_ref_clean = df_ref_num.drop(columns=[c for c in cols_drop_ref if c in df_ref_num.columns])
-    COLS_EXPECTED = df_ref_clean.columns.tolist()
+    # 2. Esquema e normalização do treino: .meta.json do modelo (sem reler o CSV de treino)
+    norm = NormalizacaoModelo.carregar(modelo_path)
+    if norm is not None:
+        COLS_EXPECTED = norm.colunas
+        print(f"📋 Normalização do treino carregada ({os.path.basename(modelo_path)}.meta.json)")
+    else:
+        # Modelo antigo: copia a estrutura do dataset de treino
+        ref_path = None
+        possible_refs = [
+            os.path.join(base_dir, "..", "Binance", NOME_ARQUIVO_TREINO),
+            os.path.join(base_dir, NOME_ARQUIVO_TREINO),
+            NOME_ARQUIVO_TREINO
+        ]
+        for p in possible_refs:
+            if existe_dataset(p): ref_path = p; break
+            
+        if not ref_path:
+            print("❌ Erro: Dataset de treino original não encontrado para referência de colunas.")
+            return
+            
+        print(f"📋 Lendo esquema do treino: {ref_path}")
+        df_ref = carregar_dataset(ref_path)
+        df_ref_num = df_ref.select_dtypes(include=[np.number])
+        cols_drop_ref = ['target', 'timestamp', 'close']
+        df_ref_clean = df_ref_num.drop(columns=[c for c in cols_drop_ref if c in df_ref_num.columns])
+        COLS_EXPECTED = df_ref_clean.columns.tolist()
     print(f"   ✅ O modelo espera {len(COLS_EXPECTED)} features: {COLS_EXPECTED}")
 
     # 3. Encontra Dataset de Teste (2025)
@@ -57,14 +68,14 @@ def run_test():
         NOME_ARQUIVO_DADOS
     ]
     for p in possible_datas:
-        if os.path.exists(p): dados_path = p; break
+        if existe_dataset(p): dados_path = p; break
             
     if not dados_path:
         print(f"❌ Erro: Dataset '{NOME_ARQUIVO_DADOS}' não encontrado.")
         return
 
     print(f"📚 Carregando dados de teste: {dados_path}")
-    df = pd.read_csv(dados_path)
+    df = carregar_dataset(dados_path)
     
     # --- RECUPERA OS DADOS DE TESTE (SPLIT 75/25) ---
     corte = int(len(df) * 0.75)
@@ -78,24 +89,13 @@ def run_test():
     # Força o dataset de teste a ter as MESMAS colunas do treino
     # Se faltar alguma, preenche com 0. Se tiver extra, ignora.
     
-    # 1. Normalização (Calcula stats nas colunas certas)
-    # Filtra colunas no DF de estatística
-    for col in COLS_EXPECTED:
-        if col not in df_treino_stats.columns: df_treino_stats[col] = 0
-    df_stats_clean = df_treino_stats[COLS_EXPECTED]
-    
-    mean_train = df_stats_clean.mean()
-    std_train = df_stats_clean.std()
-    
-    # 2. Prepara o DF de Teste
-    for col in COLS_EXPECTED:
-        if col not in df_teste.columns: df_teste[col] = 0 # Preenche buracos
-    
-    df_test_feat = df_teste[COLS_EXPECTED].copy() # Seleciona apenas as colunas certas na ordem certa
+    if norm is None:
+        # 1. Normalização (Calcula stats nas colunas certas, nos 75% iniciais)
+        df_treino_stats = df_treino_stats.reindex(columns=COLS_EXPECTED, fill_value=0)
+        norm = NormalizacaoModelo.ajustar(df_treino_stats, clip=5, window_size=WINDOW_SIZE)
     
-    # 3. Aplica Normalização
-    df_test_norm = (df_test_feat - mean_train) / std_train
-    df_test_norm = df_test_norm.fillna(0).clip(-5, 5)
+    # 2. Prepara o DF de Teste (colunas do treino na ordem certa, buracos = 0) e Normaliza
+    df_test_norm = norm.aplicar(df_teste)
     
     print(f"📉 Simulando em {len(df_test_norm)} candles desconhecidos (Shape: {df_test_norm.shape})...")
     
@@ -140,7 +140,7 @@ def run_test():
 
     try:
         plt.figure(figsize=(12, 6))
-        plt.plot(equity, label="Patrimônio (Teste Cego)", color='purple')
+        plt.plot(*decimar(equity), label="Patrimônio (Teste Cego)", color='purple')
         plt.axhline(y=10000, color='r', linestyle='--', label="Inicial")
         plt.title(f"Genesis 2025 - Out-of-Sample Test (Lucro: {lucro_pct:.2f}%)")
         plt.legend()
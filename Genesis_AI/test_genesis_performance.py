@@ -6,6 +6,10 @@ from stable_baselines3.common.vec_env import DummyVecEnv
 import matplotlib.pyplot as plt
 import os
 import sys
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from decimacao import decimar
+from armazem_dataset import carregar_dataset
+from normalizacao import normalizar_com_modelo
 
 # Adiciona o diretório atual ao path para garantir a importação
 sys.path.append(os.path.dirname(os.path.abspath(__file__)))
@@ -30,7 +34,7 @@ class PerformanceTester:
         
         # 2. Carrega e Prepara Dados
         print(f"📚 Carregando dados: {test_data_path}")
-        self.raw_df = pd.read_csv(test_data_path)
+        self.raw_df = carregar_dataset(test_data_path)
         
         # Separa Preço Real (Vital para cálculo de lucro)
         # Tenta 'close', se não tiver usa a primeira coluna
@@ -46,9 +50,8 @@ class PerformanceTester:
         cols_present = [c for c in cols_drop if c in df_num.columns]
         df_norm = df_num.drop(columns=cols_present)
         
-        # Normalização Z-Score
-        self.test_data_norm = (df_norm - df_norm.mean()) / df_norm.std()
-        self.test_data_norm = self.test_data_norm.fillna(0).clip(-5, 5)
+        # Normalização Z-Score (estatísticas do treino do modelo)
+        self.test_data_norm = normalizar_com_modelo(model_path, df_norm)
         
         self.results = {}
 
@@ -106,7 +109,7 @@ class PerformanceTester:
         
         try:
             plt.figure(figsize=(10,6))
-            plt.plot(self.results['equity_curve'])
+            plt.plot(*decimar(self.results['equity_curve']))
             plt.title("Curva de Patrimônio (Teste Futuro)")
             plt.xlabel("Candles")
             plt.ylabel("Capital ($)")
@@ -10,6 +10,8 @@ import sys
 # Adiciona path para importar classes
 sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 from test_genesis_performance import PerformanceTester
+from decimacao import decimar  # test_genesis_performance já pôs a pasta pai no sys.path
+from armazem_dataset import existe_dataset
 
 # CONFIG
 MODELO_PATH = "cerebros/genesis_wld_veteran" # O General
@@ -19,10 +21,10 @@ WINDOW_SIZE = 30 # O Veterano usa 30
 def run_challenge():
     print("⚔️ DESAFIO: VETERANO vs. ANO 2025...")
     
-    if not os.path.exists(DADOS_PATH):
+    if not existe_dataset(DADOS_PATH):
         # Tenta caminhos alternativos
-        if os.path.exists("dataset_2025.csv"): DADOS_PATH = "dataset_2025.csv"
-        elif os.path.exists("Binance/dataset_2025.csv"): DADOS_PATH = "Binance/dataset_2025.csv"
+        if existe_dataset("dataset_2025.csv"): DADOS_PATH = "dataset_2025.csv"
+        elif existe_dataset("Binance/dataset_2025.csv"): DADOS_PATH = "Binance/dataset_2025.csv"
         else: print("❌ Dataset 2025 não encontrado."); return
 
     # 1. Carrega Dados de 2025
@@ -64,7 +66,7 @@ def run_challenge():
 
     # Gráfico
     plt.figure(figsize=(12, 6))
-    plt.plot(perf_results['equity_curve'], label="Patrimônio Veterano", color='blue')
+    plt.plot(*decimar(perf_results['equity_curve']), label="Patrimônio Veterano", color='blue')
     plt.axhline(y=10000, color='r', linestyle='--', label="Inicial")
     plt.title(f"Veterano vs 2025 (Lucro: {lucro_pct:.2f}%)")
     plt.legend()
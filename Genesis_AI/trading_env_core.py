@@ -0,0 +1,422 @@
+# Genesis_AI/trading_env_core.py (NÚCLEO ÚNICO DOS AMBIENTES DE TRADING)
+"""
+Núcleo comum dos ambientes Gym do Gênesis.
+
+Dados, observação e o ciclo do step ficam aqui, em arrays NumPy (sem
+df.iloc por passo). O que muda de um ambiente para outro (taxas,
+contabilidade da posição e recompensa) fica num esquema de recompensa
+plugável:
+
+    RetornoPorPasso          -> CryptoTradingEnv         (crypto_env.py)
+    PunicaoDrawdown          -> CryptoGenesisEnv         (market_env.py)
+    PunicaoDrawdownRealizada -> AdvancedCryptoTradingEnv (crypto_env_advanced.py)
+    BonusAlvo                -> RealisticTradingEnv      (fixed_trading_env.py)
+                                e VecTradingEnv          (vec_trading_env.py, via executar_lote)
+
+Modos de observação:
+    'linha'        candle atual, shape (features,)
+    'janela'       últimos `lookback_window` candles, shape (lookback, features)
+    'janela_plana' a mesma janela achatada, shape (lookback * features,)
+
+Ações em todos: 0=HOLD, 1=BUY, 2=SELL, 3=CLOSE.
+"""
+from abc import ABC, abstractmethod
+import gymnasium as gym
+from gymnasium import spaces
+import numpy as np
+import pandas as pd
+
+MODOS_OBSERVACAO = ('linha', 'janela', 'janela_plana')
+
+
+def preparar_dados(df_norm, df_price, lookback_window):
+    """
+    (dados, precos) no formato interno dos ambientes: features em float32 com
+    `lookback_window` linhas de zeros na frente (padding) e close em float64.
+    """
+    features = np.asarray(df_norm, dtype=np.float32)
+    dados = np.zeros((lookback_window + len(features), features.shape[1]), dtype=np.float32)
+    dados[lookback_window:] = features
+
+    # Tratamento Flexível de Preço
+    if isinstance(df_price, pd.DataFrame) and 'close' in df_price.columns:
+        precos = df_price['close'].values
+    elif hasattr(df_price, 'values'):
+        precos = df_price.values
+    else:
+        precos = np.array(df_price)
+    return dados, np.asarray(precos, dtype=np.float64).flatten()
+
+
+def retorno_do_passo(position, current_price, prev_price):
+    """Variação do candle a favor da posição (0 se zerado)"""
+    if position == 1:
+        return (current_price - prev_price) / prev_price
+    if position == -1:
+        return (prev_price - current_price) / prev_price
+    return 0
+
+
+# =============================================================================
+# ESQUEMAS DE RECOMPENSA
+# =============================================================================
+
+class EsquemaRecompensa(ABC):
+    """
+    Contabilidade + recompensa de um ambiente. O estado da conta (balance,
+    net_worth, position, ...) é gravado no próprio env, como nos ambientes antigos.
+    """
+    # Encerra sem executar a ação quando o passo chega a len + fim_antes (None = nunca)
+    fim_antes = None
+    # Encerra depois de executar no último candle (passo >= len - 1)
+    encerra_no_ultimo = False
+    limite_falencia = 0.5  # Falência: patrimônio <= capital inicial x limite
+    punicao_falencia = -1000
+
+    def reiniciar(self, env):
+        env.balance = env.capital_inicial
+        env.net_worth = env.capital_inicial
+        env.position = 0 # 0: Flat, 1: Long, -1: Short
+        env.entry_price = 0.0
+
+    @abstractmethod
+    def executar(self, env, action, current_price, prev_price):
+        """Aplica a ação no candle atual e devolve a recompensa do passo"""
+
+    def bonus_final(self, env):
+        return 0
+
+    def info(self, env):
+        return {'net_worth': env.net_worth}
+
+
+class RetornoPorPasso(EsquemaRecompensa):
+    """Recompensa = variação do patrimônio a cada passo (sem taxas)"""
+    encerra_no_ultimo = True
+
+    def __init__(self, multiplicador=100, custo_fechar=0.001):
+        self.multiplicador = multiplicador
+        self.custo_fechar = custo_fechar
+
+    def executar(self, env, action, current_price, prev_price):
+        reward = 0
+
+        # Se decidir FECHAR (3)
+        if action == 3 and env.position != 0:
+            env.position = 0
+            # Pequena punição por operar demais (custo de taxa)
+            reward -= self.custo_fechar
+
+        # Se decidir COMPRAR (1) ou VENDER (2): abre ou vira a mão
+        elif action in (1, 2):
+            lado = 1 if action == 1 else -1
+            if env.position != lado:
+                env.position = lado
+                env.entry_price = current_price
+
+        step_return = retorno_do_passo(env.position, current_price, prev_price)
+        env.net_worth *= (1 + step_return)
+        return reward + step_return * self.multiplicador
+
+
+class PunicaoDrawdown(EsquemaRecompensa):
+    """
+    Retorno por passo com dor extra quando o patrimônio cai mais que
+    `limite_drawdown` do topo. Mão fixa de 99% do saldo, taxa na entrada e na
+    saída e bônus final proporcional ao lucro.
+    """
+    encerra_no_ultimo = True
+
+    def __init__(self, multiplicador=100, limite_drawdown=0.05, taxa=0.0005, bonus_final=0.1):
+        self.multiplicador = multiplicador
+        self.limite_drawdown = limite_drawdown
+        self.taxa = taxa
+        self.fator_bonus_final = bonus_final
+
+    def reiniciar(self, env):
+        super().reiniciar(env)
+        env.max_net_worth = env.capital_inicial
+        env.position_size = 0.0
+        env.drawdown = 0.0
+
+    def _ordem(self, env, action, current_price):
+        reward = 0
+
+        # 3: FECHAR POSIÇÃO
+        if action == 3 and env.position != 0:
+            env.position = 0
+            # Custo de transação (Punição leve)
+            custo = current_price * env.position_size * self.taxa
+            env.balance -= custo
+            env.net_worth -= custo
+            reward -= 0.01 # Pequena dor para evitar overtrading
+
+        # 1: LONG / 2: SHORT
+        elif action in (1, 2):
+            lado = 1 if action == 1 else -1
+            if env.position == 0: # Entra
+                env.position = lado
+                env.entry_price = current_price
+                # Define tamanho da mão (Fixa por enquanto, depois a IA decide)
+                env.position_size = (env.balance * 0.99) / current_price
+                # Paga taxa
+                env.balance -= env.balance * self.taxa
+            elif env.position == -lado: # Vira a mão
+                env.position = lado
+                env.entry_price = current_price
+                reward -= 0.02 # Punição por indecisão (troca rápida)
+        return reward
+
+    def executar(self, env, action, current_price, prev_price):
+        reward = self._ordem(env, action, current_price)
+
+        step_return = retorno_do_passo(env.position, current_price, prev_price)
+        env.net_worth *= (1 + step_return)
+        if env.net_worth > env.max_net_worth:
+            env.max_net_worth = env.net_worth
+        reward += step_return * self.multiplicador
+
+        # Punição por Drawdown (Perder dinheiro dói mais do que ganhar dá prazer)
+        env.drawdown = (env.net_worth - env.max_net_worth) / env.max_net_worth
+        if env.drawdown < -self.limite_drawdown:
+            reward -= 1.0
+        return reward
+
+    def bonus_final(self, env):
+        return (env.net_worth - env.capital_inicial) * self.fator_bonus_final
+
+    def info(self, env):
+        return {'net_worth': env.net_worth, 'drawdown': env.drawdown}
+
+
+class PunicaoDrawdownRealizada(PunicaoDrawdown):
+    """
+    Drawdown com o PnL realizado no saldo ao fechar (ganho x100, perda x150) e
+    taxa sobre o saldo na entrada (dobrada ao virar a mão).
+    """
+    fim_antes = 0
+    encerra_no_ultimo = False
+
+    def __init__(self, multiplicador=10, limite_drawdown=0.10, taxa=0.0005):
+        super().__init__(multiplicador, limite_drawdown, taxa, bonus_final=0)
+
+    def reiniciar(self, env):
+        super().reiniciar(env)
+        env.consecutive_losses = 0
+
+    def _ordem(self, env, action, current_price):
+        reward = 0
+
+        # 3: CLOSE
+        if action == 3 and env.position != 0:
+            pnl = 0
+            if env.position == 1: pnl = (current_price - env.entry_price) / env.entry_price
+            elif env.position == -1: pnl = (env.entry_price - current_price) / env.entry_price
+
+            env.balance += env.balance * pnl - (env.balance * self.taxa)
+            env.net_worth = env.balance
+
+            if pnl > 0: reward += pnl * 100
+            else: reward += pnl * 150
+
+            env.position = 0
+
+        # 1: BUY / 2: SELL
+        elif action in (1, 2):
+            lado = 1 if action == 1 else -1
+            if env.position == 0:
+                env.position = lado
+                env.entry_price = current_price
+                env.balance -= env.balance * self.taxa
+            elif env.position == -lado:
+                env.position = lado
+                env.entry_price = current_price
+                env.balance -= env.balance * (self.taxa * 2)
+        return reward
+
+    def info(self, env):
+        return {'net_worth': env.net_worth}
+
+
+class BonusAlvo(EsquemaRecompensa):
+    """
+    Recompensa no fechamento (lucro em dólar normalizado), com bônus quando o
+    trade passa de `alvo` (1%), peso maior para perdas e decaimento por ficar
+    exposto sem lucro. Aposta 100% do saldo, taxa na entrada e na saída.
+    """
+    fim_antes = -1
+    punicao_falencia = -100
+
+    def __init__(self, taxa=0.0005, alvo=0.01, bonus=5.0, peso_perda=1.5, decaimento=0.01):
+        self.taxa = taxa
+        self.alvo = alvo
+        self.bonus = bonus
+        self.peso_perda = peso_perda
+        self.decaimento = decaimento
+
+    def reiniciar(self, env):
+        super().reiniciar(env)
+        env.position_vol_usd = 0.0
+
+    def executar(self, env, action, current_price, prev_price):
+        reward = 0
+
+        # PnL Flutuante
+        unrealized_pnl = 0
+        pct_change_trade = 0
+        if env.position != 0:
+            if env.position == 1: # Long
+                pct_change_trade = (current_price - env.entry_price) / env.entry_price
+            else: # Short
+                pct_change_trade = (env.entry_price - current_price) / env.entry_price
+            unrealized_pnl = env.position_vol_usd * pct_change_trade
+
+        env.net_worth = env.balance + unrealized_pnl
+
+        # FECHAR (Close) ou INVERTER
+        if env.position != 0 and ((action == 3) or (action == 1 and env.position == -1) or (action == 2 and env.position == 1)):
+            env.balance += unrealized_pnl
+            custo = env.position_vol_usd * self.taxa
+            env.balance -= custo
+
+            # A recompensa base é o lucro em Dólar (normalizado para não explodir)
+            reward = (unrealized_pnl - custo) / env.capital_inicial * 100
+            if pct_change_trade >= self.alvo:
+                reward += self.bonus # Dopamina maciça para a IA priorizar alvos de 1%
+            if pct_change_trade < 0:
+                reward *= self.peso_perda # A dor da perda é maior que a alegria do ganho
+
+            env.position = 0
+            env.position_vol_usd = 0
+            env.entry_price = 0
+
+        # ABRIR (Se zerado)
+        if env.position == 0 and action in [1, 2]:
+            env.position = 1 if action == 1 else -1
+            env.entry_price = current_price
+            env.position_vol_usd = env.balance
+            env.balance -= env.position_vol_usd * self.taxa
+            env.net_worth = env.balance
+
+        # Punição leve por ficar exposto sem lucro (Time Decay)
+        if env.position != 0 and pct_change_trade <= 0:
+            reward -= self.decaimento
+        return reward
+
+    def executar_lote(self, env, acao, current_price, vivo):
+        """
+        executar() para N partidas de uma vez (VecTradingEnv): o estado do env
+        são arrays (um valor por partida) e só as partidas `vivo` operam.
+        Devolve o array de recompensas.
+        """
+        reward = np.zeros(len(acao))
+
+        # PnL Flutuante
+        posicionado = vivo & (env.position != 0)
+        pct_change_trade = np.zeros(len(acao))
+        np.divide(current_price - env.entry_price, env.entry_price, out=pct_change_trade,
+                  where=posicionado & (env.position == 1))
+        np.divide(env.entry_price - current_price, env.entry_price, out=pct_change_trade,
+                  where=posicionado & (env.position == -1))
+        unrealized_pnl = env.position_vol_usd * pct_change_trade
+        env.net_worth = np.where(vivo, env.balance + unrealized_pnl, env.net_worth)
+
+        # FECHAR (Close) ou INVERTER
+        fecha = posicionado & ((acao == 3) | ((acao == 1) & (env.position == -1)) | ((acao == 2) & (env.position == 1)))
+        custo = env.position_vol_usd * self.taxa
+        env.balance = np.where(fecha, env.balance + unrealized_pnl - custo, env.balance)
+        recompensa_trade = (unrealized_pnl - custo) / env.capital_inicial * 100
+        recompensa_trade = recompensa_trade + np.where(pct_change_trade >= self.alvo, self.bonus, 0.0)
+        recompensa_trade = np.where(pct_change_trade < 0, recompensa_trade * self.peso_perda, recompensa_trade)
+        reward = np.where(fecha, recompensa_trade, reward)
+        env.position[fecha] = 0
+        env.position_vol_usd[fecha] = 0
+        env.entry_price[fecha] = 0
+
+        # ABRIR (Se zerado)
+        abre = vivo & (env.position == 0) & ((acao == 1) | (acao == 2))
+        env.position[abre] = np.where(acao[abre] == 1, 1, -1)
+        env.entry_price[abre] = current_price[abre]
+        env.position_vol_usd[abre] = env.balance[abre]
+        env.balance[abre] -= env.position_vol_usd[abre] * self.taxa
+        env.net_worth[abre] = env.balance[abre]
+
+        # Punição leve por ficar exposto sem lucro (Time Decay)
+        reward -= np.where(vivo & (env.position != 0) & (pct_change_trade <= 0), self.decaimento, 0.0)
+        return reward
+
+
+# =============================================================================
+# AMBIENTE
+# =============================================================================
+
+class TradingEnvCore(gym.Env):
+    def __init__(self, df_features, df_price, recompensa, capital_inicial=10000,
+                 modo_observacao='linha', lookback_window=50, limite_observacao=np.inf):
+        super(TradingEnvCore, self).__init__()
+
+        if modo_observacao not in MODOS_OBSERVACAO:
+            raise ValueError(f"Modo de observação inválido: {modo_observacao}")
+        janela = 1 if modo_observacao == 'linha' else lookback_window
+
+        # Features em float32 contíguo com `janela` linhas de zeros na frente:
+        # toda observação vira uma view (sem cópia) e o preço é lido do array.
+        self._dados, self.price_data = preparar_dados(df_features, df_price, janela)
+        self._dados.flags.writeable = False
+        self._n_linhas, self._n_features = len(self._dados) - janela, self._dados.shape[1]
+        self._janela = janela
+
+        self.recompensa = recompensa
+        self.capital_inicial = capital_inicial
+        self.modo_observacao = modo_observacao
+        self.lookback_window = lookback_window
+
+        self.action_space = spaces.Discrete(4)
+        if modo_observacao == 'linha':
+            forma = (self._n_features,)
+        elif modo_observacao == 'janela':
+            forma = (lookback_window, self._n_features)
+        else:
+            forma = (lookback_window * self._n_features,)
+        self.observation_space = spaces.Box(
+            low=-limite_observacao, high=limite_observacao, shape=forma, dtype=np.float32
+        )
+
+    def reset(self, seed=None, options=None):
+        super().reset(seed=seed)
+        self.current_step = 0 if self.modo_observacao == 'linha' else self.lookback_window
+        self.recompensa.reiniciar(self)
+        return self._next_observation(), {}
+
+    def _next_observation(self):
+        # Linha atual ou linhas [current_step - lookback, current_step), via padding
+        if self.modo_observacao == 'linha':
+            return self._dados[min(self.current_step, self._n_linhas - 1) + 1]
+        fim = min(self.current_step, self._n_linhas) + self._janela
+        janela = self._dados[fim - self._janela:fim]
+        return janela if self.modo_observacao == 'janela' else janela.reshape(-1)
+
+    def step(self, action):
+        self.current_step += 1
+        rec = self.recompensa
+
+        # Fim dos dados antes de operar
+        if rec.fim_antes is not None and self.current_step >= self._n_linhas + rec.fim_antes:
+            return self._next_observation(), 0, True, False, {'net_worth': self.net_worth}
+
+        current_price = self.price_data[self.current_step]
+        prev_price = self.price_data[self.current_step - 1]
+        reward = rec.executar(self, action, current_price, prev_price)
+
+        # Fim do Jogo (Falência)
+        terminated = False
+        if self.net_worth <= self.capital_inicial * rec.limite_falencia:
+            terminated = True
+            reward = rec.punicao_falencia
+
+        # Fim dos dados depois de operar
+        if rec.encerra_no_ultimo and self.current_step >= self._n_linhas - 1:
+            terminated = True
+            reward += rec.bonus_final(self)
+
+        return self._next_observation(), reward, terminated, False, rec.info(self)
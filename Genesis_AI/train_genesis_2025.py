@@ -5,6 +5,10 @@ from stable_baselines3 import PPO
 from stable_baselines3.common.vec_env import DummyVecEnv
 from fixed_trading_env import RealisticTradingEnv
 import os
+import sys
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from armazem_dataset import carregar_dataset, existe_dataset
+from normalizacao import NormalizacaoModelo
 
 # CONFIG
 NOME_ARQUIVO = "dataset_2025.csv"
@@ -26,7 +30,7 @@ def main():
     
     dados_path = None
     for p in caminhos_possiveis:
-        if os.path.exists(p):
+        if existe_dataset(p):
             dados_path = p
             break
             
@@ -36,7 +40,7 @@ def main():
         return
 
     print(f"📚 Carregando dados de: {dados_path}")
-    df = pd.read_csv(dados_path)
+    df = carregar_dataset(dados_path)
     
     # --- O CORTE ESTRATÉGICO (SPLIT) ---
     corte = int(len(df) * 0.75)
@@ -55,9 +59,9 @@ def main():
     cols_existentes = [c for c in cols_drop if c in df_treino.columns]
     df_obs = df_treino.drop(columns=cols_existentes)
     
-    # Normalização (Aprende a média APENAS no treino para não viciar)
-    df_norm = (df_obs - df_obs.mean()) / df_obs.std()
-    df_norm = df_norm.fillna(0).clip(-5, 5)
+    # Normalização (Aprende a média APENAS no treino para não viciar; vai junto do modelo)
+    norm = NormalizacaoModelo.ajustar(df_obs, clip=5, window_size=WINDOW_SIZE, dataset=dados_path)
+    df_norm = norm.aplicar(df_obs)
     
     # Ambiente
     env = DummyVecEnv([lambda: RealisticTradingEnv(
@@ -83,6 +87,7 @@ def main():
     model.learn(total_timesteps=200000)
     
     model.save(MODELO_PATH)
+    norm.salvar(MODELO_PATH)
     print(f"✅ CÉREBRO 2025 SALVO: {MODELO_PATH}")
 
 if __name__ == "__main__":
@@ -4,18 +4,26 @@ import numpy as np
 from stable_baselines3 import PPO
 from stable_baselines3.common.vec_env import DummyVecEnv
 from fixed_trading_env import RealisticTradingEnv
+from treino_paralelo import criar_ambiente_treino, MedidorVelocidade
 import os
+import sys
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from armazem_dataset import carregar_dataset
+from normalizacao import NormalizacaoModelo
 
 DADOS_PATH = "../Binance/dataset_v11_fusion.csv"
 MODELO_PATH = "cerebros/genesis_v12_final"
 LOG_DIR = "logs_v12"
 WINDOW_SIZE = 50
+N_WORKERS = None      # Processos de coleta (None = núcleos - 1; 1 = sem subprocessos)
+ENVS_POR_WORKER = 4   # Partidas por processo
+N_STEPS = 2048        # Tamanho do rollout (somando todas as partidas)
 
 def main():
     print("🧬 INICIANDO TREINO V12 (CORRIGIDO - SEM DATA LEAKAGE)...")
     
     try:
-        df_bruto = pd.read_csv(DADOS_PATH)
+        df_bruto = carregar_dataset(DADOS_PATH)
         
         # 1. SEPARA TREINO/TESTE PARA EVITAR DATA LEAKAGE
         train_size = int(0.8 * len(df_bruto))
@@ -37,11 +45,9 @@ def main():
         print(f"🔧 Features ({len(df_features_train.columns)}): {list(df_features_train.columns)}")
         
         # 3. NORMALIZAÇÃO APENAS COM DADOS DE TREINO
-        train_mean = df_features_train.mean()
-        train_std = df_features_train.std()
-        
-        df_norm_train = (df_features_train - train_mean) / train_std
-        df_norm_train = df_norm_train.fillna(0).clip(-8, 8)  # Clip menos agressivo
+        norm = NormalizacaoModelo.ajustar(df_features_train, clip=8, window_size=WINDOW_SIZE,  # Clip menos agressivo
+                                          dataset=DADOS_PATH)
+        df_norm_train = norm.aplicar(df_features_train)
         
         # 4. PREPARA DADOS DE TESTE (com mesma normalização do treino)
         df_price_real_test = df_test[['close']].copy()
@@ -49,26 +55,27 @@ def main():
         df_features_test = df_features_test.drop(
             columns=[c for c in cols_to_drop if c in df_features_test.columns]
         )
-        df_norm_test = (df_features_test - train_mean) / train_std
-        df_norm_test = df_norm_test.fillna(0).clip(-8, 8)
+        df_norm_test = norm.aplicar(df_features_test)
         
     except Exception as e:
         print(f"❌ Erro preparação: {e}")
         return
     
     # 5. CRIA AMBIENTE DE TREINO
-    env = DummyVecEnv([lambda: RealisticTradingEnv(
+    env = criar_ambiente_treino(
         df_norm_train, 
         df_price_real_train, 
+        n_workers=N_WORKERS,
+        envs_por_worker=ENVS_POR_WORKER,
         lookback_window=WINDOW_SIZE
-    )])
+    )
     
     # 6. AGENTE COM HIPERPARÂMETROS MELHORADOS
     model = PPO(
         "MlpPolicy",
         env,
         learning_rate=3e-5,
-        n_steps=2048,
+        n_steps=max(1, N_STEPS // env.num_envs),  # Mesmo rollout total com N partidas
         batch_size=64,
         n_epochs=10,                    # Adicionado
         gamma=0.99,
@@ -90,10 +97,13 @@ def main():
     model.learn(
         total_timesteps=200000,
         tb_log_name="genesis_v12",
-        reset_num_timesteps=True
+        reset_num_timesteps=True,
+        callback=MedidorVelocidade()
     )
+    env.close()
     
     model.save(MODELO_PATH)
+    norm.salvar(MODELO_PATH)
     
     # 8. TESTE RÁPIDO NO CONJUNTO DE TESTE
     print("🧪 Testando no conjunto de teste...")
@@ -5,6 +5,10 @@ from stable_baselines3 import PPO
 from stable_baselines3.common.vec_env import DummyVecEnv
 from fixed_trading_env import RealisticTradingEnv
 import os
+import sys
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from armazem_dataset import carregar_dataset
+from normalizacao import NormalizacaoModelo
 
 DADOS_PATH = "../Binance/dataset_v11_fusion.csv"
 MODELO_PATH = "cerebros/genesis_v13_corrected"
@@ -15,7 +19,7 @@ def main():
     print("🧬 INICIANDO TREINO V13 (MATEMÁTICA CORRIGIDA)...")
     
     try:
-        df_bruto = pd.read_csv(DADOS_PATH)
+        df_bruto = carregar_dataset(DADOS_PATH)
         
         # Separa Preço
         df_price = df_bruto[['close']].copy()
@@ -25,8 +29,8 @@ def main():
         cols_drop = ['target', 'timestamp', 'close']
         df_feat = df_feat.drop(columns=[c for c in cols_drop if c in df_feat.columns])
         
-        df_norm = (df_feat - df_feat.mean()) / df_feat.std()
-        df_norm = df_norm.fillna(0).clip(-5, 5)
+        norm = NormalizacaoModelo.ajustar(df_feat, clip=5, window_size=WINDOW_SIZE, dataset=DADOS_PATH)
+        df_norm = norm.aplicar(df_feat)
         
         print(f"📚 Dados: {len(df_norm)} linhas. Features: {df_norm.shape[1]}")
         
@@ -53,6 +57,7 @@ def main():
     model.learn(total_timesteps=100000)
     
     model.save(MODELO_PATH)
+    norm.salvar(MODELO_PATH)
     print(f"✅ MODELO SALVO: {MODELO_PATH}")
 
 if __name__ == "__main__":
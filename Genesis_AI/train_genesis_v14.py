@@ -2,25 +2,31 @@
 import pandas as pd
 import numpy as np
 from stable_baselines3 import PPO
-from stable_baselines3.common.vec_env import DummyVecEnv
-from fixed_trading_env import RealisticTradingEnv
+from treino_paralelo import criar_ambiente_treino, MedidorVelocidade
 import os
+import sys
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from armazem_dataset import carregar_dataset, existe_dataset
+from normalizacao import NormalizacaoModelo
 
 # CONFIGURAÇÃO RÍGIDA
 DADOS_PATH = "../Binance/dataset_wld_clean.csv"
 MODELO_PATH = "cerebros/genesis_wld_clean"
 LOG_DIR = "logs_v14"
 WINDOW_SIZE = 50 
+N_WORKERS = None      # Processos de coleta (None = núcleos - 1; 1 = sem subprocessos)
+ENVS_POR_WORKER = 4   # Partidas por processo
+N_STEPS = 2048        # Tamanho do rollout (somando todas as partidas)
 
 def main():
     print("🧬 INICIANDO TREINO V14 (CONTROLO TOTAL)...")
     
-    if not os.path.exists(DADOS_PATH):
+    if not existe_dataset(DADOS_PATH):
         print("❌ Erro: Dataset não encontrado.")
         return
 
     # 1. Carrega Dados
-    df_bruto = pd.read_csv(DADOS_PATH)
+    df_bruto = carregar_dataset(DADOS_PATH)
     
     # 2. Separa Preço Real
     df_price_real = df_bruto[['close']].copy()
@@ -41,8 +47,8 @@ def main():
     print(f"   Lista: {list(df_features.columns)}")
     
     # Normaliza
-    df_norm = (df_features - df_features.mean()) / df_features.std()
-    df_norm = df_norm.fillna(0).clip(-5, 5)
+    norm = NormalizacaoModelo.ajustar(df_features, clip=5, window_size=WINDOW_SIZE, dataset=DADOS_PATH)
+    df_norm = norm.aplicar(df_features)
     
     # CALCULA O SHAPE ESPERADO
     expected_shape = WINDOW_SIZE * len(df_features.columns)
@@ -50,23 +56,26 @@ def main():
     print("   (Se o erro no Live Trader pedir outro número, sabemos que o arquivo estava errado)\n")
     
     # 4. Cria Ambiente
-    env = DummyVecEnv([lambda: RealisticTradingEnv(df_norm, df_price_real, lookback_window=WINDOW_SIZE)])
+    env = criar_ambiente_treino(df_norm, df_price_real, n_workers=N_WORKERS, envs_por_worker=ENVS_POR_WORKER,
+                                lookback_window=WINDOW_SIZE)
     
     # 5. Treina
     model = PPO(
         "MlpPolicy",
         env,
         learning_rate=3e-5,
-        n_steps=2048,
+        n_steps=max(1, N_STEPS // env.num_envs),
         batch_size=64,
         verbose=1,
         tensorboard_log=LOG_DIR
     )
     
     print("🎯 Treinando (50k steps rápidos para teste)...")
-    model.learn(total_timesteps=50000)
+    model.learn(total_timesteps=50000, callback=MedidorVelocidade())
+    env.close()
     
     model.save(MODELO_PATH)
+    norm.salvar(MODELO_PATH)
     print(f"✅ MODELO V14 SALVO: {MODELO_PATH}")
 
 if __name__ == "__main__":
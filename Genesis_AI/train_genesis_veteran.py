@@ -5,6 +5,10 @@ from stable_baselines3 import PPO
 from stable_baselines3.common.vec_env import DummyVecEnv
 from fixed_trading_env import RealisticTradingEnv
 import os
+import sys
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from armazem_dataset import carregar_dataset, existe_dataset
+from normalizacao import NormalizacaoModelo
 
 # CONFIGURAÇÃO DE GUERRA
 DADOS = "../Binance/dataset_wld_1ano.csv" # O dataset difícil
@@ -14,11 +18,11 @@ WINDOW = 30
 def main():
     print("🧬 INICIANDO TREINO VETERANO (1 ANO DE DADOS)...")
     
-    if not os.path.exists(DADOS):
+    if not existe_dataset(DADOS):
         print("❌ Erro: dataset_wld_1ano.csv não encontrado.")
         return
         
-    df = pd.read_csv(DADOS)
+    df = carregar_dataset(DADOS)
     print(f"📚 Carregando {len(df)} candles de história completa...")
     
     # Prepara Dados
@@ -27,8 +31,8 @@ def main():
     df_obs = df.drop(columns=[c for c in cols_drop if c in df.columns])
     
     # Normalização
-    df_norm = (df_obs - df_obs.mean()) / df_obs.std()
-    df_norm = df_norm.fillna(0).clip(-5, 5)
+    norm = NormalizacaoModelo.ajustar(df_obs, clip=5, window_size=WINDOW, dataset=DADOS)
+    df_norm = norm.aplicar(df_obs)
     
     # Ambiente
     env = DummyVecEnv([lambda: RealisticTradingEnv(
@@ -57,6 +61,7 @@ def main():
     model.learn(total_timesteps=300000)
     
     model.save(MODELO)
+    norm.salvar(MODELO)
     print(f"✅ CÉREBRO VETERANO SALVO: {MODELO}")
     print("👉 Teste-o com 'run_long_test.py' (altere o modelo no script para veteran).")
 
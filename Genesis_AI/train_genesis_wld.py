@@ -4,6 +4,10 @@ from stable_baselines3 import PPO
 from stable_baselines3.common.vec_env import DummyVecEnv
 from fixed_trading_env import RealisticTradingEnv
 import os
+import sys
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from armazem_dataset import carregar_dataset, existe_dataset
+from normalizacao import NormalizacaoModelo
 
 # CONFIG
 DADOS = "../Binance/dataset_wld_clean.csv"
@@ -13,11 +17,11 @@ WINDOW = 30
 def main():
     print("🧬 TREINANDO GÊNESIS (ESPECIALISTA WLD)...")
     
-    if not os.path.exists(DADOS):
+    if not existe_dataset(DADOS):
         print("❌ Rode o gerar_dataset_wld.py primeiro!")
         return
         
-    df = pd.read_csv(DADOS)
+    df = carregar_dataset(DADOS)
     
     # Prepara Dados
     price_data = df['close'].values
@@ -27,8 +31,8 @@ def main():
     df_obs = df.drop(columns=[c for c in cols_drop if c in df.columns])
     
     # Normaliza
-    df_norm = (df_obs - df_obs.mean()) / df_obs.std()
-    df_norm = df_norm.fillna(0).clip(-5, 5)
+    norm = NormalizacaoModelo.ajustar(df_obs, clip=5, window_size=WINDOW, dataset=DADOS)
+    df_norm = norm.aplicar(df_obs)
     
     # Ambiente
     env = DummyVecEnv([lambda: RealisticTradingEnv(df_norm, price_data, lookback_window=WINDOW)])
@@ -40,6 +44,7 @@ def main():
     model.learn(total_timesteps=100000)
     
     model.save(MODELO)
+    norm.salvar(MODELO)
     print("✅ Cérebro WLD Salvo!")
 
 if __name__ == "__main__":
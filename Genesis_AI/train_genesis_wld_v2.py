@@ -2,14 +2,20 @@
 import pandas as pd
 import numpy as np
 from stable_baselines3 import PPO
-from stable_baselines3.common.vec_env import DummyVecEnv
-from fixed_trading_env import RealisticTradingEnv
+from treino_paralelo import criar_ambiente_treino, MedidorVelocidade
 import os
+import sys
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from armazem_dataset import carregar_dataset, existe_dataset
+from normalizacao import NormalizacaoModelo
 
 # CONFIGURAÇÃO
 MODELO = "Genesis_AI/cerebros/genesis_wld_v2"
 LOG_DIR = "logs_wld_v2"
 WINDOW = 30 
+N_WORKERS = None      # Processos de coleta (None = núcleos - 1; 1 = sem subprocessos)
+ENVS_POR_WORKER = 4   # Partidas por processo
+N_STEPS = 2048        # Tamanho do rollout (somando todas as partidas)
 
 def main():
     print("🧬 TREINANDO GÊNESIS WLD V2 (META 1% + CLOSE ACTION)...")
@@ -26,7 +32,7 @@ def main():
     
     dados_path = None
     for p in caminhos_possiveis:
-        if os.path.exists(p):
+        if existe_dataset(p):
             dados_path = p
             break
             
@@ -36,7 +42,7 @@ def main():
         return
         
     print(f"📚 Carregando dados de: {dados_path}")
-    df = pd.read_csv(dados_path)
+    df = carregar_dataset(dados_path)
     print(f"📊 Registros carregados: {len(df)}")
     
     # Prepara Dados
@@ -50,17 +56,19 @@ def main():
     df_obs = df.drop(columns=cols_to_drop)
     
     # Normalização Z-Score
-    df_norm = (df_obs - df_obs.mean()) / df_obs.std()
-    df_norm = df_norm.fillna(0).clip(-5, 5)
+    norm = NormalizacaoModelo.ajustar(df_obs, clip=5, window_size=WINDOW, dataset=dados_path)
+    df_norm = norm.aplicar(df_obs)
     
     # Ambiente com Bônus de 1% (V2)
-    # Certifique-se de que o fixed_trading_env.py já foi atualizado para V2!
-    env = DummyVecEnv([lambda: RealisticTradingEnv(
+    # Mesmas regras do fixed_trading_env.py (V2), com N_WORKERS x ENVS_POR_WORKER partidas
+    env = criar_ambiente_treino(
         df_norm, 
         price_data, 
+        n_workers=N_WORKERS,
+        envs_por_worker=ENVS_POR_WORKER,
         initial_balance=10000,
         lookback_window=WINDOW
-    )])
+    )
     
     # Modelo PPO
     model = PPO(
@@ -68,7 +76,7 @@ def main():
         env, 
         verbose=1, 
         learning_rate=3e-4, 
-        n_steps=2048, 
+        n_steps=max(1, N_STEPS // env.num_envs), 
         batch_size=64, 
         gamma=0.99,
         tensorboard_log=LOG_DIR
@@ -76,9 +84,11 @@ def main():
     
     print("🏋️ Iniciando Treino de Precisão...")
     # Treinamos por 150k passos para ela ter tempo de descobrir o bônus
-    model.learn(total_timesteps=150000)
+    model.learn(total_timesteps=150000, callback=MedidorVelocidade())
+    env.close()
     
     model.save(MODELO)
+    norm.salvar(MODELO)
     print(f"✅ CÉREBRO WLD V2 SALVO: {MODELO}")
     print("👉 Agora atualize o 'live_trader_wld.py' para usar o modelo 'genesis_wld_v2'.")
 
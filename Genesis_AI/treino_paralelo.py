@@ -0,0 +1,229 @@
+# Genesis_AI/treino_paralelo.py (COLETA DE ROLLOUTS EM VÁRIOS PROCESSOS)
+"""
+Ambiente de treino do Gênesis espalhado por vários núcleos.
+
+Cada worker é um processo com um VecTradingEnv de `envs_por_worker`
+partidas; o processo principal manda as ações e recebe as observações de
+um bloco inteiro por mensagem. O dataset (features com padding + preços)
+vai uma vez só para memória compartilhada: os workers leem direto dela, sem
+copiar o DataFrame.
+
+Uso:
+    env = criar_ambiente_treino(df_norm, df_price, n_workers=N_WORKERS, lookback_window=50)
+    model = PPO("MlpPolicy", env, n_steps=N_STEPS // env.num_envs, ...)
+    model.learn(total_timesteps=..., callback=MedidorVelocidade())
+    env.close()
+"""
+import os
+import time
+import multiprocessing as mp
+from multiprocessing import shared_memory
+import numpy as np
+from gymnasium import spaces
+from stable_baselines3.common.callbacks import BaseCallback
+from stable_baselines3.common.vec_env.base_vec_env import VecEnv
+from trading_env_core import preparar_dados
+from vec_trading_env import VecTradingEnv
+
+# Deixa um núcleo livre para o processo principal (PPO / rede neural)
+N_WORKERS_PADRAO = max(1, (os.cpu_count() or 2) - 1)
+ENVS_POR_WORKER_PADRAO = 4
+
+
+def _compartilhar(array):
+    """Copia o array para um bloco de memória compartilhada: (bloco, descrição para o worker)"""
+    bloco = shared_memory.SharedMemory(create=True, size=max(array.nbytes, 1))
+    copia = np.ndarray(array.shape, dtype=array.dtype, buffer=bloco.buf)
+    copia[:] = array
+    del copia
+    return bloco, (bloco.name, array.shape, array.dtype.str)
+
+
+def _worker(conexao, descricoes, kwargs_env):
+    """Loop do processo filho: um VecTradingEnv em cima da memória compartilhada"""
+    blocos = [shared_memory.SharedMemory(name=nome) for nome, _, _ in descricoes]
+    dados, precos = [np.ndarray(forma, dtype=np.dtype(tipo), buffer=bloco.buf)
+                     for bloco, (_, forma, tipo) in zip(blocos, descricoes)]
+    env = VecTradingEnv(dados, precos, preparado=True, **kwargs_env)
+    try:
+        while True:
+            comando, arg = conexao.recv()
+            if comando == 'step':
+                conexao.send(env.step(arg))
+            elif comando == 'reset':
+                if arg is not None:
+                    env.seed(arg)
+                conexao.send(env.reset())
+            elif comando == 'get_attr':
+                conexao.send(env.get_attr(*arg))
+            elif comando == 'set_attr':
+                conexao.send(env.set_attr(*arg))
+            elif comando == 'env_method':
+                nome, args, kwargs, indices = arg
+                conexao.send(env.env_method(nome, *args, indices=indices, **kwargs))
+            elif comando == 'close':
+                break
+    except (KeyboardInterrupt, EOFError):
+        pass
+    finally:
+        # As views precisam sumir antes de fechar os blocos
+        del env, dados, precos
+        for bloco in blocos:
+            bloco.close()
+        conexao.close()
+
+
+class SubprocTradingEnv(VecEnv):
+    def __init__(self, df_norm, df_price, n_workers=None, envs_por_worker=ENVS_POR_WORKER_PADRAO,
+                 lookback_window=50, seed=None, **kwargs_env):
+        self.n_workers = n_workers or N_WORKERS_PADRAO
+        self.envs_por_worker = envs_por_worker
+
+        dados, precos = preparar_dados(df_norm, df_price, lookback_window)
+        self._blocos = []
+        descricoes = []
+        for array in (dados, precos):
+            bloco, descricao = _compartilhar(array)
+            self._blocos.append(bloco)
+            descricoes.append(descricao)
+
+        # Mesmo método de início que o SubprocVecEnv do SB3
+        metodo = 'forkserver' if 'forkserver' in mp.get_all_start_methods() else 'spawn'
+        ctx = mp.get_context(metodo)
+        self._conexoes = []
+        self._processos = []
+        for w in range(self.n_workers):
+            kwargs_worker = dict(kwargs_env, n_envs=envs_por_worker, lookback_window=lookback_window,
+                                 seed=None if seed is None else seed + w)
+            pai, filho = ctx.Pipe()
+            processo = ctx.Process(target=_worker, args=(filho, descricoes, kwargs_worker), daemon=True)
+            processo.start()
+            filho.close()
+            self._conexoes.append(pai)
+            self._processos.append(processo)
+        self._fechado = False
+
+        observation_space = spaces.Box(
+            low=-10, high=10,
+            shape=(lookback_window * dados.shape[1],),
+            dtype=np.float32
+        )
+        super().__init__(self.n_workers * envs_por_worker, observation_space, spaces.Discrete(4))
+
+    # --- Índices globais -> (worker, índices locais) ---
+
+    def _por_worker(self, indices):
+        if indices is None:
+            indices = range(self.num_envs)
+        elif isinstance(indices, int):
+            indices = [indices]
+        grupos = {}
+        for i in indices:
+            grupos.setdefault(i // self.envs_por_worker, []).append(i % self.envs_por_worker)
+        return grupos
+
+    # --- API VecEnv ---
+
+    def reset(self):
+        for w, conexao in enumerate(self._conexoes):
+            conexao.send(('reset', self._seeds[w * self.envs_por_worker]))
+        obs = np.concatenate([conexao.recv() for conexao in self._conexoes])
+        self._reset_seeds()
+        self._reset_options()
+        return obs
+
+    def step_async(self, actions):
+        blocos = np.asarray(actions).reshape(self.n_workers, self.envs_por_worker)
+        for conexao, acoes in zip(self._conexoes, blocos):
+            conexao.send(('step', acoes))
+
+    def step_wait(self):
+        resultados = [conexao.recv() for conexao in self._conexoes]
+        obs, rewards, dones, infos = zip(*resultados)
+        return (np.concatenate(obs), np.concatenate(rewards), np.concatenate(dones),
+                [info for bloco in infos for info in bloco])
+
+    def close(self):
+        if self._fechado:
+            return
+        for conexao in self._conexoes:
+            try:
+                conexao.send(('close', None))
+            except (BrokenPipeError, EOFError):
+                pass
+        for processo in self._processos:
+            processo.join(timeout=5)
+        for bloco in self._blocos:
+            bloco.close()
+            bloco.unlink()
+        self._fechado = True
+
+    def get_attr(self, attr_name, indices=None):
+        grupos = self._por_worker(indices)
+        for w, locais in grupos.items():
+            self._conexoes[w].send(('get_attr', (attr_name, locais)))
+        return [valor for w in grupos for valor in self._conexoes[w].recv()]
+
+    def set_attr(self, attr_name, value, indices=None):
+        grupos = self._por_worker(indices)
+        for w, locais in grupos.items():
+            self._conexoes[w].send(('set_attr', (attr_name, value, locais)))
+        for w in grupos:
+            self._conexoes[w].recv()
+
+    def env_method(self, method_name, *method_args, indices=None, **method_kwargs):
+        grupos = self._por_worker(indices)
+        for w, locais in grupos.items():
+            self._conexoes[w].send(('env_method', (method_name, method_args, method_kwargs, locais)))
+        return [valor for w in grupos for valor in self._conexoes[w].recv()]
+
+    def env_is_wrapped(self, wrapper_class, indices=None):
+        return [False for locais in self._por_worker(indices).values() for _ in locais]
+
+
+def criar_ambiente_treino(df_norm, df_price, n_workers=None, envs_por_worker=ENVS_POR_WORKER_PADRAO,
+                          **kwargs_env):
+    """
+    VecEnv de treino: com 1 worker, um VecTradingEnv no próprio processo;
+    com mais, um SubprocTradingEnv (n_workers x envs_por_worker partidas).
+    n_workers=None usa N_WORKERS_PADRAO (núcleos - 1).
+    """
+    n_workers = n_workers or N_WORKERS_PADRAO
+    if n_workers <= 1:
+        return VecTradingEnv(df_norm, df_price, n_envs=envs_por_worker, **kwargs_env)
+    print(f"⚙️ Ambiente paralelo: {n_workers} processos x {envs_por_worker} partidas")
+    return SubprocTradingEnv(df_norm, df_price, n_workers=n_workers, envs_por_worker=envs_por_worker, **kwargs_env)
+
+
+class MedidorVelocidade(BaseCallback):
+    """Mostra env-steps/s da coleta de cada rollout e do treino inteiro"""
+
+    def __init__(self, verbose=1):
+        super().__init__(verbose)
+        self._inicio_treino = 0.0
+        self._passos_treino = 0
+        self._inicio_rollout = 0.0
+        self._passos_rollout = 0
+
+    def _on_training_start(self):
+        self._inicio_treino = time.perf_counter()
+        self._passos_treino = self.num_timesteps
+
+    def _on_rollout_start(self):
+        self._inicio_rollout = time.perf_counter()
+        self._passos_rollout = self.num_timesteps
+
+    def _on_step(self):
+        return True
+
+    def _on_rollout_end(self):
+        duracao = time.perf_counter() - self._inicio_rollout
+        velocidade = (self.num_timesteps - self._passos_rollout) / max(duracao, 1e-9)
+        self.logger.record("tempo/env_steps_por_s", velocidade)
+        if self.verbose:
+            print(f"⚡ Coleta: {velocidade:,.0f} env-steps/s ({self.training_env.num_envs} partidas)")
+
+    def _on_training_end(self):
+        duracao = time.perf_counter() - self._inicio_treino
+        passos = self.num_timesteps - self._passos_treino
+        print(f"⏱️ Treino: {passos} env-steps em {duracao:.1f}s ({passos / max(duracao, 1e-9):,.0f} env-steps/s com atualização da rede)")
@@ -0,0 +1,152 @@
+# Genesis_AI/vec_trading_env.py (N EPISÓDIOS EM ARRAYS - VECENV NATIVO)
+"""
+Versão vetorizada do RealisticTradingEnv (fixed_trading_env.py): as regras
+são as do esquema BonusAlvo de trading_env_core.py (BonusAlvo.executar_lote).
+
+Em vez de N envs Python dentro de um DummyVecEnv, o estado das N partidas
+(passo, posição, preço de entrada, volume, saldo e patrimônio) mora em arrays
+e cada step resolve as N transições e recompensas com operações NumPy.
+Mesmas regras, ações (0=HOLD, 1=BUY, 2=SELL, 3=CLOSE) e observação do env
+original; cada partida começa num ponto aleatório do dataset.
+
+Segue a API de VecEnv do stable_baselines3: reset automático da partida que
+termina, com a última observação em info['terminal_observation'].
+"""
+import numpy as np
+from gymnasium import spaces
+from stable_baselines3.common.vec_env.base_vec_env import VecEnv
+from trading_env_core import preparar_dados, BonusAlvo
+
+
+class VecTradingEnv(VecEnv):
+    def __init__(self, df_norm, df_price, n_envs=8, initial_balance=10000, lookback_window=50,
+                 inicio_aleatorio=True, seed=None, preparado=False, recompensa=None):
+        # preparado=True: df_norm/df_price já vêm de preparar_dados (ex.: memória compartilhada)
+        if not preparado:
+            df_norm, df_price = preparar_dados(df_norm, df_price, lookback_window)
+        self._dados = df_norm
+        self._dados.flags.writeable = False
+        self._n_linhas = len(self._dados) - lookback_window
+        self._n_features = self._dados.shape[1]
+        self.price_data = df_price
+
+        self.capital_inicial = initial_balance
+        self.recompensa = recompensa or BonusAlvo()
+        self.lookback_window = lookback_window
+        self.inicio_aleatorio = inicio_aleatorio
+        self.render_mode = None
+        self._rng = np.random.default_rng(seed)
+
+        # Deslocamentos da janela: linha i da observação = passo - lookback + i (+ padding)
+        self._janela = np.arange(lookback_window)
+
+        observation_space = spaces.Box(
+            low=-10, high=10,
+            shape=(lookback_window * self._n_features,),
+            dtype=np.float32
+        )
+        # Estado das N partidas
+        self.current_step = np.zeros(n_envs, dtype=np.int64)
+        self.balance = np.zeros(n_envs)
+        self.net_worth = np.zeros(n_envs)
+        self.position = np.zeros(n_envs, dtype=np.int8)
+        self.entry_price = np.zeros(n_envs)
+        self.position_vol_usd = np.zeros(n_envs)
+        self._acoes = np.zeros(n_envs, dtype=np.int64)
+
+        super().__init__(n_envs, observation_space, spaces.Discrete(4))
+
+    # --- Estado ---
+
+    def _reiniciar(self, idx):
+        """Zera as partidas `idx` (máscara ou índices) com início aleatório no dataset"""
+        n = len(self.current_step[idx])
+        if self.inicio_aleatorio and self._n_linhas - 1 > self.lookback_window:
+            self.current_step[idx] = self._rng.integers(self.lookback_window, self._n_linhas - 1, size=n)
+        else:
+            self.current_step[idx] = self.lookback_window
+        self.balance[idx] = self.capital_inicial
+        self.net_worth[idx] = self.capital_inicial
+        self.position[idx] = 0
+        self.entry_price[idx] = 0.0
+        self.position_vol_usd[idx] = 0.0
+
+    def _observacoes(self):
+        """(N, lookback * features): janela [passo - lookback, passo) de cada partida"""
+        fim = np.minimum(self.current_step, self._n_linhas)
+        linhas = fim[:, None] + self._janela  # já somado o padding de `lookback` linhas
+        return self._dados[linhas].reshape(self.num_envs, -1)
+
+    # --- API VecEnv ---
+
+    def reset(self):
+        semente = self._seeds[0]
+        if semente is not None:
+            self._rng = np.random.default_rng(semente)
+        self._reset_seeds()
+        self._reset_options()
+        self._reiniciar(slice(None))
+        return self._observacoes()
+
+    def step_async(self, actions):
+        self._acoes = np.asarray(actions).reshape(self.num_envs)
+
+    def step_wait(self):
+        acao = self._acoes
+        self.current_step += 1
+        fim_dados = self.current_step >= self._n_linhas - 1
+        vivo = ~fim_dados
+
+        current_price = self.price_data[np.minimum(self.current_step, len(self.price_data) - 1)]
+        rec = self.recompensa
+        reward = rec.executar_lote(self, acao, current_price, vivo)
+
+        # Fim do Jogo (Falência)
+        falencia = vivo & (self.net_worth <= self.capital_inicial * rec.limite_falencia)
+        reward[falencia] = rec.punicao_falencia # Punição máxima
+
+        dones = fim_dados | falencia
+        obs = self._observacoes()
+        infos = [{'net_worth': nw} for nw in self.net_worth]
+
+        # Reset automático (padrão VecEnv): guarda a última observação e recomeça
+        if dones.any():
+            for i in np.flatnonzero(dones):
+                infos[i]['terminal_observation'] = obs[i].copy()
+                infos[i]['TimeLimit.truncated'] = False
+            self._reiniciar(dones)
+            obs[dones] = self._observacoes()[dones]
+
+        return obs, reward.astype(np.float32), dones, infos
+
+    def close(self):
+        pass
+
+    def _indices(self, indices):
+        if indices is None:
+            return range(self.num_envs)
+        if isinstance(indices, int):
+            return [indices]
+        return indices
+
+    def get_attr(self, attr_name, indices=None):
+        valor = getattr(self, attr_name)
+        idx = self._indices(indices)
+        # Atributos de estado são arrays por partida; o resto é comum a todas
+        if isinstance(valor, np.ndarray) and valor.shape[:1] == (self.num_envs,):
+            return [valor[i] for i in idx]
+        return [valor for _ in idx]
+
+    def set_attr(self, attr_name, value, indices=None):
+        atual = getattr(self, attr_name, None)
+        if isinstance(atual, np.ndarray) and atual.shape[:1] == (self.num_envs,):
+            atual[list(self._indices(indices))] = value
+        else:
+            setattr(self, attr_name, value)
+
+    def env_method(self, method_name, *method_args, indices=None, **method_kwargs):
+        metodo = getattr(self, method_name)
+        return [metodo(*method_args, **method_kwargs) for _ in self._indices(indices)]
+
+    def env_is_wrapped(self, wrapper_class, indices=None):
+        return [False for _ in self._indices(indices)]
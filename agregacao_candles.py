@@ -0,0 +1,70 @@
+# Binance/agregacao_candles.py (TIMEFRAMES SUPERIORES POR AGREGAÇÃO)
+import numpy as np
+import pandas as pd
+from cache_candles import INTERVALOS_MS
+
+# Candles semanais da Binance abrem na segunda 00:00 UTC (o epoch caiu numa quinta)
+DESLOCAMENTO_MS = {'1w': 4 * 86_400_000}
+
+
+def inicio_bucket(timestamps, timeframe):
+    """Abertura (ms, UTC) do candle `timeframe` que contém cada timestamp"""
+    passo = INTERVALOS_MS[timeframe]
+    desloc = DESLOCAMENTO_MS.get(timeframe, 0)
+    ts = np.asarray(timestamps, dtype=np.int64)
+    return (ts - desloc) // passo * passo + desloc
+
+
+def agregar(df, tf_origem, tf_destino, incluir_parcial=True):
+    """
+    Monta candles OHLCV de `tf_destino` a partir de candles de `tf_origem`.
+    - Buckets alinhados em UTC como os da Binance (1h em :00, 4h em 00/04/08..., 1d em 00:00).
+    - O primeiro bucket incompleto (histórico começando no meio dele) é descartado.
+    - O último bucket incompleto é o candle em formação: mantido se `incluir_parcial`.
+    Retorna DataFrame ['timestamp', 'open', 'high', 'low', 'close', 'volume'] ou None.
+    """
+    passo_origem = INTERVALOS_MS.get(tf_origem)
+    passo_destino = INTERVALOS_MS.get(tf_destino)
+    if df is None or df.empty or not passo_origem or not passo_destino:
+        return None
+    if passo_destino % passo_origem:
+        return None  # Ex.: 3d a partir de 1w não fecha
+    por_bucket = passo_destino // passo_origem
+
+    ts = df['timestamp'].to_numpy(dtype=np.int64)
+    bucket = inicio_bucket(ts, tf_destino)
+
+    # Grupos contíguos (candles em ordem cronológica)
+    inicio = np.flatnonzero(np.r_[True, bucket[1:] != bucket[:-1]])
+    contagem = np.diff(np.r_[inicio, len(ts)])
+
+    o, h, l, c, v = (df[col].to_numpy(dtype=float) for col in ('open', 'high', 'low', 'close', 'volume'))
+    fim = np.r_[inicio[1:], len(ts)] - 1
+    agregado = pd.DataFrame({
+        'timestamp': bucket[inicio].astype(float),
+        'open': o[inicio],
+        'high': np.maximum.reduceat(h, inicio),
+        'low': np.minimum.reduceat(l, inicio),
+        'close': c[fim],
+        'volume': np.add.reduceat(v, inicio),
+    })
+
+    # Primeiro bucket: incompleto se o 1º candle não é a abertura dele
+    manter = np.ones(len(agregado), dtype=bool)
+    if ts[0] != bucket[0]:
+        manter[0] = False
+    # Último bucket: em formação se faltam candles
+    if not incluir_parcial and contagem[-1] < por_bucket:
+        manter[-1] = False
+    return agregado[manter].reset_index(drop=True)
+
+
+def agregar_janela(df, tf_origem, tf_destino, limit):
+    """
+    Últimos `limit` candles de `tf_destino` (mesma janela de buscar_candles(limit=...)).
+    None quando o histórico de `tf_origem` não cobre a janela: aí baixa da API.
+    """
+    agregado = agregar(df, tf_origem, tf_destino)
+    if agregado is None or len(agregado) < limit:
+        return None
+    return agregado.iloc[-limit:].reset_index(drop=True)
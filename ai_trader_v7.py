@@ -5,12 +5,14 @@ import numpy as np
 import os
 from indicators import Calculadora
 from binance_connector import BinanceConnector
+from contexto_mercado import obter_contexto
 
 class TraderIAV7:
     def __init__(self):
         self.modelo = None
         self.limiar = 0.55
         self.connector = BinanceConnector()
+        self.contexto = obter_contexto(self.connector)
         self.carregar_modelo()
 
     def carregar_modelo(self):
@@ -22,8 +24,8 @@ class TraderIAV7:
 
     def preparar_dados(self, df_moeda):
         try:
-            # 1. Baixar BTC
-            df_btc = self.connector.buscar_candles("BTCUSDT", "15m", limit=len(df_moeda))
+            # 1. BTC (compartilhado: 1 download por candle para todos os pares)
+            df_btc = self.contexto.btc("15m", limit=len(df_moeda))
             if df_btc is None: return None
 
             # 2. Sincronizar
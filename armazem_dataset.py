@@ -0,0 +1,189 @@
+# Binance/armazem_dataset.py (DATASETS EM PARQUET PARTICIONADO)
+"""
+Armazém colunar dos datasets de treino.
+
+salvar_dataset(df, "dataset_x.csv") grava a pasta "dataset_x/" em Parquet,
+particionada por par e mês:
+
+    dataset_x/par=WLDUSDT/mes=2025-03/parte.parquet
+    dataset_x/_meta.json
+
+Cada parte guarda a coluna interna __linha (posição original), então a leitura
+devolve as linhas na mesma ordem do DataFrame salvo. carregar_dataset lê só as
+colunas pedidas (projeção), só as partições do intervalo/pares pedidos e,
+opcionalmente, só um intervalo de linhas. Um CSV de mesmo nome não é apagado
+(pode estar versionado), mas quando a pasta Parquet existe é ela que vale:
+leia sempre por existe_dataset/carregar_dataset.
+
+Sem pyarrow instalado, tudo cai para o CSV de sempre.
+"""
+import os
+import json
+import glob
+import shutil
+import numpy as np
+import pandas as pd
+
+COLUNA_LINHA = '__linha'
+ARQUIVO_META = '_meta.json'
+SEM_PAR = '_'      # Partição de datasets sem coluna de par
+SEM_MES = '_'      # Partição de datasets sem coluna de tempo
+
+
+def _pyarrow():
+    try:
+        import pyarrow
+        import pyarrow.parquet as pq
+        return pyarrow, pq
+    except ImportError:
+        return None, None
+
+
+def pasta_dataset(arquivo):
+    """dataset_x.csv -> dataset_x (pasta do armazém Parquet)"""
+    base, ext = os.path.splitext(arquivo)
+    return base if ext.lower() == '.csv' else arquivo
+
+
+def existe_dataset(arquivo):
+    return os.path.exists(os.path.join(pasta_dataset(arquivo), ARQUIVO_META)) or os.path.exists(arquivo)
+
+
+def _mes(tempos):
+    """Timestamp em ms (ou datetime) -> 'AAAA-MM'"""
+    serie = pd.Series(tempos)
+    if not pd.api.types.is_datetime64_any_dtype(serie):
+        serie = pd.to_datetime(serie, unit='ms')
+    return serie.dt.strftime('%Y-%m').to_numpy()
+
+
+def salvar_dataset(df, arquivo, coluna_par='par', coluna_tempo='timestamp', pares=None, tempos=None):
+    """
+    Grava o dataset particionado por par/mês.
+    A chave de partição vem das colunas `coluna_par`/`coluna_tempo` (se existirem) ou
+    de `pares`/`tempos` (arrays alinhados com df, usados só para particionar).
+    Retorna o caminho gravado (pasta Parquet ou o CSV, se não houver pyarrow).
+    """
+    pa, pq = _pyarrow()
+    if pq is None:
+        df.to_csv(arquivo, index=False)
+        return arquivo
+
+    n = len(df)
+    if pares is None and coluna_par in df.columns:
+        pares = df[coluna_par].to_numpy()
+    if tempos is None and coluna_tempo in df.columns:
+        tempos = df[coluna_tempo].to_numpy()
+    if pares is None or isinstance(pares, str):
+        chave_par = np.full(n, pares or SEM_PAR)  # Dataset de um par só
+    else:
+        chave_par = np.asarray(pares).astype(str)
+    chave_mes = _mes(tempos) if tempos is not None and n else np.full(n, SEM_MES)
+
+    tabela = df.reset_index(drop=True)
+    tabela[COLUNA_LINHA] = np.arange(n, dtype=np.int64)
+
+    # Grava numa pasta temporária e troca de uma vez (leitores nunca veem meio dataset)
+    destino = pasta_dataset(arquivo)
+    temp = destino + ".tmp"
+    shutil.rmtree(temp, ignore_errors=True)
+    os.makedirs(temp)
+
+    grupos = pd.DataFrame({'par': chave_par, 'mes': chave_mes}).groupby(['par', 'mes'], sort=True).indices
+    for (par, mes), idx in grupos.items():
+        pasta = os.path.join(temp, f"par={par}", f"mes={mes}")
+        os.makedirs(pasta, exist_ok=True)
+        parte = pa.Table.from_pandas(tabela.iloc[idx], preserve_index=False)
+        pq.write_table(parte, os.path.join(pasta, "parte.parquet"))
+
+    with open(os.path.join(temp, ARQUIVO_META), 'w') as f:
+        json.dump({'linhas': n, 'colunas': [str(c) for c in df.columns]}, f)
+
+    shutil.rmtree(destino, ignore_errors=True)
+    os.replace(temp, destino)
+    return destino
+
+
+def _mes_no_intervalo(mes, inicio, fim):
+    if mes == SEM_MES:
+        return True
+    if inicio is not None and mes < _mes([inicio])[0]:
+        return False
+    if fim is not None and mes > _mes([fim])[0]:
+        return False
+    return True
+
+
+def carregar_dataset(arquivo, colunas=None, pares=None, inicio=None, fim=None, linhas=None,
+                     coluna_tempo='timestamp'):
+    """
+    Lê o dataset salvo por salvar_dataset (ou o CSV antigo, se não houver Parquet).
+    colunas: projeção (None = todas)
+    pares:   lista de pares (poda por partição)
+    inicio/fim: intervalo de tempo em ms (poda por mês e filtro por linha, se houver `coluna_tempo`)
+    linhas:  (primeira, ultima_exclusiva) na ordem original, como num fatiamento:
+             negativos contam do fim e None vai até a ponta (-2000, None) = últimas 2000
+    """
+    _, pq = _pyarrow()
+    pasta = pasta_dataset(arquivo)
+    meta = os.path.join(pasta, ARQUIVO_META)
+
+    if pq is None or not os.path.exists(meta):
+        return _carregar_csv(arquivo, colunas, inicio, fim, linhas, coluna_tempo)
+
+    with open(meta) as f:
+        info = json.load(f)
+    colunas_salvas = info['colunas']
+    pedidas = list(colunas) if colunas is not None else list(colunas_salvas)
+    filtra_tempo = (inicio is not None or fim is not None) and coluna_tempo in colunas_salvas
+    leitura = pedidas + [COLUNA_LINHA] + ([coluna_tempo] if filtra_tempo and coluna_tempo not in pedidas else [])
+
+    filtros = []
+    if linhas is not None:
+        primeira, ultima, _ = slice(*linhas).indices(info['linhas'])
+        filtros += [(COLUNA_LINHA, '>=', primeira), (COLUNA_LINHA, '<', ultima)]
+    if filtra_tempo:
+        if inicio is not None: filtros.append((coluna_tempo, '>=', inicio))
+        if fim is not None: filtros.append((coluna_tempo, '<=', fim))
+
+    partes = []
+    pares = None if pares is None else {str(p) for p in pares}
+    for parte in sorted(glob.glob(os.path.join(pasta, "par=*", "mes=*", "parte.parquet"))):
+        mes = os.path.basename(os.path.dirname(parte))[4:]
+        par = os.path.basename(os.path.dirname(os.path.dirname(parte)))[4:]
+        if pares is not None and par not in pares:
+            continue
+        if not _mes_no_intervalo(mes, inicio, fim):
+            continue
+        partes.append(parte)
+
+    if not partes:
+        return pd.DataFrame(columns=pedidas)
+
+    # Leitura multi-thread das partes selecionadas
+    df = pq.ParquetDataset(partes, filters=filtros or None, partitioning=None).read(columns=leitura).to_pandas()
+    if len(partes) > 1:
+        df = df.sort_values(COLUNA_LINHA, kind='stable')
+    return df[pedidas].reset_index(drop=True)
+
+
+def _carregar_csv(arquivo, colunas, inicio, fim, linhas, coluna_tempo):
+    filtra_tempo = inicio is not None or fim is not None
+    usecols = None
+    if colunas is not None:
+        usecols = list(colunas)
+        if filtra_tempo and coluna_tempo not in usecols:
+            usecols.append(coluna_tempo)
+    try:
+        df = pd.read_csv(arquivo, usecols=usecols)
+    except ValueError:
+        # coluna_tempo não existe no CSV: sem filtro por tempo
+        df = pd.read_csv(arquivo, usecols=colunas)
+    if linhas is not None:
+        df = df.iloc[linhas[0]:linhas[1]]
+    if filtra_tempo and coluna_tempo in df.columns:
+        if inicio is not None: df = df[df[coluna_tempo] >= inicio]
+        if fim is not None: df = df[df[coluna_tempo] <= fim]
+    if colunas is not None:
+        df = df[list(colunas)]
+    return df.reset_index(drop=True)
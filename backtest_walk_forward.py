@@ -5,6 +5,7 @@ from sklearn.ensemble import HistGradientBoostingClassifier
 from sklearn.utils import class_weight
 import matplotlib.pyplot as plt
 import os
+from armazem_dataset import carregar_dataset, existe_dataset
 
 # Configuração
 ARQUIVO_DADOS = "dataset_v8_atr.csv"
@@ -15,11 +16,11 @@ MIN_CONFIANCA = 0.55   # Só entra se tiver 55% certeza
 def backtest_deslizante():
     print("⏳ Iniciando Walk-Forward Analysis (Re-treino Contínuo)...")
     
-    if not os.path.exists(ARQUIVO_DADOS):
+    if not existe_dataset(ARQUIVO_DADOS):
         print("❌ Arquivo de dados não encontrado.")
         return
 
-    df = pd.read_csv(ARQUIVO_DADOS)
+    df = carregar_dataset(ARQUIVO_DADOS)
     total_linhas = len(df)
     print(f"📚 Total de Dados: {total_linhas} candles.")
     
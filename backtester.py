@@ -1,92 +1,196 @@
 # backtester.py
+import threading
+import numpy as np
 import pandas as pd
 from indicators import Estrategia
 
+JANELA_FUTURO = 30  # Candles olhados à frente para ver se bateu stop ou alvo
+
 class Backtester:
+    # Taxa Binance (0.1% entrada + 0.1% saida = 0.2%)
+    # Se você usar BNB para taxas, cai para 0.075% + 0.075% = 0.15%
+    TAXA_TOTAL = 0.2
+
+    @staticmethod
+    def janela_analise(n):
+        """Candles de entrada simulados: últimos 500, ignorando os 20 mais recentes pra poder ver o futuro"""
+        return np.arange(max(50, n - 500), n - 20)
+
+    @staticmethod
+    def detectar_entradas(df, tipo_sinal_atual, i):
+        """
+        Aplica a regra do sinal nos candles `i` (array de posições).
+        Retorna (entradas, stops, alvos) em ordem cronológica.
+        """
+        def colunas(regra, *nomes):
+            # Indicador faltando é erro do pipeline (como no loop antigo): não some com a regra
+            faltando = [n for n in nomes if n not in df.columns]
+            if faltando:
+                raise KeyError(f"Backtest {regra}: colunas ausentes {faltando}")
+            return [df[n].to_numpy(dtype=float) for n in nomes]
+
+        close, low = colunas('OHLC', 'close', 'low')
+
+        # --- Lógica de Detecção: (regime exigido no candle anterior, máscara de preço) ---
+        regras = []
+        if "SQUEEZE" in tipo_sinal_atual:
+            bbu, = colunas('SQUEEZE', 'BBU_20_2.0')
+            regras.append(('SQUEEZE', close[i] > bbu[i]))
+
+        if "Tendência" in tipo_sinal_atual:
+            ema_200, macd, macd_s = colunas('Tendência', 'EMA_200', 'MACD_12_26_9', 'MACDs_12_26_9')
+            # Acima da EMA200 + cruzamento MACD simples no candle anterior
+            regras.append(('TENDENCIA', (close[i] > ema_200[i]) &
+                           (macd[i - 1] > macd_s[i - 1]) & (macd[i - 2] <= macd_s[i - 2])))
+
+        if "Reversão" in tipo_sinal_atual:
+            bbl, = colunas('Reversão', 'BBL_20_2.0')
+            regras.append(('LATERAL', (low[i - 1] <= bbl[i - 1]) & (close[i - 1] > bbl[i - 1])))
+
+        entradas, stops, alvos = [], [], []
+        if not regras or len(i) == 0:
+            return np.array(entradas, dtype=int), np.array(stops), np.array(alvos)
+
+        # Regime e risco só nos candidatos (poucos), com as mesmas linhas do loop original
+        for j in np.flatnonzero(np.logical_or.reduce([m for _, m in regras])):
+            regime = Estrategia.obter_regime(df.iloc[i[j] - 1])
+            if not any(regime == r and m[j] for r, m in regras):
+                continue
+            dados = Estrategia.calcular_posicao_e_risco(df.iloc[i[j]])
+            if not dados: continue
+            entradas.append(i[j])
+            stops.append(dados['stop'])
+            alvos.append(dados['tp'])
+
+        return np.array(entradas, dtype=int), np.array(stops, dtype=float), np.array(alvos, dtype=float)
+
+    @staticmethod
+    def resolver_trades(df, entradas, stops, alvos):
+        """
+        Olha o futuro (Próximos 30 candles) de todas as entradas de uma vez.
+        Retorna (resultado, termos, decidido_em):
+          resultado   1 = WIN, -1 = LOSS, 0 = sem toque ("Time Stop" neutro)
+          termos      ganho/perda % líquidos de taxas de cada trade
+          decidido_em posição do candle que fechou o resultado (toque ou fim da janela)
+        """
+        n = len(df)
+        close, high, low = (df[c].to_numpy(dtype=float) for c in ('close', 'high', 'low'))
+
+        futuro = entradas[:, None] + np.arange(1, JANELA_FUTURO + 1)
+        existe = futuro < n  # Janela cortada no fim do histórico: sem toque nesses candles
+        futuro = np.minimum(futuro, n - 1)
+        tocou_stop = (low[futuro] <= stops[:, None]) & existe
+        tocou_tp = (high[futuro] >= alvos[:, None]) & existe
+        tocou = tocou_stop | tocou_tp
+
+        # CENÁRIO PESSIMISTA (REALISTA):
+        # Se tocou no Stop e no TP no mesmo candle, assumimos LOSS.
+        # Motivo: O pânico (queda) geralmente acontece mais rápido que a euforia.
+        primeiro = tocou.argmax(axis=1)
+        algum = tocou.any(axis=1)
+        stop_primeiro = tocou_stop[np.arange(len(entradas)), primeiro]
+        resultado = np.where(~algum, 0, np.where(stop_primeiro, -1, 1))
+        decidido_em = np.where(algum, entradas + 1 + primeiro, entradas + JANELA_FUTURO)
+
+        preco = close[entradas]
+        ganho = ((alvos - preco) / preco) * 100 - Backtester.TAXA_TOTAL
+        perda = -(np.abs((stops - preco) / preco) * 100 + Backtester.TAXA_TOTAL)
+        termos = np.where(resultado == 1, ganho, np.where(resultado == -1, perda, 0.0))
+        return resultado, termos, decidido_em
+
+    @staticmethod
+    def _resumir(resultado, termos):
+        trades_total = len(resultado)
+        if trades_total == 0: return 0, 0, 0
+        trades_win = int((resultado == 1).sum())
+        win_rate = (trades_win / trades_total) * 100
+        # Soma na ordem dos trades (mesmo acumulado do loop original)
+        saldo_acumulado_pct = sum(termos[resultado != 0].tolist(), 0.0)
+        return win_rate, trades_total, saldo_acumulado_pct
+
     @staticmethod
     def simular_sinal_no_passado(df, tipo_sinal_atual):
+        """
+        Reaplica a regra do sinal atual nos últimos 500 candles e mede o resultado.
+        Vetorizado: as condições de preço viram máscaras numpy, o regime (Estrategia)
+        só é consultado nos candles candidatos e o primeiro toque em stop/alvo de
+        todas as entradas é resolvido de uma vez (matriz entradas x 30 candles).
+        Retorna: (win_rate, trades, saldo_pct)
+        """
         # Precisa de histórico decente
         if len(df) < 200: return 0, 0, 0
-        
-        trades_total = 0
-        trades_win = 0
-        saldo_acumulado_pct = 0.0
-        
-        # Taxa Binance (0.1% entrada + 0.1% saida = 0.2%)
-        # Se você usar BNB para taxas, cai para 0.075% + 0.075% = 0.15%
-        TAXA_TOTAL = 0.2 
-        
-        # Simula nos últimos 500 candles (ignorando os 20 mais recentes pra poder ver o futuro)
-        inicio_analise = max(50, len(df) - 500)
-        
-        for i in range(inicio_analise, len(df) - 20):
-            c_atual = df.iloc[i]
-            c_ant = df.iloc[i-1]
-            
-            # Recria o sinal da época
-            regime = Estrategia.obter_regime(c_ant)
-            sinal_detectado = False
-            
-            # --- Lógica de Detecção (Simplificada para velocidade) ---
-            if "SQUEEZE" in tipo_sinal_atual and regime == 'SQUEEZE':
-                 if c_atual['close'] > c_atual['BBU_20_2.0']: sinal_detectado = True
-            
-            elif "Tendência" in tipo_sinal_atual and regime == 'TENDENCIA':
-                if c_atual['close'] > c_atual['EMA_200']:
-                    # Verifica cruzamento MACD simples
-                    if c_ant['MACD_12_26_9'] > c_ant['MACDs_12_26_9'] and \
-                       df.iloc[i-2]['MACD_12_26_9'] <= df.iloc[i-2]['MACDs_12_26_9']:
-                        sinal_detectado = True
-            
-            elif "Reversão" in tipo_sinal_atual and regime == 'LATERAL':
-                 if c_ant['low'] <= c_ant['BBL_20_2.0'] and c_ant['close'] > c_ant['BBL_20_2.0']:
-                     sinal_detectado = True
-
-            if sinal_detectado:
-                dados = Estrategia.calcular_posicao_e_risco(c_atual)
-                if not dados: continue
-                
-                stop_price = dados['stop']
-                tp_price = dados['tp']
-                
-                trades_total += 1
-                resultado_trade = 0 # 0 = Neutro, 1 = Win, -1 = Loss
-                
-                # Olha o futuro (Próximos 30 candles)
-                for f in range(i+1, i+31):
-                    c_fut = df.iloc[f]
-                    
-                    touched_stop = c_fut['low'] <= stop_price
-                    touched_tp = c_fut['high'] >= tp_price
-                    
-                    # CENÁRIO PESSIMISTA (REALISTA):
-                    # Se tocou no Stop e no TP no mesmo candle, assumimos LOSS.
-                    # Motivo: O pânico (queda) geralmente acontece mais rápido que a euforia.
-                    if touched_stop and touched_tp:
-                        resultado_trade = -1
-                        break
-                    
-                    if touched_stop:
-                        resultado_trade = -1
-                        break
-                    
-                    if touched_tp:
-                        resultado_trade = 1
-                        break
-                
-                # Se saiu do loop sem tocar em nada, é um "Time Stop" (fechou por tempo), consideramos neutro ou leve preju
-                if resultado_trade == 1:
-                    trades_win += 1
-                    # Ganho líquido descontando taxas
-                    lucro_bruto = ((tp_price - c_atual['close']) / c_atual['close']) * 100
-                    saldo_acumulado_pct += (lucro_bruto - TAXA_TOTAL)
-                elif resultado_trade == -1:
-                    # Perda descontando taxas (aumenta o prejuizo)
-                    perda_bruta = abs((stop_price - c_atual['close']) / c_atual['close']) * 100
-                    saldo_acumulado_pct -= (perda_bruta + TAXA_TOTAL)
 
-        if trades_total == 0: return 0, 0, 0
-        
-        win_rate = (trades_win / trades_total) * 100
+        i = Backtester.janela_analise(len(df))
+        entradas, stops, alvos = Backtester.detectar_entradas(df, tipo_sinal_atual, i)
+        if len(entradas) == 0: return 0, 0, 0
+
+        resultado, termos, _ = Backtester.resolver_trades(df, entradas, stops, alvos)
         # Retorna Winrate, Total e Lucro/Prejuízo Acumulado na simulação
-        return win_rate, trades_total, saldo_acumulado_pct
\ No newline at end of file
+        return Backtester._resumir(resultado, termos)
+
+
+class CacheBacktest:
+    """
+    Memoriza o backtest de cada (par, timeframe, tipo de sinal) entre os scans.
+    Guarda os trades já resolvidos (candle de entrada fechado e resultado decidido
+    num candle fechado) e o último candle de entrada resolvido; no scan seguinte só
+    simula os candles depois dele (trades com a janela de 30 candles ainda aberta
+    e candles novos). O último candle do df é o que está se formando.
+    """
+
+    def __init__(self):
+        self._trava = threading.Lock()
+        self._cache = {}  # (par, tf, tipo) -> {'ts_resolvido': float, 'trades': {ts_entrada: (resultado, termo)}}
+
+    def simular(self, df, par, timeframe, tipo_sinal_atual):
+        """Mesmo retorno de Backtester.simular_sinal_no_passado: (win_rate, trades, saldo_pct)"""
+        if len(df) < 200 or 'timestamp' not in df.columns:
+            return Backtester.simular_sinal_no_passado(df, tipo_sinal_atual)
+
+        chave = (par, timeframe, tipo_sinal_atual)
+        ts = df['timestamp'].to_numpy(dtype=float)
+        n = len(df)
+        i = Backtester.janela_analise(n)
+
+        with self._trava:
+            memo = self._cache.get(chave)
+        # Histórico voltou no tempo (ou cache vazio): simula a janela inteira
+        if memo is None or memo['ts_resolvido'] > ts[i[-1]]:
+            memo = {'ts_resolvido': -np.inf, 'trades': {}}
+
+        # Só os candles de entrada depois do último resolvido
+        novos = i[ts[i] > memo['ts_resolvido']]
+        entradas, stops, alvos = Backtester.detectar_entradas(df, tipo_sinal_atual, novos)
+        if len(entradas):
+            resultado, termos, decidido_em = Backtester.resolver_trades(df, entradas, stops, alvos)
+        else:
+            resultado, termos, decidido_em = np.array([], dtype=int), np.array([]), np.array([], dtype=int)
+
+        # Resolvido = decidido num candle já fechado; o 1º em aberto segura o marcador
+        aberto = decidido_em >= n - 1
+        ts_resolvido = float(ts[novos[-1]]) if len(novos) else memo['ts_resolvido']
+        if aberto.any():
+            pos_aberto = entradas[np.argmax(aberto)]
+            ts_resolvido = float(ts[pos_aberto - 1])
+
+        # Trades antigos ainda dentro da janela + trades novos, em ordem cronológica
+        ts_inicio = ts[i[0]]
+        trades = {t: r for t, r in memo['trades'].items() if t >= ts_inicio}
+        todos_res = [r for r, _ in trades.values()] + resultado.tolist()
+        todos_termos = [t for _, t in trades.values()] + termos.tolist()
+
+        for pos, res, termo in zip(entradas, resultado.tolist(), termos.tolist()):
+            if ts[pos] <= ts_resolvido:
+                trades[ts[pos]] = (res, termo)
+
+        with self._trava:
+            self._cache[chave] = {'ts_resolvido': ts_resolvido, 'trades': trades}
+
+        return Backtester._resumir(np.array(todos_res, dtype=int), np.array(todos_termos, dtype=float))
+
+    def manter_apenas(self, pares):
+        """Descarta o cache dos pares que saíram do universo"""
+        pares = set(pares)
+        with self._trava:
+            for chave in [c for c in self._cache if c[0] not in pares]:
+                del self._cache[chave]
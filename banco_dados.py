@@ -0,0 +1,346 @@
+# Binance/banco_dados.py (ESTADO OPERACIONAL EM SQLITE)
+"""
+Banco SQLite (modo WAL) com tudo o que os bots hoje espalham em arquivos:
+
+    documentos  carteira, cooldowns, monitor e posições (chave -> JSON)
+    trades      trades_history.csv
+    analises    analysis_history.csv
+    memoria     genesis_memory.csv (experiências do live para o sleep_mode)
+
+Vários processos (live traders, scanner, dashboard) leem e escrevem ao mesmo
+tempo: o WAL deixa leitores e um escritor trabalharem juntos, e cada escrita
+é uma transação curta que só toca as linhas alteradas.
+
+Expõe a mesma API do ArmazemEstado (ler/editar/gravar) e do DiarioTrades
+(registrar/atualizar/tudo/consultar), então GerenciadorEstado e
+MemorySystem trocam de backend com config.USAR_BANCO_SQLITE.
+
+Importar os arquivos atuais (só preenche tabelas vazias):
+    python banco_dados.py
+"""
+import os
+import glob
+import json
+import sqlite3
+import threading
+from contextlib import contextmanager
+import pandas as pd
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+COLUNAS_TRADES = ["data", "par", "lado", "preco", "qtd", "valor_usdt", "pnl_usd", "pnl_pct", "tipo", "saldo_total"]
+COLUNAS_ANALISES = ["hora", "ts", "par", "preco", "adx", "sinal", "confianca"]
+FORMATO_DATA = "%Y-%m-%d %H:%M:%S"
+
+ESQUEMA = """
+CREATE TABLE IF NOT EXISTS documentos (
+    nome TEXT NOT NULL, chave TEXT NOT NULL, valor TEXT,
+    PRIMARY KEY (nome, chave)
+) WITHOUT ROWID;
+
+CREATE TABLE IF NOT EXISTS trades (
+    id INTEGER PRIMARY KEY, data TEXT, par TEXT, lado TEXT, preco REAL, qtd REAL,
+    valor_usdt REAL, pnl_usd REAL, pnl_pct REAL, tipo TEXT, saldo_total REAL
+);
+CREATE INDEX IF NOT EXISTS idx_trades_data ON trades (data);
+CREATE INDEX IF NOT EXISTS idx_trades_par ON trades (par, data);
+
+CREATE TABLE IF NOT EXISTS analises (
+    id INTEGER PRIMARY KEY, hora TEXT, ts REAL, par TEXT, preco REAL,
+    adx REAL, sinal TEXT, confianca REAL
+);
+CREATE INDEX IF NOT EXISTS idx_analises_ts ON analises (ts);
+CREATE INDEX IF NOT EXISTS idx_analises_par ON analises (par, ts);
+
+CREATE TABLE IF NOT EXISTS memoria (
+    id INTEGER PRIMARY KEY, origem TEXT NOT NULL, ts REAL, registro TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_memoria ON memoria (origem, ts);
+"""
+
+
+def _json_padrao(valor):
+    # Números do NumPy/Pandas (np.float64, np.int64...) viram os nativos do Python
+    return valor.item() if hasattr(valor, 'item') else str(valor)
+
+
+def _para_json(valor):
+    return json.dumps(valor, default=_json_padrao)
+
+
+def _texto_data(valor):
+    return pd.Timestamp(valor).strftime(FORMATO_DATA)
+
+
+class BancoDados:
+    def __init__(self, caminho, timeout=10.0):
+        self.caminho = caminho
+        self.timeout = timeout
+        self._local = threading.local()  # Uma conexão por thread
+        self._trava = threading.Lock()
+        self._conectar().executescript(ESQUEMA)
+
+        # Leitura incremental dos trades (mesma ideia do DiarioTrades)
+        self._ultimo_trade = 0
+        self._df_trades = pd.DataFrame(columns=COLUNAS_TRADES)
+
+    # --- CONEXÃO ---
+
+    def _conectar(self):
+        con = getattr(self._local, 'con', None)
+        if con is None:
+            con = sqlite3.connect(self.caminho, timeout=self.timeout, isolation_level=None)
+            con.execute("PRAGMA journal_mode=WAL")
+            con.execute("PRAGMA synchronous=NORMAL")  # fsync agrupado nos checkpoints do WAL
+            con.execute(f"PRAGMA busy_timeout={int(self.timeout * 1000)}")
+            self._local.con = con
+        return con
+
+    @contextmanager
+    def _conexao(self):
+        """Transação de escrita (BEGIN IMMEDIATE: pega a vez de escrever já no início)"""
+        con = self._conectar()
+        con.execute("BEGIN IMMEDIATE")
+        try:
+            yield con
+        except BaseException:
+            con.execute("ROLLBACK")
+            raise
+        con.execute("COMMIT")
+
+    def _consulta(self, sql, parametros=()):
+        return self._conectar().execute(sql, parametros).fetchall()
+
+    def fechar(self):
+        con = getattr(self._local, 'con', None)
+        if con is not None:
+            con.close()
+            self._local.con = None
+
+    # --- DOCUMENTOS (API do ArmazemEstado) ---
+
+    def _carregar_documento(self, con, nome):
+        return {chave: json.loads(valor) for chave, valor in
+                con.execute("SELECT chave, valor FROM documentos WHERE nome = ?", (nome,))}
+
+    @contextmanager
+    def ler(self, nome):
+        yield self._carregar_documento(self._conectar(), nome)
+
+    @contextmanager
+    def editar(self, nome):
+        """Lê, deixa alterar e grava só as chaves que mudaram, numa transação só"""
+        with self._conexao() as con:
+            documento = self._carregar_documento(con, nome)
+            antes = {chave: _para_json(valor) for chave, valor in documento.items()}
+            yield documento
+            depois = {chave: _para_json(valor) for chave, valor in documento.items()}
+            con.executemany(
+                "INSERT OR REPLACE INTO documentos (nome, chave, valor) VALUES (?, ?, ?)",
+                [(nome, chave, valor) for chave, valor in depois.items() if antes.get(chave) != valor]
+            )
+            con.executemany(
+                "DELETE FROM documentos WHERE nome = ? AND chave = ?",
+                [(nome, chave) for chave in antes if chave not in depois]
+            )
+
+    def gravar(self):
+        """Nada pendente: cada editar já é uma transação gravada"""
+        pass
+
+    # --- POSIÇÕES ABERTAS (posicao_<PAR>.json) ---
+
+    def salvar_posicao(self, par, dados):
+        with self.editar("posicoes") as posicoes:
+            posicoes[par] = dados
+
+    def carregar_posicao(self, par):
+        with self.ler("posicoes") as posicoes:
+            return posicoes.get(par)
+
+    # --- TRADES (API do DiarioTrades) ---
+
+    def registrar(self, trade):
+        with self._conexao() as con:
+            con.execute(
+                f"INSERT INTO trades ({', '.join(COLUNAS_TRADES)}) VALUES ({', '.join('?' * len(COLUNAS_TRADES))})",
+                [trade.get(c) for c in COLUNAS_TRADES]
+            )
+
+    def _ler_trades(self, where="", parametros=()):
+        return pd.read_sql_query(
+            f"SELECT id, {', '.join(COLUNAS_TRADES)} FROM trades {where} ORDER BY id",
+            self._conectar(), params=parametros
+        )
+
+    def atualizar(self):
+        """Só os trades gravados desde a última leitura; retorna os novos"""
+        with self._trava:
+            novos = self._ler_trades("WHERE id > ?", (self._ultimo_trade,))
+            if novos.empty:
+                return novos.drop(columns='id')
+            self._ultimo_trade = int(novos['id'].iloc[-1])
+            novos = novos.drop(columns='id')
+            self._df_trades = novos if self._df_trades.empty else pd.concat([self._df_trades, novos], ignore_index=True)
+            return novos
+
+    def tudo(self):
+        self.atualizar()
+        return self._df_trades
+
+    def consultar(self, desde=None, ate=None, par=None, tipos=None):
+        """Trades filtrados direto no SQL (índices por data e por par)"""
+        filtros, parametros = [], []
+        if desde is not None:
+            filtros.append("data >= ?"); parametros.append(_texto_data(desde))
+        if ate is not None:
+            filtros.append("data <= ?"); parametros.append(_texto_data(ate))
+        if par is not None:
+            filtros.append("par = ?"); parametros.append(par)
+        if tipos is not None:
+            tipos = list(tipos)
+            filtros.append(f"tipo IN ({', '.join('?' * len(tipos))})"); parametros.extend(tipos)
+        where = ("WHERE " + " AND ".join(filtros)) if filtros else ""
+        return self._ler_trades(where, parametros).drop(columns='id')
+
+    # --- ANÁLISES (analysis_history.csv) ---
+
+    def registrar_analise(self, hora, ts, par, preco, adx, sinal, confianca):
+        with self._conexao() as con:
+            con.execute(
+                "INSERT INTO analises (hora, ts, par, preco, adx, sinal, confianca) VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (hora, ts, par, preco, adx, sinal, confianca)
+            )
+
+    def consultar_analises(self, desde_ts=None, par=None, limite=None):
+        """Análises mais recentes primeiro"""
+        filtros, parametros = [], []
+        if desde_ts is not None:
+            filtros.append("ts >= ?"); parametros.append(desde_ts)
+        if par is not None:
+            filtros.append("par = ?"); parametros.append(par)
+        sql = f"SELECT {', '.join(COLUNAS_ANALISES)} FROM analises"
+        if filtros:
+            sql += " WHERE " + " AND ".join(filtros)
+        sql += " ORDER BY ts DESC"
+        if limite is not None:
+            sql += f" LIMIT {int(limite)}"
+        return pd.read_sql_query(sql, self._conectar(), params=parametros)
+
+    # --- MEMÓRIA DO LIVE (API do MemorySystem) ---
+
+    def memorizar(self, registros, origem="genesis_memory.csv"):
+        with self._conexao() as con:
+            con.executemany(
+                "INSERT INTO memoria (origem, ts, registro) VALUES (?, ?, ?)",
+                [(origem, r.get('timestamp'), _para_json(r)) for r in registros]
+            )
+
+    def carregar_memoria(self, origem="genesis_memory.csv", desde_ts=None):
+        sql = "SELECT registro FROM memoria WHERE origem = ?"
+        parametros = [origem]
+        if desde_ts is not None:
+            sql += " AND ts >= ?"; parametros.append(desde_ts)
+        linhas = self._consulta(sql + " ORDER BY id", parametros)
+        return pd.DataFrame([json.loads(registro) for (registro,) in linhas])
+
+    def esquecer_memoria(self, origem="genesis_memory.csv"):
+        with self._conexao() as con:
+            con.execute("DELETE FROM memoria WHERE origem = ?", (origem,))
+
+
+# --- IMPORTAÇÃO DOS ARQUIVOS ATUAIS ---
+
+def _vazia(banco, tabela, where="", parametros=()):
+    return banco._consulta(f"SELECT NOT EXISTS (SELECT 1 FROM {tabela} {where})", parametros)[0][0]
+
+
+def _tem_dados(arquivo):
+    return os.path.exists(arquivo) and os.path.getsize(arquivo) > 0
+
+
+def migrar_arquivos(banco, base_dir=BASE_DIR):
+    """
+    Importa JSON/CSV existentes para o banco. Só preenche o que ainda está
+    vazio, então pode rodar de novo sem duplicar. Retorna {tabela: linhas}.
+    """
+    from manager import DOCUMENTOS
+    importados = {}
+
+    for nome, arquivo in DOCUMENTOS.items():
+        arquivo = os.path.join(base_dir, os.path.basename(arquivo))
+        if _tem_dados(arquivo) and _vazia(banco, "documentos", "WHERE nome = ?", (nome,)):
+            try:
+                with open(arquivo, 'r') as f: dados = json.load(f)
+                with banco.editar(nome) as documento:
+                    documento.update(dados)
+                importados[nome] = len(dados)
+            except (OSError, ValueError) as e:
+                print(f"⚠️ Erro ao importar {arquivo}: {e}")
+
+    # posicao_<PAR>.json (o live trader grava na pasta em que foi iniciado)
+    if _vazia(banco, "documentos", "WHERE nome = 'posicoes'"):
+        arquivos = glob.glob(os.path.join(base_dir, "posicao_*.json")) + \
+                   glob.glob(os.path.join(base_dir, "Genesis_AI", "posicao_*.json"))
+        for arquivo in arquivos:
+            par = os.path.basename(arquivo)[len("posicao_"):-len(".json")]
+            try:
+                with open(arquivo, 'r') as f: banco.salvar_posicao(par, json.load(f))
+                importados['posicoes'] = importados.get('posicoes', 0) + 1
+            except (OSError, ValueError) as e:
+                print(f"⚠️ Erro ao importar {arquivo}: {e}")
+
+    arquivo = os.path.join(base_dir, "trades_history.csv")
+    if _tem_dados(arquivo) and _vazia(banco, "trades"):
+        df = pd.read_csv(arquivo).reindex(columns=COLUNAS_TRADES)
+        df = df.astype(object).where(df.notna(), None)
+        with banco._conexao() as con:
+            con.executemany(
+                f"INSERT INTO trades ({', '.join(COLUNAS_TRADES)}) VALUES ({', '.join('?' * len(COLUNAS_TRADES))})",
+                df.itertuples(index=False, name=None)
+            )
+        importados['trades'] = len(df)
+
+    # O cabeçalho do analysis_history.csv tem 6 nomes, mas as linhas têm 7 campos
+    arquivo = os.path.join(base_dir, "analysis_history.csv")
+    if _tem_dados(arquivo) and _vazia(banco, "analises"):
+        df = pd.read_csv(arquivo, header=None, skiprows=1, names=COLUNAS_ANALISES)
+        df = df.astype(object).where(df.notna(), None)
+        with banco._conexao() as con:
+            con.executemany(
+                "INSERT INTO analises (hora, ts, par, preco, adx, sinal, confianca) VALUES (?, ?, ?, ?, ?, ?, ?)",
+                df.itertuples(index=False, name=None)
+            )
+        importados['analises'] = len(df)
+
+    arquivo = os.path.join(base_dir, "Genesis_AI", "genesis_memory.csv")
+    if _tem_dados(arquivo) and _vazia(banco, "memoria"):
+        df = pd.read_csv(arquivo)
+        registros = [{k: v for k, v in r.items() if pd.notna(v)} for r in df.to_dict('records')]
+        banco.memorizar(registros, origem=os.path.basename(arquivo))
+        importados['memoria'] = len(registros)
+
+    return importados
+
+
+_banco_padrao = None
+_trava_padrao = threading.Lock()
+
+
+def banco_padrao():
+    """Banco único do processo (config.ARQUIVO_BANCO_SQLITE)"""
+    global _banco_padrao
+    with _trava_padrao:
+        if _banco_padrao is None:
+            import config
+            _banco_padrao = BancoDados(os.path.join(BASE_DIR, config.ARQUIVO_BANCO_SQLITE))
+        return _banco_padrao
+
+
+if __name__ == "__main__":
+    banco = banco_padrao()
+    print(f"🗄️ Importando arquivos para {banco.caminho}...")
+    importados = migrar_arquivos(banco)
+    if not importados:
+        print("✅ Nada a importar (tabelas já preenchidas ou arquivos ausentes).")
+    for tabela, linhas in importados.items():
+        print(f"   {tabela:<10} {linhas} registros")
@@ -0,0 +1,102 @@
+# Binance/benchmark_indicadores.py (PANDAS_TA x KERNELS NUMPY)
+"""
+Compara o caminho antigo (df.ta.* do pandas_ta) com os kernels de
+indicadores_numpy em 1.500 e 150.000 candles sintéticos.
+Mostra o tempo médio de cada um e a maior diferença entre os resultados.
+
+Uso: python benchmark_indicadores.py
+"""
+import time
+import numpy as np
+import pandas as pd
+import pandas_ta as ta
+from indicators import Calculadora
+import indicadores_numpy as K
+
+TAMANHOS = [1_500, 150_000]
+COLUNAS = ['ATR_14', 'ADX_14', 'DMP_14', 'DMN_14', 'RSI_14', 'BBL_20_2.0', 'BBM_20_2.0',
+           'BBU_20_2.0', 'EMA_9', 'EMA_21', 'EMA_200', 'VOL_SMA_20']
+
+
+def gerar_candles(n, semente=42):
+    rng = np.random.default_rng(semente)
+    close = 100 * np.exp(np.cumsum(rng.normal(0, 0.003, n)))
+    open_ = np.r_[close[0], close[:-1]]
+    high = np.maximum(open_, close) * (1 + rng.uniform(0, 0.002, n))
+    low = np.minimum(open_, close) * (1 - rng.uniform(0, 0.002, n))
+    return pd.DataFrame({
+        'timestamp': np.arange(n, dtype=float) * 900_000,
+        'open': open_, 'high': high, 'low': low, 'close': close,
+        'volume': rng.uniform(100, 10_000, n),
+    })
+
+
+def caminho_pandas_ta(df):
+    """O adicionar_todos anterior aos kernels (pandas_ta + rolling do pandas)"""
+    df = df.copy()
+    close, high, low = df['close'], df['high'], df['low']
+    prev_close = close.shift(1)
+    tr = pd.concat([high - low, (high - prev_close).abs(), (low - prev_close).abs()], axis=1).max(axis=1)
+    df['ATR_14'] = tr.rolling(14).mean().fillna(0)
+    df['ATRr_14'] = (df['ATR_14'] / close * 100).fillna(0)
+    df.ta.adx(length=14, append=True)
+    df.ta.rsi(length=14, append=True)
+    df.ta.bbands(length=20, std=2, append=True)
+    df['EMA_9'] = df.ta.ema(close=close, length=9)
+    df['EMA_21'] = df.ta.ema(close=close, length=21)
+    df['EMA_200'] = df.ta.ema(close=close, length=200).fillna(0)
+    df['VOL_SMA_20'] = df['volume'].rolling(20).mean()
+    df.fillna(0, inplace=True)
+    return df
+
+
+def kernels_extras(df):
+    """MACD + ATR (RMA) + janelas móveis, que o Calculadora não usa"""
+    c, h, l = df['close'].to_numpy(), df['high'].to_numpy(), df['low'].to_numpy()
+    K.macd(c)
+    K.atr(h, l, c)
+    K.desvio_movel(c, 20)
+    K.maximo_movel(h, 20)
+    K.minimo_movel(l, 20)
+
+
+def pandas_ta_extras(df):
+    df.ta.macd(fast=12, slow=26, signal=9)
+    df.ta.atr(length=14)
+    df['close'].rolling(20).std()
+    df['high'].rolling(20).max()
+    df['low'].rolling(20).min()
+
+
+def cronometrar(funcao, df, repeticoes):
+    funcao(df)  # Aquecimento
+    inicio = time.perf_counter()
+    for _ in range(repeticoes):
+        funcao(df)
+    return (time.perf_counter() - inicio) / repeticoes * 1000
+
+
+def main():
+    print(f"{'Candles':>9} | {'Caso':<18} | {'pandas_ta (ms)':>14} | {'NumPy (ms)':>10} | {'Ganho':>6}")
+    print("-" * 70)
+    for n in TAMANHOS:
+        df = gerar_candles(n)
+        repeticoes = 50 if n <= 10_000 else 3
+
+        casos = [
+            ("adicionar_todos", caminho_pandas_ta, Calculadora.adicionar_todos),
+            ("MACD/ATR/janelas", pandas_ta_extras, kernels_extras),
+        ]
+        for nome, antigo, novo in casos:
+            t_antigo = cronometrar(antigo, df, repeticoes)
+            t_novo = cronometrar(novo, df, repeticoes)
+            print(f"{n:>9,} | {nome:<18} | {t_antigo:>14.2f} | {t_novo:>10.2f} | {t_antigo / t_novo:>5.1f}x")
+
+        # Os dois caminhos precisam dar o mesmo resultado
+        a, b = caminho_pandas_ta(df), Calculadora.adicionar_todos(df)
+        erro = np.max(np.abs(a[COLUNAS].to_numpy() - b[COLUNAS].to_numpy()) / (1 + np.abs(a[COLUNAS].to_numpy())))
+        print(f"{'':>9} | maior diferença relativa: {erro:.2e}")
+
+
+if __name__ == "__main__":
+    main()
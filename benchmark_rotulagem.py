@@ -0,0 +1,139 @@
+# Binance/benchmark_rotulagem.py (LOOPS x BARREIRA TRIPLA VETORIZADA)
+"""
+Compara os loops de rotulagem antigos dos geradores de dataset com o
+rotulagem.py vetorizado em 150.000 candles sintéticos.
+Mostra o tempo de cada um e confere que os rótulos são idênticos.
+
+Uso: python benchmark_rotulagem.py
+"""
+import time
+import numpy as np
+import pandas as pd
+import rotulagem
+
+N_CANDLES = 150_000
+
+
+def gerar_candles(n, semente=7):
+    rng = np.random.default_rng(semente)
+    close = 100 * np.exp(np.cumsum(rng.normal(0, 0.003, n)))
+    open_ = np.r_[close[0], close[:-1]]
+    high = np.maximum(open_, close) * (1 + rng.uniform(0, 0.003, n))
+    low = np.minimum(open_, close) * (1 - rng.uniform(0, 0.003, n))
+    return pd.DataFrame({'open': open_, 'high': high, 'low': low, 'close': close})
+
+
+# --- Loops antigos (referência) ---
+
+def loop_gerar_dataset(df, horizonte, lucro, stop):
+    """gerar_dataset.criar_alvo (df.iloc, só long)"""
+    targets = []
+    for i in range(len(df)):
+        if i + horizonte >= len(df):
+            targets.append(0)
+            continue
+        preco_entrada = df.iloc[i]['close']
+        tp_price = preco_entrada * (1 + lucro)
+        stop_price = preco_entrada * (1 - stop)
+        resultado = 0
+        for j in range(1, horizonte + 1):
+            futuro = df.iloc[i + j]
+            if futuro['low'] <= stop_price:
+                resultado = 0
+                break
+            if futuro['high'] >= tp_price:
+                resultado = 1
+                break
+        targets.append(resultado)
+    return np.array(targets)
+
+
+def loop_multi(df, horizonte, lucro, stop):
+    """gerar_dataset_multi.processar_moeda (long e short intercalados por candle)"""
+    targets = []
+    closes, highs, lows = df['close'].values, df['high'].values, df['low'].values
+    total = len(df)
+    for i in range(total):
+        if i + horizonte >= total:
+            targets.append(0)
+            continue
+        entry = closes[i]
+        tp_long, sl_long = entry * (1 + lucro), entry * (1 - stop)
+        tp_short, sl_short = entry * (1 - lucro), entry * (1 + stop)
+        res = 0
+        for j in range(1, horizonte + 1):
+            if lows[i+j] <= sl_long: pass
+            elif highs[i+j] >= tp_long:
+                res = 1; break
+            if highs[i+j] >= sl_short: pass
+            elif lows[i+j] <= tp_short:
+                res = 2; break
+        targets.append(res)
+    return np.array(targets)
+
+
+def loop_50(df, horizonte, lucro, stop):
+    """gerar_dataset_50.processar_dados (long no horizonte inteiro, depois short)"""
+    targets = []
+    closes, highs, lows = df['close'].values, df['high'].values, df['low'].values
+    for i in range(len(df)):
+        if i + horizonte >= len(df): targets.append(0); continue
+        entry = closes[i]
+        res = 0
+        for j in range(1, horizonte + 1):
+            if lows[i+j] <= entry*(1-stop): break
+            if highs[i+j] >= entry*(1+lucro): res = 1; break
+        if res == 0:
+            for j in range(1, horizonte + 1):
+                if highs[i+j] >= entry*(1+stop): break
+                if lows[i+j] <= entry*(1-lucro): res = 2; break
+        targets.append(res)
+    return np.array(targets)
+
+
+def cronometrar(funcao, *args):
+    inicio = time.perf_counter()
+    resultado = funcao(*args)
+    return resultado, (time.perf_counter() - inicio) * 1000
+
+
+def main():
+    df = gerar_candles(N_CANDLES)
+    c, h, l = df['close'].to_numpy(), df['high'].to_numpy(), df['low'].to_numpy()
+
+    casos = [
+        # nome, loop antigo, versão vetorizada, (horizonte, lucro, stop), candles no loop
+        ("gerar_dataset", loop_gerar_dataset,
+         lambda: rotulagem.rotular_long(c, h, l, 0.01, 0.005, 12), (12, 0.01, 0.005), 10_000),
+        ("gerar_dataset_multi", loop_multi,
+         lambda: rotulagem.rotular_long_short(c, h, l, 0.008, 0.004, 4, stop_encerra=False, prioridade='primeiro'),
+         (4, 0.008, 0.004), N_CANDLES),
+        ("gerar_dataset_50", loop_50,
+         lambda: rotulagem.rotular_long_short(c, h, l, 0.006, 0.003, 4), (4, 0.006, 0.003), N_CANDLES),
+    ]
+
+    print(f"{'Caso':<20} | {'Loop (ms)':>10} | {'NumPy (ms)':>10} | {'Ganho':>7} | Iguais")
+    print("-" * 66)
+    for nome, antigo, novo, params, n_loop in casos:
+        # O loop com df.iloc é lento demais para 150k: mede numa fatia e extrapola
+        ref, t_antigo = cronometrar(antigo, df.iloc[:n_loop], *params)
+        t_antigo *= N_CANDLES / n_loop
+        rotulos, t_novo = cronometrar(novo)
+
+        # Os rótulos de uma fatia só diferem nas últimas `horizonte` linhas (sem futuro na fatia)
+        horizonte = params[0]
+        corte = n_loop - horizonte
+        iguais = np.array_equal(ref[:corte], rotulos[:corte])
+        if n_loop == N_CANDLES:
+            iguais = np.array_equal(ref, rotulos)
+        print(f"{nome:<20} | {t_antigo:>10.0f} | {t_novo:>10.1f} | {t_antigo / t_novo:>6.0f}x | {iguais}")
+
+    # Barreiras por linha (ATR): mesmo custo do percentual fixo
+    atr = pd.Series(h - l).rolling(14).mean().bfill().to_numpy()
+    lucro, stop = rotulagem.barreiras_atr(c, atr, 2.0, 1.0)
+    _, t_atr = cronometrar(rotulagem.rotular_long_short, c, h, l, lucro, stop, 12)
+    print(f"{'ATR 2x/1x (h=12)':<20} | {'':>10} | {t_atr:>10.1f} |")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,18 +1,66 @@
 # Binance/binance_connector.py
 from binance.client import Client
+from binance.exceptions import BinanceAPIException
 from binance.enums import *
 import pandas as pd
 import config
 import math
+import os
+import time
+import asyncio
+import threading
+from cache_candles import CacheCandles
+from stream_candles import StreamCandles
+from governador_api import governador_padrao, calcular_peso
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
 
 class BinanceConnector:
-    def __init__(self):
+    def __init__(self, usar_cache=None):
         self.client = Client(config.BINANCE_API_KEY, config.BINANCE_API_SECRET)
 
+        # Toda chamada REST passa pelo governador de peso (compartilhado no processo/máquina)
+        self.governador = governador_padrao()
+
+        # Cache local de candles (evita rebaixar a janela inteira a cada scan)
+        if usar_cache is None:
+            usar_cache = config.USAR_CACHE_CANDLES
+        self.cache = None
+        if usar_cache:
+            self.cache = CacheCandles(
+                os.path.join(BASE_DIR, config.DIRETORIO_CACHE_CANDLES),
+                config.MAX_CANDLES_CACHE
+            )
+
+        # Modo streaming (WebSocket): ativado com iniciar_stream()
+        self.stream = None
+
+        # Índice de filtros por símbolo (exchangeInfo carregado 1x e renovado por TTL)
+        self._filtros = {}
+        self._filtros_ts = 0
+        self._trava_filtros = threading.Lock()
+
+    def chamar(self, endpoint, **params):
+        """
+        Chama um método do Client (ex.: 'futures_klines') respeitando o peso da API.
+        Espera saldo no governador, executa e atualiza o saldo com o header da resposta.
+        """
+        self.governador.adquirir(calcular_peso(endpoint, **params))
+        try:
+            resposta = getattr(self.client, endpoint)(**params)
+        except BinanceAPIException as e:
+            if e.status_code in (418, 429):
+                self.governador.penalizar()
+            raise
+        resposta_http = getattr(self.client, 'response', None)
+        if resposta_http is not None:
+            self.governador.registrar_headers(resposta_http.headers)
+        return resposta
+
     def obter_saldo_usdt(self):
         """Retorna o saldo livre em USDT na carteira de Futuros"""
         try:
-            account = self.client.futures_account_balance()
+            account = self.chamar('futures_account_balance')
             for asset in account:
                 if asset['asset'] == 'USDT':
                     return float(asset['balance']) # Saldo Total (Livre + Usado)
@@ -24,13 +72,68 @@ class BinanceConnector:
 
     def buscar_candles(self, par, timeframe, limit=100):
         try:
-            klines = self.client.futures_klines(symbol=par, interval=timeframe, limit=limit)
-            return self._tratar_df(klines)
+            # 1. Streaming: lê direto da memória
+            if self.stream is not None:
+                df = self.stream.candles(par, timeframe, limit)
+                if df is not None:
+                    return df
+
+            # 2. REST (com ou sem cache em disco)
+            if self.cache is not None:
+                df = self._buscar_candles_cache(par, timeframe, limit)
+            else:
+                klines = self.chamar('futures_klines', symbol=par, interval=timeframe, limit=limit)
+                df = self._tratar_df(klines)
+
+            # Buffer do stream velho ou curto: aproveita o REST para re-semear
+            if self.stream is not None and self.stream.acompanha(par, timeframe):
+                self.stream.semear(par, timeframe, df)
+            return df
         except Exception as e:
             print(f"⚠️ Erro API ({par}): {e}")
             return None
 
-    def _tratar_df(self, klines):
+    def iniciar_stream(self, pares, timeframe, tamanho=None):
+        """Liga o modo streaming: buscar_candles desses pares passa a ler da memória"""
+        if self.stream is None:
+            self.stream = StreamCandles(self, tamanho or config.TAMANHO_BUFFER_STREAM)
+        self.stream.iniciar(pares, timeframe)
+
+    def parar_stream(self):
+        if self.stream is not None:
+            self.stream.parar()
+            self.stream = None
+
+    def _buscar_candles_cache(self, par, timeframe, limit):
+        """Baixa só os candles que faltam no cache e serve a janela do disco/memória"""
+        with self.cache.trava(par, timeframe):
+            plano = self.cache.plano_download(par, timeframe, limit)
+            klines = self.chamar('futures_klines', symbol=par, interval=timeframe, **plano)
+            self.cache.atualizar(par, timeframe, klines, substituir='startTime' not in plano)
+            return self.cache.janela(par, timeframe, limit)
+
+    def buscar_candles_lote(self, pares, timeframe, limit=100, max_concorrencia=None):
+        """
+        Baixa vários pares de uma vez via asyncio (BinanceConnectorAsync).
+        Retorna {par: DataFrame ou None}. Não usar de dentro de um event loop.
+        """
+        from binance_connector_async import BinanceConnectorAsync
+
+        async def _lote():
+            con = await BinanceConnectorAsync.criar(max_concorrencia, cache=self.cache, governador=self.governador)
+            try:
+                return await con.buscar_candles_lote(pares, timeframe, limit)
+            finally:
+                await con.fechar()
+
+        try:
+            return asyncio.run(_lote())
+        except Exception as e:
+            print(f"⚠️ Erro no lote assíncrono: {e}")
+            return {par: None for par in pares}
+
+    @staticmethod
+    def _tratar_df(klines):
         df = pd.DataFrame(klines, columns=[
             'timestamp', 'open', 'high', 'low', 'close', 'volume', 
             'close_time', 'quote_av', 'trades', 'tb_base_av', 'tb_quote_av', 'ignore'
@@ -41,43 +144,72 @@ class BinanceConnector:
 
     def buscar_melhor_preco_book(self, par, lado):
         try:
-            book = self.client.futures_order_book(symbol=par)
+            book = self.chamar('futures_order_book', symbol=par, limit=5)
             if lado == "BUY": return float(book['bids'][0][0]) # Melhor Bid
             else: return float(book['asks'][0][0]) # Melhor Ask
         except: return self.obter_preco_atual(par)
 
     def obter_preco_atual(self, par):
         try:
-            ticker = self.client.futures_symbol_ticker(symbol=par)
+            ticker = self.chamar('futures_symbol_ticker', symbol=par)
             return float(ticker['price'])
         except: return 0.0
 
+    def _carregar_filtros(self):
+        """Baixa o exchangeInfo e monta o índice símbolo -> filtros (LOT_SIZE, PRICE_FILTER, MIN_NOTIONAL)"""
+        info = self.chamar('futures_exchange_info')
+        indice = {}
+        for s in info['symbols']:
+            filtros = {f['filterType']: f for f in s.get('filters', [])}
+            lot = filtros.get('LOT_SIZE', {})
+            preco = filtros.get('PRICE_FILTER', {})
+            notional = filtros.get('MIN_NOTIONAL', {})
+
+            step_size = float(lot.get('stepSize', 0.001))
+            indice[s['symbol']] = {
+                'step_size': step_size,
+                'min_qty': float(lot.get('minQty', 0)),
+                'tick_size': float(preco.get('tickSize', 0)),
+                'min_notional': float(notional.get('notional', notional.get('minNotional', 0))),
+                'qtd_decimais': int(round(-math.log(step_size, 10), 0)),
+                'quantity_precision': s.get('quantityPrecision'),
+                'price_precision': s.get('pricePrecision'),
+            }
+        self._filtros = indice
+        self._filtros_ts = time.time()
+
+    def obter_filtros(self, par):
+        """Filtros de negociação do par em O(1); recarrega o exchangeInfo quando o TTL vence"""
+        with self._trava_filtros:
+            if not self._filtros or time.time() - self._filtros_ts > config.TTL_EXCHANGE_INFO:
+                try:
+                    self._carregar_filtros()
+                except Exception as e:
+                    # Mantém o índice antigo se a renovação falhar
+                    print(f"⚠️ Erro ao carregar exchangeInfo: {e}")
+            return self._filtros.get(par)
+
     def calcular_qtd_correta(self, par, valor_usdt, preco_atual):
         try:
-            info = self.client.futures_exchange_info()
-            symbol_info = next((s for s in info['symbols'] if s['symbol'] == par), None)
+            filtros = self.obter_filtros(par)
+            if filtros is None: return 0
             
             qtd_bruta = valor_usdt / preco_atual
             
             # Ajuste de precisão (stepSize)
-            step_size = 0.001 # Default
-            for f in symbol_info['filters']:
-                if f['filterType'] == 'LOT_SIZE':
-                    step_size = float(f['stepSize'])
-            
-            precision = int(round(-math.log(step_size, 10), 0))
-            return round(qtd_bruta, precision)
+            return round(qtd_bruta, filtros['qtd_decimais'])
         except: return 0
 
     def cancelar_todas_ordens(self, par):
         try:
-            self.client.futures_cancel_all_open_orders(symbol=par)
+            self.chamar('futures_cancel_all_open_orders', symbol=par)
             return True
         except: return False
 
     def colocar_stop_loss(self, par, lado, qtd, preco_stop):
         try:
-            self.client.futures_create_order(
+            self.chamar(
+                'futures_create_order',
                 symbol=par,
                 side=lado,
                 type='STOP_MARKET',
@@ -96,7 +228,7 @@ class BinanceConnector:
         Retorna: dict {'qtd': float, 'preco_entrada': float, 'pnl': float, 'lado': int} ou None se zerado.
         """
         try:
-            positions = self.client.futures_position_information(symbol=par)
+            positions = self.chamar('futures_position_information', symbol=par)
             # A API retorna uma lista, pegamos o item correto
             for p in positions:
                 if p['symbol'] == par:
@@ -124,8 +256,8 @@ class BinanceConnector:
         
     def colocar_ordem_limit(self, par, lado, qtd, preco):
         try:
-            return self.client.futures_create_order(
-                symbol=par, side=lado, type='LIMIT', 
+            return self.chamar(
+                'futures_create_order', symbol=par, side=lado, type='LIMIT', 
                 timeInForce='GTC', quantity=qtd, price=preco
             )
         except: return None
\ No newline at end of file
@@ -0,0 +1,72 @@
+# Binance/binance_connector_async.py (CONNECTOR ASSÍNCRONO)
+import asyncio
+from binance import AsyncClient
+from binance.exceptions import BinanceAPIException
+import config
+from binance_connector import BinanceConnector
+from governador_api import governador_padrao, calcular_peso
+
+
+class BinanceConnectorAsync:
+    """
+    Variante asyncio do BinanceConnector.
+    Usa o AsyncClient do python-binance (uma única sessão aiohttp, com pool de
+    conexões) e busca vários pares ao mesmo tempo, limitado por um semáforo.
+
+    Uso:
+        con = await BinanceConnectorAsync.criar()
+        dfs = await con.buscar_candles_lote(['BTCUSDT', 'ETHUSDT'], '15m', 100)
+        await con.fechar()
+    """
+
+    def __init__(self, client, max_concorrencia=None, cache=None, governador=None):
+        self.client = client
+        self.cache = cache  # Mesmo CacheCandles do connector síncrono (opcional)
+        self.governador = governador or governador_padrao()
+        self._semaforo = asyncio.Semaphore(max_concorrencia or config.MAX_CONCORRENCIA_ASYNC)
+
+    @classmethod
+    async def criar(cls, max_concorrencia=None, cache=None, governador=None):
+        client = await AsyncClient.create(config.BINANCE_API_KEY, config.BINANCE_API_SECRET)
+        return cls(client, max_concorrencia, cache, governador)
+
+    async def fechar(self):
+        await self.client.close_connection()
+
+    async def chamar(self, endpoint, **params):
+        """Versão assíncrona de BinanceConnector.chamar (mesmo governador de peso)"""
+        await self.governador.adquirir_async(calcular_peso(endpoint, **params))
+        try:
+            resposta = await getattr(self.client, endpoint)(**params)
+        except BinanceAPIException as e:
+            if e.status_code in (418, 429):
+                self.governador.penalizar()
+            raise
+        resposta_http = getattr(self.client, 'response', None)
+        if resposta_http is not None:
+            self.governador.registrar_headers(resposta_http.headers)
+        return resposta
+
+    async def buscar_candles(self, par, timeframe, limit=100):
+        async with self._semaforo:
+            try:
+                if self.cache is None:
+                    klines = await self.chamar('futures_klines', symbol=par, interval=timeframe, limit=limit)
+                    return BinanceConnector._tratar_df(klines)
+
+                # Mesmo fluxo incremental do connector síncrono
+                plano = self.cache.plano_download(par, timeframe, limit)
+                klines = await self.chamar('futures_klines', symbol=par, interval=timeframe, **plano)
+                self.cache.atualizar(par, timeframe, klines, substituir='startTime' not in plano)
+                return self.cache.janela(par, timeframe, limit)
+            except Exception as e:
+                print(f"⚠️ Erro API ({par}): {e}")
+                return None
+
+    async def buscar_candles_lote(self, pares, timeframe, limit=100):
+        """Busca todos os pares concorrentemente. Retorna {par: DataFrame ou None}"""
+        pares = list(dict.fromkeys(pares))  # Sem repetidos (cada par uma vez no cache)
+        resultados = await asyncio.gather(
+            *(self.buscar_candles(par, timeframe, limit) for par in pares)
+        )
+        return dict(zip(pares, resultados))
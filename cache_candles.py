@@ -0,0 +1,129 @@
+# Binance/cache_candles.py (CACHE LOCAL DE KLINES)
+import os
+import time
+import threading
+import pandas as pd
+
+# Colunas guardadas em disco (close_time fica só no cache)
+COLUNAS_CACHE = ['timestamp', 'open', 'high', 'low', 'close', 'volume', 'close_time']
+COLUNAS_CANDLE = ['timestamp', 'open', 'high', 'low', 'close', 'volume']
+
+# Duração de cada timeframe da Binance em milissegundos
+INTERVALOS_MS = {
+    '1m': 60_000, '3m': 180_000, '5m': 300_000, '15m': 900_000, '30m': 1_800_000,
+    '1h': 3_600_000, '2h': 7_200_000, '4h': 14_400_000, '6h': 21_600_000,
+    '8h': 28_800_000, '12h': 43_200_000, '1d': 86_400_000, '3d': 259_200_000,
+    '1w': 604_800_000,
+}
+
+LIMITE_API = 1500  # Máximo de candles por chamada de futures_klines
+
+
+class CacheCandles:
+    """
+    Armazém persistente de candles por (par, timeframe).
+    Mantém o histórico em disco e em memória; o connector pede à Binance
+    apenas os candles posteriores ao último salvo.
+    """
+
+    def __init__(self, diretorio, max_candles=LIMITE_API):
+        self.diretorio = diretorio
+        self.max_candles = max_candles
+        self._memoria = {}      # (par, tf) -> DataFrame com COLUNAS_CACHE
+        self._ultimo_salvo = {} # (par, tf) -> timestamp do último candle gravado
+        self._travas = {}
+        self._trava_travas = threading.Lock()
+        os.makedirs(diretorio, exist_ok=True)
+
+    def trava(self, par, timeframe):
+        """Lock por (par, timeframe) para o scanner paralelo não baixar duas vezes"""
+        chave = (par, timeframe)
+        with self._trava_travas:
+            if chave not in self._travas:
+                self._travas[chave] = threading.Lock()
+            return self._travas[chave]
+
+    def _arquivo(self, par, timeframe):
+        return os.path.join(self.diretorio, f"{par}_{timeframe}.csv")
+
+    def ler(self, par, timeframe):
+        chave = (par, timeframe)
+        if chave in self._memoria:
+            return self._memoria[chave]
+
+        arquivo = self._arquivo(par, timeframe)
+        if not os.path.exists(arquivo):
+            return None
+        try:
+            df = pd.read_csv(arquivo)
+            df = df[COLUNAS_CACHE].astype(float)
+        except Exception as e:
+            print(f"⚠️ Cache corrompido ({par} {timeframe}): {e}")
+            return None
+
+        self._memoria[chave] = df
+        if not df.empty:
+            self._ultimo_salvo[chave] = df['timestamp'].iloc[-1]
+        return df
+
+    def plano_download(self, par, timeframe, limit):
+        """
+        Diz o que pedir à API.
+        Retorna kwargs para futures_klines: {'limit': n} para baixar tudo de novo
+        ou {'startTime': ts, 'limit': n} para buscar só os candles novos.
+        """
+        limit_total = min(max(limit, 1), LIMITE_API)
+        df = self.ler(par, timeframe)
+        passo = INTERVALOS_MS.get(timeframe)
+
+        if df is None or len(df) < limit or passo is None:
+            return {'limit': limit_total}
+
+        # Rebaixa a partir do último candle salvo (pode estar aberto) até agora
+        ultimo = int(df['timestamp'].iloc[-1])
+        agora = int(time.time() * 1000)
+        faltam = max(0, (agora - ultimo) // passo) + 1
+
+        if faltam >= LIMITE_API:
+            return {'limit': limit_total} # Buraco grande demais: baixa tudo
+        return {'startTime': ultimo, 'limit': int(faltam) + 2} # +1 de folga p/ relógio local atrasado
+
+    def atualizar(self, par, timeframe, klines, substituir=False):
+        """Funde os klines recebidos com o histórico e grava se fechou candle novo"""
+        chave = (par, timeframe)
+        novos = pd.DataFrame([k[:7] for k in klines], columns=COLUNAS_CACHE).astype(float)
+
+        antigo = None if substituir else self.ler(par, timeframe)
+        if antigo is not None and not antigo.empty:
+            df = pd.concat([antigo, novos], ignore_index=True)
+            df = df.drop_duplicates(subset='timestamp', keep='last')
+            df = df.sort_values('timestamp').reset_index(drop=True)
+        else:
+            df = novos.reset_index(drop=True)
+
+        if len(df) > self.max_candles:
+            df = df.iloc[-self.max_candles:].reset_index(drop=True)
+
+        self._memoria[chave] = df
+
+        # Só vai ao disco quando aparece candle novo (o último aberto muda a cada chamada)
+        if not df.empty and self._ultimo_salvo.get(chave) != df['timestamp'].iloc[-1]:
+            self._salvar(par, timeframe, df)
+            self._ultimo_salvo[chave] = df['timestamp'].iloc[-1]
+        return df
+
+    def _salvar(self, par, timeframe, df):
+        arquivo = self._arquivo(par, timeframe)
+        temp = arquivo + ".tmp"
+        try:
+            df.to_csv(temp, index=False)
+            os.replace(temp, arquivo)
+        except Exception as e:
+            print(f"⚠️ Erro ao gravar cache {par} {timeframe}: {e}")
+
+    def janela(self, par, timeframe, limit):
+        """Últimos `limit` candles no mesmo formato de BinanceConnector._tratar_df"""
+        df = self.ler(par, timeframe)
+        if df is None:
+            return None
+        return df[COLUNAS_CANDLE].iloc[-limit:].reset_index(drop=True)
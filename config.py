@@ -77,9 +77,31 @@ EMAIL_ESPERA_SEGUNDOS = 10      # Espera entre tentativas
 
 # --- CONFIGURAÇÕES DE PERFORMANCE ---
 MAX_WORKERS_PARALELO = 10       # Threads simultâneas para análise
+MAX_CONCORRENCIA_ASYNC = 20     # Requisições simultâneas no connector assíncrono
 LOOKBACK_ANALISE = "60 days ago UTC"  # Período de dados para análise
 LOOKBACK_BACKTEST = "60 days ago UTC" # Período para backtesting
 
+# --- CACHE DE CANDLES ---
+USAR_CACHE_CANDLES = True               # Guarda klines em disco e baixa só os candles novos
+DIRETORIO_CACHE_CANDLES = "cache_candles"  # Pasta do cache (relativa ao binance_connector.py)
+MAX_CANDLES_CACHE = 1500                # Histórico máximo guardado por par/timeframe
+DIRETORIO_HISTORICO = "historico_klines"  # Blocos do downloader de histórico (datasets)
+
+# --- EXCHANGE INFO ---
+TTL_EXCHANGE_INFO = 3600                # Segundos até recarregar os filtros dos símbolos (LOT_SIZE etc.)
+
+# --- LIMITE DE PESO DA API ---
+LIMITE_PESO_API_MINUTO = 2400           # REQUEST_WEIGHT por minuto da Binance Futures (por IP)
+MARGEM_PESO_API = 0.9                   # Fração do limite que os bots podem usar
+ARQUIVO_GOVERNADOR_API = "governador_api.json"  # Saldo compartilhado entre processos (None = só no processo)
+
+# --- ESTADO OPERACIONAL ---
+USAR_BANCO_SQLITE = False               # Carteira, cooldowns, monitor, trades, análises e memória num SQLite (WAL) compartilhado
+ARQUIVO_BANCO_SQLITE = "genesis.db"     # Banco (relativo ao banco_dados.py); `python banco_dados.py` importa os arquivos atuais
+
+# --- STREAMING (WEBSOCKET) ---
+TAMANHO_BUFFER_STREAM = 500             # Candles mantidos em memória por par no modo streaming
+
 # =============================================================================
 # CONFIGURAÇÕES AVANÇADAS (FUTURES)
 # =============================================================================
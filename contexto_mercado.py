@@ -0,0 +1,111 @@
+# Binance/contexto_mercado.py (CONTEXTO DE MERCADO COMPARTILHADO)
+import time
+import threading
+import pandas as pd
+from cache_candles import INTERVALOS_MS
+from indicators import CalculadoraIncremental
+
+LIMITE_PADRAO = 500  # Candles das séries de referência (EMA/RSI/ADX precisam de bem menos)
+
+
+class ContextoMercado:
+    """
+    Séries de referência (BTCUSDT, ETHBTC...) compartilhadas pelo processo.
+    Os candles fechados são baixados uma vez por fechamento de candle e ficam
+    em cache; o candle em formação é atualizado a cada chamada com um pedido
+    leve (limit=2, ou o buffer do stream) e só a linha dele tem os indicadores
+    recalculados (CalculadoraIncremental). Assim a última linha acompanha o
+    preço atual, como no candle do par analisado. Todos os consumidores
+    recebem o mesmo DataFrame: somente leitura, quem precisar alterar faz .copy().
+    """
+
+    def __init__(self, connector=None):
+        self._connector = connector
+        self._trava = threading.Lock()
+        self._travas = {}
+        self._series = {}  # (par, tf) -> {'fechados', 'df', 'formando', 'limit', 'validade'}
+        self._calc = CalculadoraIncremental()
+
+    @property
+    def connector(self):
+        if self._connector is None:
+            from binance_connector import BinanceConnector
+            self._connector = BinanceConnector()
+        return self._connector
+
+    def _trava_chave(self, chave):
+        with self._trava:
+            return self._travas.setdefault(chave, threading.Lock())
+
+    def serie(self, par, timeframe, limit=LIMITE_PADRAO):
+        """Candles + indicadores do par de referência (últimos `limit`) ou None"""
+        chave = (par, timeframe)
+        with self._trava_chave(chave):
+            item = self._series.get(chave)
+            agora = time.time() * 1000
+            if item is not None and item['limit'] >= limit and agora < item['validade']:
+                # Fechados em cache: só o candle em formação precisa ser atualizado
+                ultimos = self.connector.buscar_candles(par, timeframe, limit=2)
+                if ultimos is None or ultimos.empty:
+                    return self._janela(item['df'], limit)  # Falha: serve a última versão
+                formando = ultimos.iloc[-1:]
+                if formando['timestamp'].iloc[0] == item['formando']['timestamp'].iloc[0]:
+                    if not self._mesmo_candle(formando, item['formando']):
+                        self._montar(chave, item, formando)
+                    return self._janela(item['df'], limit)
+                # Virou o candle antes da validade (relógio adiantado): baixa tudo
+
+            limit_total = max(limit, item['limit'] if item else 0)
+            df = self.connector.buscar_candles(par, timeframe, limit=limit_total)
+            if df is None or df.empty:
+                # Falha no download: serve a última versão (se houver)
+                return None if item is None else self._janela(item['df'], limit)
+
+            passo = INTERVALOS_MS.get(timeframe)
+            # Fechados válidos até o candle em formação fechar
+            validade = df['timestamp'].iloc[-1] + passo if passo else agora + 60_000
+            item = {'fechados': df.iloc[:-1], 'limit': limit_total, 'validade': validade}
+            self._montar(chave, item, df.iloc[-1:])
+            self._series[chave] = item
+        return self._janela(item['df'], limit)
+
+    def _montar(self, chave, item, formando):
+        """Fechados + candle em formação com indicadores (o estado incremental só recalcula a última linha)"""
+        df = pd.concat([item['fechados'], formando], ignore_index=True)
+        item['df'] = self._calc.adicionar_todos(df, *chave)
+        item['formando'] = formando
+
+    @staticmethod
+    def _mesmo_candle(a, b):
+        colunas = ['high', 'low', 'close', 'volume']
+        return (a[colunas].to_numpy() == b[colunas].to_numpy()).all()
+
+    def btc(self, timeframe, limit=LIMITE_PADRAO):
+        return self.serie("BTCUSDT", timeframe, limit)
+
+    def esquecer(self, par=None, timeframe=None):
+        """Força novo download (de um par/timeframe ou de tudo)"""
+        with self._trava:
+            for chave in list(self._series):
+                if (par is None or chave[0] == par) and (timeframe is None or chave[1] == timeframe):
+                    del self._series[chave]
+                    self._calc.esquecer(*chave)
+
+    @staticmethod
+    def _janela(df, limit):
+        return df if len(df) <= limit else df.iloc[-limit:]
+
+
+_contexto_padrao = None
+_trava_padrao = threading.Lock()
+
+
+def obter_contexto(connector=None):
+    """Serviço único do processo (o primeiro connector informado é o usado nos downloads)"""
+    global _contexto_padrao
+    with _trava_padrao:
+        if _contexto_padrao is None:
+            _contexto_padrao = ContextoMercado(connector)
+        elif connector is not None and _contexto_padrao._connector is None:
+            _contexto_padrao._connector = connector
+        return _contexto_padrao
@@ -4,39 +4,150 @@ import pandas as pd
 import time
 import json
 import os
+import threading
 import plotly.express as px
 import plotly.graph_objects as go
+import config
+from diario_trades import DiarioTrades
+from decimacao import decimar
 
 # Configuração
 st.set_page_config(page_title="Gênesis Pro", page_icon="🦅", layout="wide")
 st.title("🦅 Gênesis AI - Centro de Comando")
 
+TIPOS_FECHAMENTO = ['CLOSE', 'Trailing Stop', 'IA (Close)', 'Inversão']
+
+
+class HistoricoIncremental:
+    """
+    Histórico de trades, contagem de fechamentos e curva de capital que só
+    processam as linhas novas a cada refresh. Vive no cache_resource: todas
+    as sessões e reruns usam o mesmo objeto.
+    """
+
+    def __init__(self, fonte):
+        self.fonte = fonte  # DiarioTrades ou BancoDados (mesma API)
+        self._trava = threading.Lock()
+        self.versao = 0
+        self._zerar()
+
+    def _zerar(self):
+        self.n_linhas = 0
+        self.trades_fechados = 0
+        self.curva = pd.DataFrame(columns=['data', 'pnl_acumulado'])
+        self._fig, self._chave_fig = None, None
+        self._tabela, self._versao_tabela = None, None
+
+    def atualizar(self):
+        with self._trava:
+            novos = self.fonte.atualizar()
+            if len(self.fonte.tudo()) != self.n_linhas + len(novos):
+                # Arquivo recriado (reset_system): refaz do zero
+                self._zerar()
+                novos = self.fonte.tudo()
+            if novos.empty:
+                return
+            self.n_linhas += len(novos)
+            self.trades_fechados += int(novos['tipo'].isin(TIPOS_FECHAMENTO).sum())
+
+            # Curva acumulada: continua a soma a partir do último ponto
+            # Simplificação: Usamos todas as linhas que têm PnL registrado
+            com_pnl = novos[novos['pnl_usd'] != 0]
+            if not com_pnl.empty:
+                base = self.curva['pnl_acumulado'].iloc[-1] if not self.curva.empty else 0.0
+                trecho = pd.DataFrame({'data': com_pnl['data'].values,
+                                       'pnl_acumulado': base + com_pnl['pnl_usd'].cumsum().values})
+                self.curva = trecho if self.curva.empty else pd.concat([self.curva, trecho], ignore_index=True)
+            self.versao += 1
+
+    def figura(self, saldo_inicial):
+        """Gráfico de equity refeito só quando entram trades novos (ou muda o saldo inicial)"""
+        with self._trava:
+            chave = (self.versao, saldo_inicial)
+            if self._chave_fig != chave and not self.curva.empty:
+                # Pontos fixos por gráfico (mantém topos e fundos) por maior que seja o histórico
+                x, y = decimar(saldo_inicial + self.curva['pnl_acumulado'], x=self.curva['data'])
+                fig = go.Figure()
+                fig.add_trace(go.Scatter(
+                    x=x, 
+                    y=y,
+                    mode='lines+markers',
+                    name='Equity',
+                    line=dict(color='#00ff00', width=3),
+                    fill='tozeroy', # Efeito visual bonito
+                    fillcolor='rgba(0, 255, 0, 0.1)'
+                ))
+                
+                fig.update_layout(
+                    template="plotly_dark",
+                    height=350,
+                    margin=dict(l=10, r=10, t=30, b=10),
+                    title="Evolução do Saldo ($)",
+                    xaxis_title="Tempo",
+                    yaxis_title="Capital"
+                )
+                self._fig, self._chave_fig = fig, chave
+            return self._fig
+
+    def tabela(self):
+        """Histórico do mais novo para o mais antigo (refeito só quando muda)"""
+        with self._trava:
+            if self._versao_tabela != self.versao:
+                self._tabela = self.fonte.tudo().sort_index(ascending=False).copy()
+                self._versao_tabela = self.versao
+            return self._tabela
+
+
+@st.cache_resource
+def obter_historico():
+    if config.USAR_BANCO_SQLITE:
+        from banco_dados import banco_padrao
+        return HistoricoIncremental(banco_padrao())
+    return HistoricoIncremental(DiarioTrades("trades_history.csv"))
+
+
+@st.cache_data(max_entries=8)
+def ler_json(caminho, mtime, tamanho):
+    """JSON relido só quando mtime/tamanho mudam (a chave do cache)"""
+    with open(caminho, "r") as f: return json.load(f)
+
+
+def ler_json_se_mudou(caminho, padrao):
+    try:
+        info = os.stat(caminho)
+        return ler_json(caminho, info.st_mtime_ns, info.st_size)
+    except (OSError, ValueError):
+        return padrao
+
+
 # Função de Carregamento Seguro
 def get_data():
     monitor = {}
     wallet = {"saldo": 200, "saldo_inicial": 200}
-    history = pd.DataFrame()
+    historico = obter_historico()
     
     # Tenta ler arquivos JSON/CSV com tolerância a falhas de leitura/escrita
     try:
-        if os.path.exists("monitor_live.json"):
-            with open("monitor_live.json", "r") as f: monitor = json.load(f)
-    except: pass
-        
-    try:
-        if os.path.exists("bot_wallet.json"):
-            with open("bot_wallet.json", "r") as f: wallet = json.load(f)
-    except: pass
-        
-    try:
-        if os.path.exists("trades_history.csv"):
-            history = pd.read_csv("trades_history.csv")
-    except: pass
-        
-    return monitor, wallet, history
+        historico.atualizar()
+    except Exception as e:
+        st.error(f"Erro ao ler histórico: {e}")
+    
+    if config.USAR_BANCO_SQLITE:
+        try:
+            from banco_dados import banco_padrao
+            banco = banco_padrao()
+            with banco.ler("monitor") as m: monitor = m
+            with banco.ler("carteira") as c: wallet = c or wallet
+        except Exception as e:
+            st.error(f"Erro ao ler o banco: {e}")
+        return monitor, wallet, historico
+    
+    monitor = ler_json_se_mudou("monitor_live.json", monitor)
+    wallet = ler_json_se_mudou("bot_wallet.json", wallet)
+    return monitor, wallet, historico
 
 # Loop de Dados
-monitor, wallet, df_hist = get_data()
+monitor, wallet, historico = get_data()
 
 # --- 1. MÉTRICAS FINANCEIRAS (TOPO) ---
 saldo_atual = wallet.get("saldo", 200.0)
@@ -68,11 +179,7 @@ with col3:
 
 with col4:
     # Trades Fechados
-    if not df_hist.empty:
-        trades_fechados = df_hist[df_hist['tipo'].isin(['CLOSE', 'Trailing Stop', 'IA (Close)', 'Inversão'])].shape[0]
-    else:
-        trades_fechados = 0
-    st.metric("Trades Finalizados", trades_fechados)
+    st.metric("Trades Finalizados", historico.trades_fechados)
 
 st.markdown("---")
 
@@ -82,38 +189,9 @@ c1, c2 = st.columns([2, 1])
 with c1:
     st.subheader("📈 Curva de Crescimento")
     
-    if not df_hist.empty:
-        # Filtra apenas linhas que alteram o saldo (CLOSE ou SELL de fechamento)
-        # Simplificação: Usamos todas as linhas que têm PnL registrado
-        df_chart = df_hist[df_hist['pnl_usd'] != 0].copy()
-        
-        if not df_chart.empty:
-            # Cria a curva acumulada
-            df_chart['saldo_acumulado'] = saldo_inicial + df_chart['pnl_usd'].cumsum()
-            
-            # Adiciona ponto inicial (dia 0)
-            inicio = pd.DataFrame({'data': [df_chart.iloc[0]['data']], 'saldo_acumulado': [saldo_inicial]})
-            # df_chart = pd.concat([inicio, df_chart]) # Opcional
-            
-            fig = go.Figure()
-            fig.add_trace(go.Scatter(
-                x=df_chart['data'], 
-                y=df_chart['saldo_acumulado'],
-                mode='lines+markers',
-                name='Equity',
-                line=dict(color='#00ff00', width=3),
-                fill='tozeroy', # Efeito visual bonito
-                fillcolor='rgba(0, 255, 0, 0.1)'
-            ))
-            
-            fig.update_layout(
-                template="plotly_dark",
-                height=350,
-                margin=dict(l=10, r=10, t=30, b=10),
-                title="Evolução do Saldo ($)",
-                xaxis_title="Tempo",
-                yaxis_title="Capital"
-            )
+    if historico.n_linhas:
+        fig = historico.figura(saldo_inicial)
+        if fig is not None:
             st.plotly_chart(fig, use_container_width=True)
         else:
             st.info("Aguardando primeiro lucro realizado para gerar gráfico...")
@@ -134,9 +212,9 @@ with c2:
 # --- 3. HISTÓRICO DETALHADO (TABELA) ---
 st.subheader("📝 Histórico de Operações")
 
-if not df_hist.empty:
+if historico.n_linhas:
     # Formatação bonita
-    df_show = df_hist.sort_index(ascending=False).copy()
+    df_show = historico.tabela()
     
     st.dataframe(
         df_show,
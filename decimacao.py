@@ -0,0 +1,51 @@
+# Binance/decimacao.py (SÉRIES REDUZIDAS PARA GRÁFICOS)
+"""
+Reduz séries longas (curvas de patrimônio, preços) a um número fixo de
+pontos antes de plotar, para o custo do gráfico não crescer com o histórico.
+
+Bucketing min/max: a série é dividida em `max_pontos // 2` baldes e de cada
+um ficam o menor e o maior valor, na ordem original. Picos e fundos (o
+drawdown máximo) continuam no gráfico; primeiro e último ponto sempre ficam.
+
+Uso:
+    x, y = decimar(equity)                      # x = posição original (candle/trade)
+    plt.plot(x, y)
+    x, y = decimar(curva['saldo'], x=curva['data'])
+"""
+import numpy as np
+
+PONTOS_GRAFICO = 2000  # Pontos máximos por linha (≈ largura de um gráfico em pixels x 1.5)
+
+
+def indices_decimados(y, max_pontos=PONTOS_GRAFICO):
+    """Índices (ordenados) dos pontos que representam `y` em até ~max_pontos"""
+    y = np.asarray(y, dtype=float)
+    n = len(y)
+    if n <= max_pontos:
+        return np.arange(n)
+
+    tamanho = -(-n // max(1, max_pontos // 2))  # Pontos por balde (arredondado para cima)
+    baldes = -(-n // tamanho)
+
+    # Último balde completado com NaN para virar uma matriz (baldes x tamanho)
+    matriz = np.full(baldes * tamanho, np.nan)
+    matriz[:n] = y
+    matriz = matriz.reshape(baldes, tamanho)
+    validos = ~np.isnan(matriz).all(axis=1)  # Baldes só com NaN não têm min/max
+    matriz = matriz[validos]
+    base = np.flatnonzero(validos) * tamanho
+
+    indices = np.concatenate([
+        [0, n - 1],
+        base + np.nanargmin(matriz, axis=1),
+        base + np.nanargmax(matriz, axis=1),
+    ])
+    return np.unique(indices)
+
+
+def decimar(y, x=None, max_pontos=PONTOS_GRAFICO):
+    """(x, y) reduzidos; sem `x`, x é a posição de cada ponto na série original"""
+    valores = np.asarray(y)
+    idx = indices_decimados(valores, max_pontos)
+    eixo = idx if x is None else np.asarray(x)[idx]
+    return eixo, valores[idx]
@@ -0,0 +1,207 @@
+# Binance/diario_trades.py (DIÁRIO DE TRADES SÓ-ANEXA)
+"""
+trades_history.csv como diário só-anexa.
+
+Cada trade vira uma linha escrita de uma vez no fim do arquivo (O_APPEND),
+sem reler nem reescrever o histórico. O flush é imediato (leitores veem a
+linha na hora) e o fsync é agrupado: no máximo um a cada INTERVALO_FSYNC
+segundos, e um último na saída do processo.
+
+Leitura incremental: o diário lembra até que byte já leu e guarda o
+deslocamento do primeiro trade de cada dia, então consultar(desde=...) pula
+direto para o dia pedido e atualizar() só lê as linhas novas.
+
+Uso:
+    diario = DiarioTrades()
+    diario.registrar({"data": ..., "par": "WLDUSDT", ...})
+    df_hoje = diario.consultar(desde="2025-01-31")
+"""
+import io
+import os
+import csv
+import atexit
+import bisect
+import threading
+import time
+import pandas as pd
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+ARQUIVO_HISTORICO = os.path.join(BASE_DIR, "trades_history.csv")
+COLUNAS = ["data", "par", "lado", "preco", "qtd", "valor_usdt", "pnl_usd", "pnl_pct", "tipo", "saldo_total"]
+INTERVALO_FSYNC = 2.0  # Segundos máximos entre um trade e o fsync dele
+
+
+class DiarioTrades:
+    def __init__(self, arquivo=ARQUIVO_HISTORICO, intervalo_fsync=INTERVALO_FSYNC):
+        self.arquivo = arquivo
+        self.intervalo_fsync = intervalo_fsync
+        self._trava = threading.Lock()
+        self._f = None
+        self._ultimo_fsync = 0.0
+        self._timer = None
+
+        self._trava_leitura = threading.Lock()  # Várias sessões do dashboard dividem o mesmo diário
+        self._zerar_leitura()
+
+    # --- ESCRITA ---
+
+    def _abrir(self):
+        if self._f is None:
+            novo = not os.path.exists(self.arquivo) or os.path.getsize(self.arquivo) == 0
+            self._f = open(self.arquivo, 'a', newline='', encoding='utf-8')
+            if novo:
+                self._escrever_linha(COLUNAS)
+            atexit.register(self.fechar)
+        return self._f
+
+    def _escrever_linha(self, valores):
+        buffer = io.StringIO()
+        csv.writer(buffer, lineterminator='\n').writerow(valores)
+        self._f.write(buffer.getvalue())  # Uma única escrita por linha
+        self._f.flush()
+
+    def registrar(self, trade):
+        """Anexa um trade (dict com as COLUNAS; faltantes ficam vazias)"""
+        with self._trava:
+            self._abrir()
+            self._escrever_linha([trade.get(c, "") for c in COLUNAS])
+            if time.time() - self._ultimo_fsync >= self.intervalo_fsync:
+                self._fsync()
+            elif self._timer is None:
+                self._timer = threading.Timer(self.intervalo_fsync, self.sincronizar)
+                self._timer.daemon = True
+                self._timer.start()
+
+    def _fsync(self):
+        try:
+            os.fsync(self._f.fileno())
+        except OSError as e:
+            print(f"⚠️ Erro no fsync do diário: {e}")
+        self._ultimo_fsync = time.time()
+
+    def sincronizar(self):
+        """Garante em disco tudo o que já foi anexado"""
+        with self._trava:
+            self._timer = None
+            if self._f is not None:
+                self._fsync()
+
+    def fechar(self):
+        with self._trava:
+            if self._timer is not None:
+                self._timer.cancel()
+                self._timer = None
+            if self._f is not None:
+                self._fsync()
+                self._f.close()
+                self._f = None
+
+    # --- LEITURA ---
+
+    def _zerar_leitura(self):
+        # Tudo até `_lido` já está em `_df`; `_dias`/`_offsets` indexam o arquivo por dia
+        self._lido = 0
+        self._df = pd.DataFrame(columns=COLUNAS)
+        self._dias = []
+        self._offsets = []
+
+    def atualizar(self):
+        """Lê só as linhas completas anexadas desde a última leitura; retorna as novas"""
+        with self._trava_leitura:
+            return self._atualizar()
+
+    def _atualizar(self):
+        if not os.path.exists(self.arquivo):
+            return self._df.iloc[0:0]
+        tamanho = os.path.getsize(self.arquivo)
+        if tamanho < self._lido:
+            # Arquivo recriado (reset_system): recomeça do zero
+            self._zerar_leitura()
+        if tamanho == self._lido:
+            return self._df.iloc[0:0]
+
+        with open(self.arquivo, 'rb') as f:
+            f.seek(self._lido)
+            bloco = f.read(tamanho - self._lido)
+        fim = bloco.rfind(b'\n') + 1  # Linha pela metade fica para a próxima leitura
+        if fim == 0:
+            return self._df.iloc[0:0]
+        bloco = bloco[:fim]
+
+        inicio = self._lido
+        if inicio == 0:
+            cabecalho = bloco.find(b'\n') + 1
+            bloco, inicio = bloco[cabecalho:], cabecalho
+
+        # Índice por dia: deslocamento da primeira linha de cada data nova
+        pos = inicio
+        for linha in bloco.splitlines(keepends=True):
+            dia = linha[:10].decode('utf-8', 'ignore')
+            if not self._dias or dia > self._dias[-1]:
+                self._dias.append(dia)
+                self._offsets.append(pos)
+            pos += len(linha)
+        self._lido += fim
+
+        if not bloco:
+            return self._df.iloc[0:0]
+        novos = pd.read_csv(io.BytesIO(bloco), header=None, names=COLUNAS)
+        self._df = novos if self._df.empty else pd.concat([self._df, novos], ignore_index=True)
+        return novos
+
+    def tudo(self):
+        """Histórico completo (incremental: só lê do disco o que é novo)"""
+        self.atualizar()
+        return self._df
+
+    def consultar(self, desde=None, ate=None, par=None, tipos=None):
+        """
+        Trades filtrados. `desde`/`ate` são datas/timestamps (o índice por dia
+        evita ler o começo do arquivo); `par` e `tipos` filtram as linhas.
+        """
+        if desde is not None and self._lido == 0:
+            df = self._ler_desde(pd.Timestamp(desde))
+        else:
+            df = self.tudo()
+        if df.empty:
+            return df
+        datas = pd.to_datetime(df['data'])
+        filtro = pd.Series(True, index=df.index)
+        if desde is not None:
+            filtro &= datas >= pd.Timestamp(desde)
+        if ate is not None:
+            filtro &= datas <= pd.Timestamp(ate)
+        if par is not None:
+            filtro &= df['par'] == par
+        if tipos is not None:
+            filtro &= df['tipo'].isin(tipos)
+        return df[filtro].reset_index(drop=True)
+
+    def _ler_desde(self, desde):
+        """Leitura avulsa a partir do primeiro dia >= desde (sem carregar o histórico todo)"""
+        self._indexar()
+        i = bisect.bisect_left(self._dias, desde.strftime("%Y-%m-%d"))
+        if i == len(self._dias):
+            return self._df.iloc[0:0]
+        with open(self.arquivo, 'rb') as f:
+            f.seek(self._offsets[i])
+            bloco = f.read(self._fim_indexado - self._offsets[i])
+        return pd.read_csv(io.BytesIO(bloco), header=None, names=COLUNAS)
+
+    def _indexar(self):
+        """Varre só as datas (sem parsear as linhas) para montar o índice por dia"""
+        self._dias, self._offsets = [], []
+        self._fim_indexado = 0
+        if not os.path.exists(self.arquivo):
+            return
+        with open(self.arquivo, 'rb') as f:
+            pos = len(f.readline())
+            for linha in f:
+                if not linha.endswith(b'\n'):
+                    break
+                dia = linha[:10].decode('utf-8', 'ignore')
+                if not self._dias or dia > self._dias[-1]:
+                    self._dias.append(dia)
+                    self._offsets.append(pos)
+                pos += len(linha)
+        self._fim_indexado = pos
@@ -0,0 +1,158 @@
+# Binance/downloader_historico.py (DOWNLOAD DE HISTÓRICO EM MASSA)
+"""
+Baixa históricos longos de klines de vários pares ao mesmo tempo.
+
+O tempo é dividido em blocos fixos de 1500 candles alinhados ao epoch, então
+um bloco sempre cobre o mesmo intervalo, não importa quando o download começou:
+- blocos de pares diferentes (e do mesmo par) são baixados em paralelo, sob o
+  governador de peso da API;
+- cada bloco fechado vai para o disco assim que chega
+  (historico_klines/<PAR>_<TF>/<inicio>.csv) e não é baixado de novo: um
+  download interrompido retoma de onde parou;
+- o bloco do candle em formação é sempre rebaixado e nunca gravado;
+- na montagem, candles repetidos (blocos sobrepostos de versões antigas) são
+  descartados pelo timestamp.
+
+Uso:
+    dfs = baixar_historico(['BTCUSDT', 'ETHUSDT'], '15m', 6000)
+"""
+import os
+import time
+import asyncio
+import pandas as pd
+import config
+from binance_connector import BinanceConnector
+from cache_candles import COLUNAS_CANDLE, INTERVALOS_MS, LIMITE_API
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+TENTATIVAS = 3
+
+
+class DownloaderHistorico:
+    def __init__(self, diretorio=None, max_concorrencia=None, governador=None):
+        self.diretorio = diretorio or os.path.join(BASE_DIR, config.DIRETORIO_HISTORICO)
+        self.max_concorrencia = max_concorrencia
+        self.governador = governador
+
+    # --- Blocos em disco ---
+
+    def _pasta(self, par, timeframe):
+        return os.path.join(self.diretorio, f"{par}_{timeframe}")
+
+    def _arquivo(self, par, timeframe, inicio):
+        return os.path.join(self._pasta(par, timeframe), f"{inicio}.csv")
+
+    @staticmethod
+    def blocos(timeframe, qtd_candles, agora_ms=None):
+        """Inícios (ms) dos blocos que cobrem os últimos `qtd_candles` até agora, do mais antigo ao atual"""
+        passo = INTERVALOS_MS[timeframe]
+        tamanho = passo * LIMITE_API
+        agora = int(time.time() * 1000) if agora_ms is None else agora_ms
+        primeiro = (agora - qtd_candles * passo) // tamanho * tamanho
+        return list(range(primeiro, agora // tamanho * tamanho + 1, tamanho))
+
+    def _ler_bloco(self, par, timeframe, inicio):
+        arquivo = self._arquivo(par, timeframe, inicio)
+        if not os.path.exists(arquivo):
+            return None
+        try:
+            return pd.read_csv(arquivo)[COLUNAS_CANDLE].astype(float)
+        except Exception as e:
+            print(f"⚠️ Bloco corrompido ({par} {timeframe} {inicio}): {e}")
+            return None
+
+    def _gravar_bloco(self, par, timeframe, inicio, df):
+        os.makedirs(self._pasta(par, timeframe), exist_ok=True)
+        arquivo = self._arquivo(par, timeframe, inicio)
+        temp = arquivo + ".tmp"
+        df.to_csv(temp, index=False)
+        os.replace(temp, arquivo)
+
+    # --- Download ---
+
+    async def _baixar_bloco(self, con, semaforo, par, timeframe, inicio, agora):
+        passo = INTERVALOS_MS[timeframe]
+        fim = inicio + passo * LIMITE_API - 1
+        async with semaforo:
+            for tentativa in range(TENTATIVAS):
+                try:
+                    klines = await con.chamar(
+                        'futures_klines', symbol=par, interval=timeframe,
+                        startTime=inicio, endTime=fim, limit=LIMITE_API
+                    )
+                    break
+                except Exception as e:
+                    if tentativa == TENTATIVAS - 1:
+                        print(f"❌ Erro no bloco {par} {inicio}: {e}")
+                        return None
+                    await asyncio.sleep(2 ** tentativa)
+
+        df = BinanceConnector._tratar_df(klines)
+        # Bloco fechado (inclusive vazio: antes da listagem do par) vai pro disco
+        if fim + passo < agora:
+            self._gravar_bloco(par, timeframe, inicio, df)
+        return df
+
+    async def _baixar(self, pares, timeframe, qtd_candles):
+        from binance_connector_async import BinanceConnectorAsync
+
+        agora = int(time.time() * 1000)
+        inicios = self.blocos(timeframe, qtd_candles, agora)
+
+        partes = {par: {} for par in pares}
+        faltando = []
+        for par in pares:
+            for inicio in inicios:
+                df = self._ler_bloco(par, timeframe, inicio)
+                if df is None:
+                    faltando.append((par, inicio))
+                else:
+                    partes[par][inicio] = df
+
+        if faltando:
+            print(f"📥 {len(faltando)} blocos para baixar ({len(pares) * len(inicios) - len(faltando)} já no disco)")
+            con = await BinanceConnectorAsync.criar(self.max_concorrencia, governador=self.governador)
+            semaforo = asyncio.Semaphore(self.max_concorrencia or config.MAX_CONCORRENCIA_ASYNC)
+            try:
+                resultados = await asyncio.gather(
+                    *(self._baixar_bloco(con, semaforo, par, timeframe, inicio, agora) for par, inicio in faltando)
+                )
+            finally:
+                await con.fechar()
+            incompletos = set()
+            for (par, inicio), df in zip(faltando, resultados):
+                if df is None:
+                    incompletos.add(par)
+                else:
+                    partes[par][inicio] = df
+            # Histórico com buraco não serve para features: os blocos bons já estão no disco
+            for par in incompletos:
+                print(f"⚠️ {par}: histórico incompleto (rode de novo para retomar)")
+                partes[par] = {}
+
+        return {par: self._montar(blocos, qtd_candles) for par, blocos in partes.items()}
+
+    @staticmethod
+    def _montar(blocos, qtd_candles):
+        dfs = [df for _, df in sorted(blocos.items()) if not df.empty]
+        if not dfs:
+            return None
+        df = pd.concat(dfs, ignore_index=True)
+        df = df.drop_duplicates(subset='timestamp', keep='last').sort_values('timestamp')
+        return df.iloc[-qtd_candles:].reset_index(drop=True)
+
+    def baixar(self, pares, timeframe, qtd_candles):
+        """
+        Últimos `qtd_candles` de cada par (formato de BinanceConnector._tratar_df).
+        Retorna {par: DataFrame ou None}. Não usar de dentro de um event loop.
+        """
+        pares = list(dict.fromkeys(pares))
+        try:
+            return asyncio.run(self._baixar(pares, timeframe, qtd_candles))
+        except Exception as e:
+            print(f"⚠️ Erro no download de histórico: {e}")
+            return {par: None for par in pares}
+
+
+def baixar_historico(pares, timeframe, qtd_candles, max_concorrencia=None):
+    return DownloaderHistorico(max_concorrencia=max_concorrencia).baixar(pares, timeframe, qtd_candles)
@@ -1,7 +1,7 @@
 # Binance/features_engine.py (CÓPIA LOCAL PARA FACILITAR IMPORTAÇÃO)
 import pandas as pd
-import pandas_ta as ta
 import numpy as np
+import indicadores_numpy as K
 
 class FeaturesEngine:
     """
@@ -33,35 +33,39 @@ class FeaturesEngine:
                 if c in df.columns:
                     df[c] = df[c].astype(float)
 
-            # 2. Engenharia de Features (V11 FUSION)
-            
-            # Momentum
-            for p in [3, 5, 10, 20]:
-                df[f'mom_{p}'] = df['close'].pct_change(p)
+            # 2. Engenharia de Features (V11 FUSION) - kernels NumPy, colunas anexadas de uma vez
+            close = df['close'].to_numpy(dtype=float)
+            volume = df['volume'].to_numpy(dtype=float)
+            feats = {}
+
+            with np.errstate(divide='ignore', invalid='ignore'):
+                # Momentum
+                for p in [3, 5, 10, 20]:
+                    feats[f'mom_{p}'] = K.variacao_pct(close, p)
+
+                # Volatilidade Relativa
+                retorno = K.variacao_pct(close, 1)
+                feats['vol_ratio'] = K.desvio_movel(retorno, 5) / K.desvio_movel(retorno, 20)
 
-            # Volatilidade Relativa
-            vol_curta = df['close'].pct_change().rolling(5).std()
-            vol_longa = df['close'].pct_change().rolling(20).std()
-            df['vol_ratio'] = vol_curta / vol_longa
+                # Posição no Canal
+                max_20 = K.maximo_movel(df['high'].to_numpy(dtype=float), 20)
+                min_20 = K.minimo_movel(df['low'].to_numpy(dtype=float), 20)
+                denom = max_20 - min_20
+                feats['pos_canal'] = np.where(denom == 0, 0.5, (close - min_20) / denom)
 
-            # Posição no Canal
-            max_20 = df['high'].rolling(20).max()
-            min_20 = df['low'].rolling(20).min()
-            denom = max_20 - min_20
-            df['pos_canal'] = np.where(denom == 0, 0.5, (df['close'] - min_20) / denom)
+                # Tendência
+                ema9 = K.ema(close, 9)
+                ema21 = K.ema(close, 21)
+                feats['trend_str'] = (ema9 - ema21) / ema21
 
-            # Tendência
-            ema9 = df.ta.ema(close=df['close'], length=9)
-            ema21 = df.ta.ema(close=df['close'], length=21)
-            df['trend_str'] = (ema9 - ema21) / ema21
+                # Volume
+                feats['vol_surge'] = volume / K.media_movel(volume, 20)
 
-            # Volume
-            vol_med = df['volume'].rolling(20).mean()
-            df['vol_surge'] = df['volume'] / vol_med
+                # Contexto Bitcoin
+                feats['btc_mom'] = K.variacao_pct(df['btc_close'].to_numpy(dtype=float), 5)
+                feats['rel_str'] = feats['mom_5'] - feats['btc_mom']
 
-            # Contexto Bitcoin
-            df['btc_mom'] = df['btc_close'].pct_change(5)
-            df['rel_str'] = df['mom_5'] - df['btc_mom']
+            df = pd.concat([df.drop(columns=list(feats), errors='ignore'), pd.DataFrame(feats, index=df.index)], axis=1)
 
             # 3. Limpeza
             df.replace([np.inf, -np.inf], np.nan, inplace=True)
@@ -2,7 +2,9 @@
 import pandas as pd
 import numpy as np
 from binance_connector import BinanceConnector
+from armazem_dataset import salvar_dataset
 from indicators import Calculadora
+from rotulagem import rotular_long
 import time
 
 # --- CONFIGURAÇÕES ---
@@ -19,39 +21,10 @@ def criar_alvo(df):
     1 = Deu Lucro (Bateu no TP antes do Stop)
     0 = Deu Prejuízo ou ficou no zero
     """
-    targets = []
-    
     print("🔮 Calculando o futuro para cada candle...")
-    
-    for i in range(len(df)):
-        # Se não tiver dados futuros suficientes, ignora
-        if i + HORIZONTE_FUTURO >= len(df):
-            targets.append(0)
-            continue
-            
-        preco_entrada = df.iloc[i]['close']
-        tp_price = preco_entrada * (1 + ALVO_LUCRO)
-        stop_price = preco_entrada * (1 - ALVO_STOP)
-        
-        resultado = 0 # Assume 0 (não deu bom)
-        
-        # Olha para o futuro (próximos X candles)
-        for j in range(1, HORIZONTE_FUTURO + 1):
-            futuro = df.iloc[i + j]
-            
-            # Tocou no Stop primeiro?
-            if futuro['low'] <= stop_price:
-                resultado = 0
-                break # Game over
-            
-            # Tocou no Take Profit?
-            if futuro['high'] >= tp_price:
-                resultado = 1 # WIN!
-                break # Vitória
-                
-        targets.append(resultado)
-        
-    return targets
+
+    # Primeiro toque vetorizado (stop tem prioridade se os dois caem no mesmo candle)
+    return rotular_long(df['close'], df['high'], df['low'], ALVO_LUCRO, ALVO_STOP, HORIZONTE_FUTURO)
 
 def main():
     print(f"🚀 Iniciando coleta de dados para {PAR}...")
@@ -99,9 +72,9 @@ def main():
     # Remove as últimas linhas onde não sabemos o futuro ainda
     df_final = df_final.iloc[:-HORIZONTE_FUTURO]
 
-    # 5. Salvar CSV
+    # 5. Salvar (Parquet particionado por mês; CSV se não houver pyarrow)
     nome_arquivo = "dataset_treino_v1.csv"
-    df_final.to_csv(nome_arquivo, index=False)
+    salvar_dataset(df_final, nome_arquivo, pares=PAR, tempos=df['timestamp'].iloc[:-HORIZONTE_FUTURO])
     
     print(f"\n✨ SUCESSO! Dataset gerado: {nome_arquivo}")
     print(f"📊 Total de exemplos para treino: {len(df_final)}")
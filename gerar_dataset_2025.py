@@ -2,7 +2,7 @@
 import pandas as pd
 import numpy as np
 from binance_connector import BinanceConnector
-import time
+from armazem_dataset import salvar_dataset
 import sys
 import os
 
@@ -29,24 +29,22 @@ def main():
     end_time = None
     print(f"   🐺 Baixando WLD...")
     for i in range(QTD_BLOCOS):
-        k = con.client.futures_klines(symbol=PAR, interval=TIMEFRAME, limit=1500, endTime=end_time)
+        k = con.chamar('futures_klines', symbol=PAR, interval=TIMEFRAME, limit=1500, endTime=end_time)
         if not k: break
         klines_wld.extend(k)
         end_time = int(k[0][0]) - 1
         print(f"      Bloco {i+1}/{QTD_BLOCOS}...", end='\r')
-        time.sleep(0.1)
     
     # 2. Baixa BTC
     klines_btc = []
     end_time = None
     print(f"\n   👑 Baixando BTC...")
     for i in range(QTD_BLOCOS):
-        k = con.client.futures_klines(symbol="BTCUSDT", interval=TIMEFRAME, limit=1500, endTime=end_time)
+        k = con.chamar('futures_klines', symbol="BTCUSDT", interval=TIMEFRAME, limit=1500, endTime=end_time)
         if not k: break
         klines_btc.extend(k)
         end_time = int(k[0][0]) - 1
         print(f"      Bloco {i+1}/{QTD_BLOCOS}...", end='\r')
-        time.sleep(0.1)
 
     print("\n🧠 Processando Features...")
     df_wld = con._tratar_df(klines_wld)
@@ -60,7 +58,7 @@ def main():
         if 'target' not in df_final.columns: df_final['target'] = 0
         
         arquivo = "dataset_2025.csv"
-        df_final.to_csv(arquivo, index=False)
+        salvar_dataset(df_final, arquivo, pares=PAR)
         print(f"✅ DATASET 2025 PRONTO: {len(df_final)} linhas.")
         print(f"📂 Salvo em: Binance/{arquivo}")
     else:
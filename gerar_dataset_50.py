@@ -2,8 +2,10 @@
 import pandas as pd
 import numpy as np
 from binance_connector import BinanceConnector
+from downloader_historico import baixar_historico
 from indicators import Calculadora
-import time
+from rotulagem import rotular_long_short
+from armazem_dataset import salvar_dataset
 
 QTD_MOEDAS = 50
 TIMEFRAME = "15m"
@@ -15,27 +17,13 @@ FUTURO_VISAO = 4
 def obter_top_50_moedas(connector):
     print("🛰️ Buscando Top 50 moedas...")
     try:
-        tickers = connector.client.futures_ticker()
+        tickers = connector.chamar('futures_ticker')
         df = pd.DataFrame(tickers)
         df = df[df['symbol'].str.endswith('USDT')]
         df['quoteVolume'] = pd.to_numeric(df['quoteVolume'])
         return df.sort_values('quoteVolume', ascending=False).head(QTD_MOEDAS)['symbol'].tolist()
     except: return []
 
-def buscar_historico_rapido(connector, par):
-    try:
-        klines = []
-        end_time = None
-        for _ in range(8): # 8 blocos de 1500 = 12.000 candles
-            k = connector.client.futures_klines(symbol=par, interval=TIMEFRAME, limit=1500, endTime=end_time)
-            if not k: break
-            klines.extend(k)
-            end_time = int(k[0][0]) - 1
-            time.sleep(0.1)
-        klines.sort(key=lambda x: x[0])
-        return connector._tratar_df(klines)
-    except: return None
-
 def processar_dados(df):
     df = Calculadora.adicionar_todos(df)
     
@@ -50,32 +38,8 @@ def processar_dados(df):
     df['Vol_Relativo'] = df['volume'] / vol_media
     df['ATRr'] = df['ATRr_14']
     
-    # Targets
-    targets = []
-    closes = df['close'].values
-    highs = df['high'].values
-    lows = df['low'].values
-    
-    for i in range(len(df)):
-        if i + FUTURO_VISAO >= len(df): targets.append(0); continue
-        
-        entry = closes[i]
-        # 1=Long, 2=Short
-        res = 0
-        # Checa Long
-        for j in range(1, FUTURO_VISAO + 1):
-            if lows[i+j] <= entry*(1-ALVO_STOP): break
-            if highs[i+j] >= entry*(1+ALVO_LUCRO): res = 1; break
-        
-        # Se não deu Long, Checa Short
-        if res == 0:
-            for j in range(1, FUTURO_VISAO + 1):
-                if highs[i+j] >= entry*(1+ALVO_STOP): break
-                if lows[i+j] <= entry*(1-ALVO_LUCRO): res = 2; break
-                
-        targets.append(res)
-    
-    df['target'] = targets
+    # Targets: 1=Long, 2=Short (long no horizonte inteiro primeiro; stop encerra)
+    df['target'] = rotular_long_short(df['close'], df['high'], df['low'], ALVO_LUCRO, ALVO_STOP, FUTURO_VISAO)
     df.replace([np.inf, -np.inf], 0, inplace=True)
     df.dropna(inplace=True)
     return df.iloc[:-FUTURO_VISAO]
@@ -86,20 +50,27 @@ def main():
     dfs = []
     
     print(f"🚜 Iniciando Mineração Massiva ({len(moedas)} moedas)...")
+    # Todas as moedas em paralelo (retoma do disco se o download anterior caiu)
+    historicos = baixar_historico(moedas, TIMEFRAME, QTD_POR_MOEDA)
     for i, par in enumerate(moedas):
         print(f"[{i+1}/{len(moedas)}] {par}...", end="\r")
-        df_raw = buscar_historico_rapido(con, par)
+        df_raw = historicos.get(par)
         if df_raw is not None and len(df_raw) > 1000:
             df_proc = processar_dados(df_raw)
             # Colunas Finais
             cols = ['RSI_14', 'ADX_14', 'Dist_VWAP', 'CVD_Slope', 'Vol_Relativo', 'ATRr', 'target']
-            dfs.append(df_proc[cols])
+            df_cols = df_proc[cols].copy()
+            # Chaves de partição do armazém (saem antes de salvar)
+            df_cols['_par'] = par
+            df_cols['_ts'] = df_proc['timestamp'].values
+            dfs.append(df_cols)
             
     if dfs:
         print("\n🌪️ Unificando dados...")
         df_final = pd.concat(dfs, ignore_index=True)
         df_final = df_final.sample(frac=1).reset_index(drop=True)
-        df_final.to_csv("dataset_50_coins_norm.csv", index=False)
+        pares, tempos = df_final.pop('_par'), df_final.pop('_ts')
+        salvar_dataset(df_final, "dataset_50_coins_norm.csv", pares=pares, tempos=tempos)
         print(f"\n💾 Dataset Final: {len(df_final)} linhas. PRONTO PARA TREINO!")
 
 if __name__ == "__main__":
@@ -2,7 +2,7 @@
 import pandas as pd
 import numpy as np
 from binance_connector import BinanceConnector
-import time
+from armazem_dataset import salvar_dataset
 import sys
 import os
 
@@ -28,12 +28,11 @@ def baixar_historico_longo(con, simbolo):
     end_time = None
     
     for i in range(QTD_BLOCOS): 
-        k = con.client.futures_klines(symbol=simbolo, interval=TIMEFRAME, limit=1500, endTime=end_time)
+        k = con.chamar('futures_klines', symbol=simbolo, interval=TIMEFRAME, limit=1500, endTime=end_time)
         if not k: break
         klines.extend(k)
         end_time = int(k[0][0]) - 1
         print(f"   📦 Bloco {i+1}/{QTD_BLOCOS} baixado...", end='\r')
-        time.sleep(0.2)
     
     print(f"\n✅ Total {simbolo}: {len(klines)} velas.")
     klines.sort(key=lambda x: x[0])
@@ -62,7 +61,7 @@ def main():
 
             # Salva
             arquivo_saida = "dataset_wld_1ano.csv"
-            df_final.to_csv(arquivo_saida, index=False)
+            salvar_dataset(df_final, arquivo_saida, pares=PAR)
             print(f"✅ DATASET ANUAL GERADO: {len(df_final)} linhas.")
             print(f"📂 Arquivo: Binance/{arquivo_saida}")
         else:
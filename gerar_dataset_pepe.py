@@ -2,7 +2,7 @@
 import pandas as pd
 import numpy as np
 from binance_connector import BinanceConnector
-import time
+from armazem_dataset import salvar_dataset
 import sys
 import os
 
@@ -28,12 +28,11 @@ def main():
     
     # Baixa 15.000 candles (Histórico Longo)
     for _ in range(10): 
-        k = con.client.futures_klines(symbol=PAR, interval=TIMEFRAME, limit=1500, endTime=end_time)
+        k = con.chamar('futures_klines', symbol=PAR, interval=TIMEFRAME, limit=1500, endTime=end_time)
         if not k: break
         klines.extend(k)
         end_time = int(k[0][0]) - 1
         print(f"   📦 Baixados: {len(klines)} candles...", end='\r')
-        time.sleep(0.2)
     
     print("")
     
@@ -52,7 +51,7 @@ def main():
         if df_final is not None and not df_final.empty:
             if 'target' not in df_final.columns: df_final['target'] = 0 
 
-            df_final.to_csv("dataset_pepe_clean.csv", index=False)
+            salvar_dataset(df_final, "dataset_pepe_clean.csv", pares=PAR)
             print(f"✅ DATASET PEPE GERADO: {len(df_final)} linhas.")
             print(f"📂 Salvo em: Binance/dataset_pepe_clean.csv")
         else:
@@ -2,12 +2,13 @@
 import pandas as pd
 import numpy as np
 from binance_connector import BinanceConnector
-import time
+from downloader_historico import baixar_historico
 import sys
 import os
 
 sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'Genesis_AI'))
 from features_engine import FeaturesEngine
+from armazem_dataset import salvar_dataset
 
 # --- CONFIGURAÇÃO V11 ---
 QTD_MOEDAS = 50
@@ -20,7 +21,7 @@ ALVO_LUCRO = 0.008
 def obter_top_50_moedas(connector):
     """Obtém as top 50 moedas por volume"""
     try:
-        tickers = connector.client.futures_ticker()
+        tickers = connector.chamar('futures_ticker')
         df = pd.DataFrame(tickers)
         df = df[df['symbol'].str.endswith('USDT')]
         df['quoteVolume'] = pd.to_numeric(df['quoteVolume'])
@@ -30,32 +31,6 @@ def obter_top_50_moedas(connector):
         return []
 
 
-def buscar_historico(connector, par):
-    """Busca histórico de candles com paginação"""
-    try:
-        klines = []
-        end_time = None
-        
-        for _ in range(5):
-            k = connector.client.futures_klines(
-                symbol=par,
-                interval=TIMEFRAME,
-                limit=1500,
-                endTime=end_time
-            )
-            if not k:
-                break
-            klines.extend(k)
-            end_time = int(k[0][0]) - 1
-            time.sleep(0.1)
-            
-        klines.sort(key=lambda x: x[0])
-        return connector._tratar_df(klines)
-    except Exception as e:
-        print(f"❌ Erro ao buscar histórico {par}: {e}")
-        return None
-
-
 def calcular_target(df, horizonte=HORIZONTE_ALVO, alvo_lucro=ALVO_LUCRO):
     """Calcula o target para treinamento supervisionado"""
     future_return = df['close'].shift(-horizonte) / df['close'] - 1
@@ -86,18 +61,20 @@ def processar_fusao(df_moeda, df_btc):
 def main():
     """Função principal"""
     con = BinanceConnector()
-    
-    print("👑 Baixando BTC Mestre...")
-    df_btc = buscar_historico(con, "BTCUSDT")
-    if df_btc is None:
-        print("❌ Falha ao carregar dados do BTC")
-        return
 
     moedas = obter_top_50_moedas(con)
     if not moedas:
         print("❌ Nenhuma moeda encontrada")
         return
 
+    # BTC Mestre + todas as moedas em paralelo (retoma do disco se o download anterior caiu)
+    print(f"👑 Baixando BTC Mestre + {len(moedas)} moedas...")
+    historicos = baixar_historico(["BTCUSDT"] + moedas, TIMEFRAME, QTD_POR_MOEDA)
+    df_btc = historicos.get("BTCUSDT")
+    if df_btc is None:
+        print("❌ Falha ao carregar dados do BTC")
+        return
+
     dfs = []
     print(f"🚜 Minerando V11 Fusion ({len(moedas)} moedas)...")
     
@@ -107,7 +84,7 @@ def main():
             
         print(f"[{i+1}/{len(moedas)}] Processando {par}...", end="\r")
         
-        df_raw = buscar_historico(con, par)
+        df_raw = historicos.get(par)
         if df_raw is not None and len(df_raw) > 1000:
             try:
                 df_proc = processar_fusao(df_raw, df_btc)
@@ -115,6 +92,7 @@ def main():
                 # Mantém todas as features geradas pelo FeaturesEngine
                 # Inclui automaticamente 'close' e outras features
                 if len(df_proc) > 0:
+                    df_proc['_par'] = par  # Chave de partição do armazém (sai antes de salvar)
                     dfs.append(df_proc)
                     
             except Exception as e:
@@ -125,6 +103,7 @@ def main():
         print("\n🌪️ Unificando dataset...")
         df_final = pd.concat(dfs, ignore_index=True)
         df_final = df_final.sort_values('timestamp').reset_index(drop=True)
+        pares, tempos = df_final.pop('_par'), df_final['timestamp'].copy()
         
         # Remove colunas temporárias se existirem
         cols_to_drop = ['timestamp']
@@ -132,7 +111,7 @@ def main():
         
         # Salva dataset
         filename = "dataset_v11_fusion.csv"
-        df_final.to_csv(filename, index=False)
+        salvar_dataset(df_final, filename, pares=pares, tempos=tempos)
         
         print(f"\n💾 DATASET SALVO! {len(df_final)} linhas, {len(df_final.columns)} features")
         print("📊 Features incluídas:", list(df_final.columns))
@@ -1,8 +1,8 @@
 # Binance/gerar_dataset_wld.py - FOCO TOTAL (IMPORT BLINDADO)
 import pandas as pd
 import numpy as np
-from binance_connector import BinanceConnector
-import time
+from downloader_historico import baixar_historico
+from armazem_dataset import salvar_dataset
 import sys
 import os
 
@@ -27,41 +27,23 @@ except ImportError as e:
 
 PAR = "WLDUSDT"
 TIMEFRAME = "15m"
+QTD_CANDLES = 15000  # 10 blocos de 1500 candles
 
 def main():
-    con = BinanceConnector()
-    print(f"👑 Baixando BTC Mestre (Contexto)...")
-    # Baixa um pouco mais de BTC para garantir cobertura no merge
-    df_btc = con.buscar_candles("BTCUSDT", TIMEFRAME, limit=1500)
-    
+    # WLD em profundidade + BTC Mestre (Contexto) no mesmo período, em paralelo.
+    # Retoma do disco se o download anterior caiu.
+    print(f"🚜 Baixando {PAR} + BTC Mestre em profundidade ({QTD_CANDLES} candles)...")
+    historicos = baixar_historico([PAR, "BTCUSDT"], TIMEFRAME, QTD_CANDLES)
+    df_btc = historicos.get("BTCUSDT")
+    df_wld_raw = historicos.get(PAR)
+
     if df_btc is None:
         print("❌ Erro ao baixar BTC. Verifique a conexão.")
         return
 
-    # Loop para baixar histórico longo da WLD (ex: 15.000 candles)
-    print(f"🚜 Baixando {PAR} em profundidade...")
-    klines = []
-    end_time = None
-    
-    # Baixa 10 blocos de 1500 candles
-    for _ in range(10): 
-        k = con.client.futures_klines(symbol=PAR, interval=TIMEFRAME, limit=1500, endTime=end_time)
-        if not k: break
-        klines.extend(k)
-        # Atualiza o tempo para pegar o bloco anterior
-        end_time = int(k[0][0]) - 1
-        print(f"   📦 Baixados: {len(klines)} candles...", end='\r')
-        time.sleep(0.2)
-    
-    print("") # Quebra linha
-        
-    if not klines:
+    if df_wld_raw is None:
         print(f"❌ Nenhum dado baixado para {PAR}.")
         return
-
-    # Ordena e converte
-    klines.sort(key=lambda x: x[0])
-    df_wld_raw = con._tratar_df(klines)
     
     print(f"🧠 Processando Engenharia de Features ({len(df_wld_raw)} linhas)...")
     
@@ -77,7 +59,7 @@ def main():
                  df_final['target'] = 0 
 
             # Salva com o nome correto para o treino WLD
-            df_final.to_csv("dataset_wld_clean.csv", index=False)
+            salvar_dataset(df_final, "dataset_wld_clean.csv", pares=PAR)
             print(f"✅ DATASET WLD GERADO: {len(df_final)} linhas prontas.")
             print(f"📂 Arquivo salvo: Binance/dataset_wld_clean.csv")
             print("👉 Próximo passo: Rodar 'python Genesis_AI/train_genesis_wld.py'")
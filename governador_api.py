@@ -0,0 +1,185 @@
+# Binance/governador_api.py (GOVERNADOR DE PESO DA API)
+import os
+import json
+import time
+import asyncio
+import threading
+from contextlib import contextmanager
+
+LIMITE_PESO_MINUTO = 2400  # REQUEST_WEIGHT por minuto por IP (Binance Futures)
+
+
+def peso_klines(limit=500):
+    if limit < 100: return 1
+    if limit < 500: return 2
+    if limit <= 1000: return 5
+    return 10
+
+
+def peso_book(limit=500):
+    if limit <= 50: return 2
+    if limit <= 100: return 5
+    if limit <= 500: return 10
+    return 20
+
+
+def calcular_peso(endpoint, **params):
+    """Peso (REQUEST_WEIGHT) de uma chamada do python-binance pelo nome do método"""
+    if endpoint == 'futures_klines':
+        return peso_klines(params.get('limit', 500))
+    if endpoint == 'futures_order_book':
+        return peso_book(params.get('limit', 500))
+    if endpoint == 'futures_ticker':
+        return 1 if 'symbol' in params else 40
+    if endpoint == 'futures_symbol_ticker':
+        return 1 if 'symbol' in params else 2
+    if endpoint in ('futures_account_balance', 'futures_position_information', 'futures_account'):
+        return 5
+    return 1  # exchangeInfo, ordens, cancelamentos, ping
+
+
+class GovernadorPeso:
+    """
+    Token bucket do peso da API.
+    Enche a `capacidade` por minuto e cada chamada gasta o seu peso; quando
+    falta saldo, quem chama espera só o tempo necessário para o balde encher.
+    O header X-MBX-USED-WEIGHT-1M corrige o saldo com o que o servidor já contou
+    (outros bots na mesma chave/IP).
+
+    Com `arquivo`, o saldo fica num JSON compartilhado por todos os processos
+    da máquina (protegido por um arquivo .lock criado com O_EXCL).
+    """
+
+    def __init__(self, limite_minuto=LIMITE_PESO_MINUTO, margem=0.9, arquivo=None):
+        self.limite_minuto = limite_minuto
+        self.capacidade = limite_minuto * margem
+        self.taxa = self.capacidade / 60.0  # Peso reposto por segundo
+        self.arquivo = arquivo
+        self._trava = threading.Lock()
+        self._tokens = self.capacidade
+        self._ts = time.time()
+
+    # --- Estado (memória ou arquivo compartilhado) ---
+
+    @contextmanager
+    def _trava_arquivo(self):
+        lock = self.arquivo + ".lock"
+        while True:
+            try:
+                fd = os.open(lock, os.O_CREAT | os.O_EXCL | os.O_WRONLY)
+                break
+            except FileExistsError:
+                try:
+                    # Lock órfão (processo morreu segurando): remove
+                    if time.time() - os.path.getmtime(lock) > 5:
+                        os.remove(lock)
+                        continue
+                except OSError:
+                    continue
+                time.sleep(0.001)
+        try:
+            yield
+        finally:
+            os.close(fd)
+            try: os.remove(lock)
+            except OSError: pass
+
+    def _ler_estado(self):
+        if self.arquivo:
+            try:
+                with open(self.arquivo, 'r') as f:
+                    estado = json.load(f)
+                self._tokens, self._ts = float(estado['tokens']), float(estado['ts'])
+            except (OSError, ValueError, KeyError):
+                pass  # Primeiro uso (ou arquivo ruim): segue com o estado local
+
+        # Reposição desde a última leitura
+        agora = time.time()
+        self._tokens = min(self.capacidade, self._tokens + (agora - self._ts) * self.taxa)
+        self._ts = agora
+
+    def _gravar_estado(self):
+        if not self.arquivo:
+            return
+        temp = f"{self.arquivo}.{os.getpid()}.tmp"
+        try:
+            with open(temp, 'w') as f:
+                json.dump({'tokens': self._tokens, 'ts': self._ts}, f)
+            os.replace(temp, self.arquivo)
+        except OSError as e:
+            print(f"⚠️ Erro ao gravar estado do governador: {e}")
+
+    @contextmanager
+    def _estado(self):
+        with self._trava:
+            if self.arquivo:
+                with self._trava_arquivo():
+                    self._ler_estado()
+                    yield
+                    self._gravar_estado()
+            else:
+                self._ler_estado()
+                yield
+
+    # --- API ---
+
+    def tentar_adquirir(self, peso):
+        """Gasta `peso` se houver saldo e retorna 0; senão retorna os segundos a esperar"""
+        peso = min(peso, self.capacidade)
+        with self._estado():
+            if self._tokens >= peso:
+                self._tokens -= peso
+                return 0.0
+            return (peso - self._tokens) / self.taxa
+
+    def adquirir(self, peso):
+        while True:
+            espera = self.tentar_adquirir(peso)
+            if espera <= 0:
+                return
+            time.sleep(espera)
+
+    async def adquirir_async(self, peso):
+        while True:
+            espera = self.tentar_adquirir(peso)
+            if espera <= 0:
+                return
+            await asyncio.sleep(espera)
+
+    def registrar_peso_usado(self, usado_1m):
+        """Alinha o saldo com o peso que o servidor diz já ter contado neste minuto"""
+        disponivel = self.capacidade - float(usado_1m)
+        with self._estado():
+            self._tokens = min(self._tokens, disponivel)
+
+    def registrar_headers(self, headers):
+        try:
+            usado = headers.get('X-MBX-USED-WEIGHT-1M') if headers else None
+            if usado is not None:
+                self.registrar_peso_usado(usado)
+        except Exception:
+            pass  # Header é só refinamento; nunca derruba a chamada
+
+    def penalizar(self, segundos=60):
+        """Resposta 429/418: zera o balde e deixa negativo por `segundos`"""
+        with self._estado():
+            self._tokens = -segundos * self.taxa
+
+
+_governador_padrao = None
+_trava_padrao = threading.Lock()
+
+
+def governador_padrao():
+    """Governador único do processo (todos os connectors usam a mesma chave/IP)"""
+    global _governador_padrao
+    with _trava_padrao:
+        if _governador_padrao is None:
+            import config
+            arquivo = None
+            if config.ARQUIVO_GOVERNADOR_API:
+                arquivo = os.path.join(os.path.dirname(os.path.abspath(__file__)), config.ARQUIVO_GOVERNADOR_API)
+            _governador_padrao = GovernadorPeso(
+                config.LIMITE_PESO_API_MINUTO, config.MARGEM_PESO_API, arquivo
+            )
+        return _governador_padrao
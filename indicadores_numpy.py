@@ -0,0 +1,316 @@
+# Binance/indicadores_numpy.py (KERNELS DE INDICADORES EM NUMPY PURO)
+"""
+Indicadores técnicos sobre arrays float64 contíguos, sem pandas nem pandas_ta.
+Reproduzem as fórmulas do pandas_ta 0.3.14b (e do rolling/ewm do pandas) que
+o bot usa, devolvendo arrays do mesmo tamanho da entrada com NaN no aquecimento.
+
+Todos operam no último eixo: um array (n,) é uma série; um array (pares, n)
+calcula todos os pares de uma vez.
+"""
+import functools
+import numpy as np
+
+BLOCO = 256  # Tamanho do bloco nas recorrências (mantém w**-k longe de overflow)
+
+
+def _f64(x):
+    return np.ascontiguousarray(x, dtype=np.float64)
+
+
+def deslocar(x, n=1):
+    """Equivalente a Series.shift(n) no último eixo"""
+    x = _f64(x)
+    out = np.full_like(x, np.nan)
+    if n == 0:
+        out[...] = x
+    elif n > 0:
+        out[..., n:] = x[..., :-n]
+    else:
+        out[..., :n] = x[..., -n:]
+    return out
+
+
+def diferenca(x, n=1):
+    """Series.diff(n)"""
+    return _f64(x) - deslocar(x, n)
+
+
+def variacao_pct(x, n=1):
+    """Series.pct_change(n)"""
+    x = _f64(x)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        return x / deslocar(x, n) - 1.0
+
+
+# =============================================================================
+# JANELAS MÓVEIS (rolling com min_periods = n), todas O(n)
+# =============================================================================
+
+def _vazio_se_curto(x, n):
+    return np.full(x.shape, np.nan) if x.shape[-1] < n else None
+
+
+def _janelas_por_bloco(x, n, bloco):
+    """
+    Visão (..., blocos, bloco + n - 1) da série: cada bloco traz junto os n - 1
+    valores seguintes, para as janelas que começam nele caberem inteiras.
+    """
+    total = x.shape[-1] - n + 1   # Quantidade de janelas completas
+    nb = -(-total // bloco)
+    bloco = -(-total // nb)       # Divide por igual (menos padding)
+    pad = nb * bloco + n - 1 - x.shape[-1]
+    if pad:
+        x = np.concatenate([x, np.zeros(x.shape[:-1] + (pad,))], axis=-1)
+    v = np.lib.stride_tricks.sliding_window_view(x, bloco + n - 1, axis=-1)[..., ::bloco, :]
+    return v, total, bloco
+
+
+def _somas_moveis(x, n, quadrados=False, bloco=1024):
+    """
+    Soma (e soma dos quadrados) de cada janela de n valores em O(n).
+    Cumsum por bloco, com os valores medidos a partir do 1º valor do bloco,
+    para o erro de arredondamento não crescer com o tamanho da série.
+    Retorna (ref, s1, s2, nans) alinhados ao fim de cada janela.
+    """
+    nan = np.isnan(x)
+    v, total, bloco = _janelas_por_bloco(np.where(nan, 0.0, x), n, bloco)
+    ref = v[..., :1]
+    d = v - ref
+    zeros = np.zeros(d.shape[:-1] + (1,))
+
+    def janela(a):
+        acumulado = np.concatenate([zeros, np.cumsum(a, axis=-1)], axis=-1)
+        soma = acumulado[..., n:n + bloco] - acumulado[..., :bloco]
+        return soma.reshape(soma.shape[:-2] + (-1,))[..., :total]
+
+    s1 = janela(d)
+    s2 = janela(d * d) if quadrados else None
+    contagem_nan = np.concatenate([np.zeros(x.shape[:-1] + (1,)), np.cumsum(nan, axis=-1)], axis=-1)
+    nans = (contagem_nan[..., n:] - contagem_nan[..., :-n]) > 0
+    ref = np.broadcast_to(ref, ref.shape[:-1] + (bloco,)).reshape(ref.shape[:-2] + (-1,))[..., :total]
+    return ref, s1, s2, nans
+
+
+def _preencher(valores, nans, x, n):
+    out = np.full(x.shape, np.nan)
+    out[..., n - 1:] = np.where(nans, np.nan, valores)
+    return out
+
+
+def media_movel(x, n):
+    x = _f64(x)
+    vazio = _vazio_se_curto(x, n)
+    if vazio is not None:
+        return vazio
+    ref, s1, _, nans = _somas_moveis(x, n)
+    return _preencher(ref + s1 / n, nans, x, n)
+
+
+def desvio_movel(x, n, ddof=1):
+    x = _f64(x)
+    vazio = _vazio_se_curto(x, n)
+    if vazio is not None or n - ddof <= 0:
+        return np.full(x.shape, np.nan) if vazio is None else vazio
+    _, s1, s2, nans = _somas_moveis(x, n, quadrados=True)
+    variancia = np.maximum(s2 - s1 * s1 / n, 0.0) / (n - ddof)
+    return _preencher(np.sqrt(variancia), nans, x, n)
+
+
+def _extremo_movel(x, n, funcao, neutro):
+    """
+    Máximo/mínimo móvel em O(n) (van Herk / Gil-Werman): em blocos de n, o
+    extremo da janela [i, i+n-1] = extremo(sufixo do bloco de i, prefixo do bloco de i+n-1).
+    """
+    x = _f64(x)
+    vazio = _vazio_se_curto(x, n)
+    if vazio is not None:
+        return vazio
+    tamanho = x.shape[-1]
+    nb = -(-tamanho // n)
+    limpo = np.where(np.isnan(x), neutro, x)
+    pad = nb * n - tamanho
+    if pad:
+        limpo = np.concatenate([limpo, np.full(x.shape[:-1] + (pad,), neutro)], axis=-1)
+    blocos = limpo.reshape(x.shape[:-1] + (nb, n))
+    prefixo = funcao.accumulate(blocos, axis=-1).reshape(limpo.shape)
+    sufixo = np.flip(funcao.accumulate(np.flip(blocos, axis=-1), axis=-1), axis=-1).reshape(limpo.shape)
+    valores = funcao(sufixo[..., :tamanho - n + 1], prefixo[..., n - 1:tamanho])
+
+    contagem_nan = np.concatenate([np.zeros(x.shape[:-1] + (1,)), np.cumsum(np.isnan(x), axis=-1)], axis=-1)
+    nans = (contagem_nan[..., n:] - contagem_nan[..., :-n]) > 0
+    return _preencher(valores, nans, x, n)
+
+
+def maximo_movel(x, n):
+    return _extremo_movel(x, n, np.maximum, -np.inf)
+
+
+def minimo_movel(x, n):
+    return _extremo_movel(x, n, np.minimum, np.inf)
+
+
+# =============================================================================
+# MÉDIAS EXPONENCIAIS
+# =============================================================================
+
+def _recorrencia(x, w):
+    """
+    y[t] = w * y[t-1] + x[t] (y[-1] = 0) no último eixo.
+    Resolve em blocos: dentro do bloco é um cumsum de x * w**-k; entre blocos
+    só propaga o último valor (laço curto de n / BLOCO passos).
+    """
+    n = x.shape[-1]
+    if n == 0 or w == 0:
+        return x.copy()
+    # w pequeno: encurta o bloco para w**bloco não zerar (underflow)
+    bloco = min(BLOCO, max(1, int(600 / -np.log(w)))) if w < 1 else BLOCO
+    nb = -(-n // bloco)
+    bloco = -(-n // nb)  # Divide por igual (menos padding)
+    pad = nb * bloco - n
+    xb = np.concatenate([x, np.zeros(x.shape[:-1] + (pad,))], axis=-1) if pad else x
+    xb = xb.reshape(x.shape[:-1] + (nb, bloco))
+
+    k = np.arange(bloco, dtype=np.float64)
+    potencias = w ** k                      # w^k
+    z = np.cumsum(xb / potencias, axis=-1) * potencias  # Solução local (entrada zero no bloco)
+
+    # Propaga o fim de cada bloco para o seguinte
+    decaimento = w ** (k + 1)
+    fim = np.zeros(x.shape[:-1])
+    for b in range(nb):
+        z[..., b, :] += fim[..., None] * decaimento
+        fim = z[..., b, -1]
+    return z.reshape(x.shape[:-1] + (nb * bloco,))[..., :n]
+
+
+@functools.lru_cache(maxsize=32)
+def _pesos_acumulados(w, n):
+    """Soma dos pesos w**k de uma série sem buracos (denominador do ewm adjust=True)"""
+    pesos = _recorrencia(np.ones(n), w)
+    pesos.flags.writeable = False
+    return pesos
+
+
+def ewm(x, alpha, adjust=True, min_periods=0):
+    """
+    Series.ewm(alpha=alpha, adjust=adjust, min_periods=min_periods).mean().
+    Aceita NaN (ignore_na=False); com adjust=False só NaN iniciais.
+    """
+    x = _f64(x)
+    w = 1.0 - alpha
+    observado = ~np.isnan(x)
+    valores = np.where(observado, x, 0.0)
+
+    if adjust:
+        num = _recorrencia(valores, w)
+        n = x.shape[-1]
+        primeiro = np.argmax(observado, axis=-1)
+        if np.all(observado.sum(axis=-1) == n - primeiro):
+            # Só NaN iniciais: o peso acumulado é o mesmo para toda série, deslocado pelo início
+            passos = np.arange(n) - primeiro[..., None]
+            den = np.where(passos >= 0, _pesos_acumulados(w, n)[np.maximum(passos, 0)], 0.0)
+        else:
+            den = _recorrencia(observado.astype(np.float64), w)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            out = num / den
+    else:
+        # Começa no primeiro valor observado: y = x[s]; depois y = w*y + alpha*x
+        primeiro = np.argmax(observado, axis=-1)
+        pos = np.arange(x.shape[-1])
+        inicio = pos == primeiro[..., None]
+        entrada = np.where(inicio, valores, alpha * valores)
+        out = _recorrencia(np.where(pos < primeiro[..., None], 0.0, entrada), w)
+
+    nobs = np.cumsum(observado, axis=-1)
+    out[nobs < max(min_periods, 1)] = np.nan
+    return out
+
+
+def rma(x, n):
+    """Média de Wilder do pandas_ta (ewm alpha=1/n, adjust=True, min_periods=n)"""
+    return ewm(x, 1.0 / n, adjust=True, min_periods=n)
+
+
+def ema(x, n):
+    """EMA do pandas_ta: semente = SMA dos n primeiros, depois ewm(span=n, adjust=False)"""
+    x = _f64(x)
+    if x.shape[-1] < n:
+        return np.full_like(x, np.nan)
+    semeado = x.copy()
+    semeado[..., n - 1] = np.nanmean(x[..., :n], axis=-1)
+    semeado[..., :n - 1] = np.nan
+    return ewm(semeado, 2.0 / (n + 1), adjust=False)
+
+
+# =============================================================================
+# INDICADORES
+# =============================================================================
+
+def true_range(high, low, close):
+    """True range do pandas_ta (primeiro valor NaN)"""
+    high, low = _f64(high), _f64(low)
+    anterior = deslocar(close, 1)
+    tr = np.maximum(high - low, np.maximum(np.abs(high - anterior), np.abs(anterior - low)))
+    tr[..., :1] = np.nan
+    return tr
+
+
+def true_range_manual(high, low, close):
+    """TR do Calculadora (concat().max() ignora NaN: o primeiro é high - low)"""
+    tr = true_range(high, low, close)
+    tr[..., :1] = (_f64(high) - _f64(low))[..., :1]
+    return tr
+
+
+def atr(high, low, close, n=14):
+    return rma(true_range(high, low, close), n)
+
+
+def rsi(close, n=14):
+    d = diferenca(close, 1)
+    positivo = np.where(d < 0, 0.0, d)
+    negativo = np.where(d > 0, 0.0, d)
+    media_pos, media_neg = rma(positivo, n), rma(negativo, n)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        return 100.0 * media_pos / (media_pos + np.abs(media_neg))
+
+
+def adx(high, low, close, n=14):
+    """Retorna (ADX, DMP, DMN)"""
+    eps = np.finfo(np.float64).eps
+    sobe = diferenca(high, 1)
+    desce = -diferenca(low, 1)
+    pos = np.where((sobe > desce) & (sobe > 0), sobe, 0.0)
+    neg = np.where((desce > sobe) & (desce > 0), desce, 0.0)
+    pos[np.abs(pos) < eps] = 0.0
+    neg[np.abs(neg) < eps] = 0.0
+    pos[..., :1] = np.nan
+    neg[..., :1] = np.nan
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        k = 100.0 / atr(high, low, close, n)
+        dmp = k * rma(pos, n)
+        dmn = k * rma(neg, n)
+        dx = 100.0 * np.abs(dmp - dmn) / (dmp + dmn)
+    return rma(dx, n), dmp, dmn
+
+
+def bbands(close, n=20, std=2.0, ddof=0):
+    """Retorna (BBL, BBM, BBU, BBB, BBP)"""
+    close = _f64(close)
+    meio = media_movel(close, n)
+    desvio = std * desvio_movel(close, n, ddof=ddof)
+    inferior, superior = meio - desvio, meio + desvio
+    largura = superior - inferior
+    with np.errstate(divide='ignore', invalid='ignore'):
+        return inferior, meio, superior, 100.0 * largura / meio, (close - inferior) / largura
+
+
+def macd(close, rapida=12, lenta=26, sinal=9):
+    """Retorna (MACD, MACDh, MACDs) como o pandas_ta"""
+    linha = ema(close, rapida) - ema(close, lenta)
+    sinal_ = np.full_like(linha, np.nan)
+    inicio = lenta - 1  # Primeiro valor válido da linha
+    if linha.shape[-1] > inicio:
+        sinal_[..., inicio:] = ema(linha[..., inicio:], sinal)
+    return linha, linha - sinal_, sinal_
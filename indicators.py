@@ -1,10 +1,38 @@
-# Binance/indicators.py (VERSÃO ATR MANUAL)
+# Binance/indicators.py (VERSÃO KERNELS NUMPY)
+import sys
+import copy
+import math
+import threading
+from collections import deque
 import pandas as pd
-import pandas_ta as ta
 import numpy as np
 import config
+import indicadores_numpy as K
 
 class Calculadora:
+    @staticmethod
+    def calcular_arrays(high, low, close, volume):
+        """
+        Indicadores do adicionar_todos direto nos arrays (kernels de indicadores_numpy).
+        Aceita séries (n,) ou matrizes (pares, n). Devolve {coluna: array} ainda com NaN.
+        """
+        close = np.asarray(close, dtype=float)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            # ATR manual: média simples do True Range (o primeiro TR é High - Low)
+            atr_14 = K.media_movel(K.true_range_manual(high, low, close), 14)
+            atr_14 = np.where(np.isnan(atr_14), 0.0, atr_14)
+            adx, dmp, dmn = K.adx(high, low, close, 14)
+            bbl, bbm, bbu, bbb, bbp = K.bbands(close, 20, 2.0)
+            return {
+                'ATR_14': atr_14, 'ATRr_14': atr_14 / close * 100,
+                'ADX_14': adx, 'DMP_14': dmp, 'DMN_14': dmn,
+                'RSI_14': K.rsi(close, 14),
+                'BBL_20_2.0': bbl, 'BBM_20_2.0': bbm, 'BBU_20_2.0': bbu,
+                'BBB_20_2.0': bbb, 'BBP_20_2.0': bbp,
+                'EMA_9': K.ema(close, 9), 'EMA_21': K.ema(close, 21), 'EMA_200': K.ema(close, 200),
+                'VOL_SMA_20': K.media_movel(volume, 20),
+            }
+
     @staticmethod
     def adicionar_todos(df):
         # 1. LIMPEZA TOTAL
@@ -16,40 +44,12 @@ class Calculadora:
             return df
 
         try:
-            # 2. GARANTIA DE SÉRIE NUMÉRICA
-            close = df['close'].astype(float)
-            high = df['high'].astype(float)
-            low = df['low'].astype(float)
-            volume = df['volume'].astype(float)
-
-            # 3. CÁLCULO MANUAL DO ATR (A SALVAÇÃO) 🛡️
-            # True Range = Max(H-L, Abs(H-PrevClose), Abs(L-PrevClose))
-            prev_close = close.shift(1)
-            tr1 = high - low
-            tr2 = (high - prev_close).abs()
-            tr3 = (low - prev_close).abs()
-            
-            tr = pd.concat([tr1, tr2, tr3], axis=1).max(axis=1)
-            # Média Móvel do True Range (ATR 14)
-            df['ATR_14'] = tr.rolling(14).mean().fillna(0)
-            
-            # ATR Percentual
-            df['ATRr_14'] = (df['ATR_14'] / close * 100).fillna(0)
-
-            # 4. OUTROS INDICADORES (via Lib ou Manual)
-            df.ta.adx(length=14, append=True)
-            df.ta.rsi(length=14, append=True)
-            df.ta.bbands(length=20, std=2, append=True)
-            
-            # Médias
-            df['EMA_9'] = df.ta.ema(close=close, length=9)
-            df['EMA_21'] = df.ta.ema(close=close, length=21)
-            df['EMA_200'] = df.ta.ema(close=close, length=200).fillna(0)
-            
-            df['VOL_SMA_20'] = volume.rolling(20).mean()
-            
-            # Preenche qualquer buraco restante com 0
-            df.fillna(0, inplace=True)
+            # 2. KERNELS NUMPY (uma passada, colunas anexadas de uma vez)
+            colunas = Calculadora.calcular_arrays(
+                df['high'].to_numpy(dtype=float), df['low'].to_numpy(dtype=float),
+                df['close'].to_numpy(dtype=float), df['volume'].to_numpy(dtype=float)
+            )
+            df = Calculadora._anexar(df, list(colunas), np.column_stack(list(colunas.values())))
 
         except Exception as e:
             print(f"⚠️ Erro Calculadora: {e}")
@@ -57,4 +57,321 @@ class Calculadora:
             df['ATR_14'] = df['close'] * 0.01 
             df['ATRr_14'] = 1.0
             
-        return df
\ No newline at end of file
+        return df
+
+    @staticmethod
+    def adicionar_todos_lote(dfs):
+        """
+        adicionar_todos do universo inteiro numa passada vetorizada.
+        Recebe {par: DataFrame OHLCV}. Pares com o mesmo número de candles viram
+        matrizes (pares, candles) e são calculados juntos em calcular_arrays.
+        Retorna {par: DataFrame} igual ao adicionar_todos de cada par.
+        """
+        resultado = dict.fromkeys(dfs)
+        grupos = {}  # nº de candles -> [(par, df)]
+        for par, df in dfs.items():
+            if df is None:
+                continue
+            df = df.loc[:, ~df.columns.duplicated()]
+            if len(df) < 20:
+                resultado[par] = Calculadora.adicionar_todos(df)
+            else:
+                grupos.setdefault(len(df), []).append((par, df))
+
+        for membros in grupos.values():
+            try:
+                high, low, close, volume = (
+                    np.vstack([df[c].to_numpy(dtype=float) for _, df in membros])
+                    for c in ('high', 'low', 'close', 'volume')
+                )
+                colunas = Calculadora.calcular_arrays(high, low, close, volume)
+            except Exception as e:
+                print(f"⚠️ Erro Calculadora (lote): {e}")
+                for par, df in membros:
+                    resultado[par] = Calculadora.adicionar_todos(df)
+                continue
+
+            # Um bloco (pares, candles, colunas): cada par recebe sua fatia 2-D
+            nomes = list(colunas)
+            bloco = np.stack(list(colunas.values()), axis=-1)
+            for i, (par, df) in enumerate(membros):
+                resultado[par] = Calculadora._anexar(df, nomes, bloco[i])
+        return resultado
+
+    @staticmethod
+    def _anexar(df, nomes, valores):
+        """Anexa a matriz (candles, colunas) calculada de uma vez, com fillna(0)"""
+        base = df.drop(columns=nomes, errors='ignore')
+        if (base.dtypes == np.float64).all():
+            # Caso comum (OHLCV float): um único bloco numpy, sem concat
+            tudo = np.hstack([base.to_numpy(), valores])
+            return pd.DataFrame(np.where(np.isnan(tudo), 0.0, tudo), columns=list(base.columns) + nomes, index=df.index)
+
+        novos = pd.DataFrame(np.where(np.isnan(valores), 0.0, valores), columns=nomes, index=df.index)
+        # Preenche qualquer buraco restante com 0
+        return pd.concat([base.fillna(0), novos], axis=1)
+
+
+# =============================================================================
+# MODO INCREMENTAL (estado por símbolo)
+# =============================================================================
+
+def _div(a, b):
+    """Divisão com a semântica do numpy (x/0 = inf, 0/0 = nan) sem exceção"""
+    try:
+        return a / b
+    except ZeroDivisionError:
+        if a == 0 or a != a:
+            return math.nan
+        return math.copysign(math.inf, a) * math.copysign(1.0, b)
+
+
+def _zero(x):
+    """Mesmo zero() do pandas_ta: arredonda resíduos de ponto flutuante"""
+    return 0.0 if abs(x) < sys.float_info.epsilon else x
+
+
+class _MediaExponencial:
+    """Replica passo a passo o Series.ewm(alpha, adjust, min_periods).mean() do pandas"""
+    __slots__ = ('fator_antigo', 'peso_novo', 'adjust', 'min_periods', 'media', 'peso_antigo', 'nobs')
+
+    def __init__(self, alpha, adjust=True, min_periods=0):
+        self.fator_antigo = 1.0 - alpha
+        self.peso_novo = 1.0 if adjust else alpha
+        self.adjust = adjust
+        self.min_periods = max(min_periods, 1)
+        self.media = math.nan
+        self.peso_antigo = 1.0
+        self.nobs = 0
+
+    def atualizar(self, x):
+        observado = x == x
+        self.nobs += observado
+        if self.media == self.media:
+            self.peso_antigo *= self.fator_antigo
+            if observado:
+                if self.media != x:
+                    self.media = (self.peso_antigo * self.media + self.peso_novo * x) / (self.peso_antigo + self.peso_novo)
+                self.peso_antigo = self.peso_antigo + self.peso_novo if self.adjust else 1.0
+        elif observado:
+            self.media = x
+        return self.media if self.nobs >= self.min_periods else math.nan
+
+
+class _EMA:
+    """EMA do pandas_ta: semente = SMA dos primeiros `length` valores, depois ewm(adjust=False)"""
+    __slots__ = ('length', 'semente', 'ewm')
+
+    def __init__(self, length):
+        self.length = length
+        self.semente = []
+        self.ewm = _MediaExponencial(2.0 / (length + 1), adjust=False)
+
+    def atualizar(self, x):
+        if self.semente is not None:
+            self.semente.append(x)
+            if len(self.semente) < self.length:
+                return math.nan
+            x = float(np.mean(self.semente))
+            self.semente = None
+        return self.ewm.atualizar(x)
+
+
+class _Janela:
+    """Janela móvel de tamanho fixo (rolling(n) com min_periods=n)"""
+    __slots__ = ('n', 'valores')
+
+    def __init__(self, n):
+        self.n = n
+        self.valores = deque(maxlen=n)
+
+    def atualizar(self, x):
+        self.valores.append(x)
+        return len(self.valores) == self.n
+
+    def media(self):
+        return math.fsum(self.valores) / self.n
+
+    def desvio(self, ddof=0):
+        m = self.media()
+        return math.sqrt(math.fsum((v - m) ** 2 for v in self.valores) / (self.n - ddof))
+
+
+class _EstadoIndicadores:
+    """Acumuladores de um (par, timeframe) até o último candle fechado"""
+
+    def __init__(self):
+        self.anterior = None  # (high, low, close) do candle anterior
+        self.janela_tr = _Janela(14)
+        self.atr = _MediaExponencial(1 / 14, min_periods=14)   # ATR do pandas_ta (usado no ADX)
+        self.dm_pos = _MediaExponencial(1 / 14, min_periods=14)
+        self.dm_neg = _MediaExponencial(1 / 14, min_periods=14)
+        self.adx = _MediaExponencial(1 / 14, min_periods=14)
+        self.rsi_pos = _MediaExponencial(1 / 14, min_periods=14)
+        self.rsi_neg = _MediaExponencial(1 / 14, min_periods=14)
+        self.janela_bb = _Janela(20)
+        self.janela_vol = _Janela(20)
+        self.ema_9, self.ema_21, self.ema_200 = _EMA(9), _EMA(21), _EMA(200)
+
+    def passo(self, high, low, close, volume):
+        """Avança um candle e devolve os valores de COLUNAS_INCREMENTAIS (antes do fillna)"""
+        nan = math.nan
+        if self.anterior is None:
+            tr_manual = high - low
+            tr_ta = up = dn = d_close = nan
+        else:
+            h_ant, l_ant, c_ant = self.anterior
+            tr_manual = max(high - low, abs(high - c_ant), abs(low - c_ant))
+            tr_ta = tr_manual
+            up, dn = high - h_ant, l_ant - low
+            d_close = close - c_ant
+        self.anterior = (high, low, close)
+
+        # ATR manual (média simples) como no modo batch
+        atr_14 = self.janela_tr.media() if self.janela_tr.atualizar(tr_manual) else 0.0
+        atrr_14 = atr_14 / close * 100
+
+        # ADX (pandas_ta: RMA do TR e dos movimentos direcionais)
+        atr_ta = self.atr.atualizar(tr_ta)
+        pos = _zero(up) if ((up > dn) and (up > 0)) else (nan if up != up else 0.0)
+        neg = _zero(dn) if ((dn > up) and (dn > 0)) else (nan if dn != dn else 0.0)
+        k = _div(100.0, atr_ta)
+        dmp = k * self.dm_pos.atualizar(pos)
+        dmn = k * self.dm_neg.atualizar(neg)
+        dx = _div(100.0 * abs(dmp - dmn), dmp + dmn)
+        adx = self.adx.atualizar(dx)
+
+        # RSI
+        media_pos = self.rsi_pos.atualizar(max(d_close, 0.0) if d_close == d_close else nan)
+        media_neg = self.rsi_neg.atualizar(min(d_close, 0.0) if d_close == d_close else nan)
+        rsi = _div(100.0 * media_pos, media_pos + abs(media_neg))
+
+        # Bollinger (20, 2, ddof=0)
+        if self.janela_bb.atualizar(close):
+            bbm = self.janela_bb.media()
+            desvio = 2.0 * self.janela_bb.desvio(ddof=0)
+            bbl, bbu = bbm - desvio, bbm + desvio
+            bbb = _div(100.0 * (bbu - bbl), bbm)
+            bbp = _div(close - bbl, bbu - bbl)
+        else:
+            bbl = bbm = bbu = bbb = bbp = nan
+
+        vol_sma = self.janela_vol.media() if self.janela_vol.atualizar(volume) else nan
+
+        return (atr_14, atrr_14, adx, dmp, dmn, rsi, bbl, bbm, bbu, bbb, bbp,
+                self.ema_9.atualizar(close), self.ema_21.atualizar(close),
+                self.ema_200.atualizar(close), vol_sma)
+
+
+COLUNAS_INCREMENTAIS = [
+    'ATR_14', 'ATRr_14', 'ADX_14', 'DMP_14', 'DMN_14', 'RSI_14',
+    'BBL_20_2.0', 'BBM_20_2.0', 'BBU_20_2.0', 'BBB_20_2.0', 'BBP_20_2.0',
+    'EMA_9', 'EMA_21', 'EMA_200', 'VOL_SMA_20'
+]
+
+
+class CalculadoraIncremental:
+    """
+    Versão com estado de Calculadora.adicionar_todos.
+    Guarda os acumuladores (EMAs, RMAs de Wilder, janelas móveis) por
+    (par, timeframe) e, a cada chamada, processa só os candles novos.
+    O último candle (ainda aberto) é calculado numa cópia do estado e só
+    entra no estado quando aparece fechado na chamada seguinte.
+
+    O resultado é o mesmo do batch rodado sobre todo o histórico visto desde
+    a primeira chamada (nas médias móveis simples, idêntico ao da janela).
+    Buraco na sequência, janela maior que o histórico guardado ou menos de
+    200 candles fazem o par voltar para o cálculo batch.
+
+    Uso:
+        calc = CalculadoraIncremental()
+        df = calc.adicionar_todos(df, "BTCUSDT", "15m")
+    """
+
+    MIN_CANDLES = 200  # Maior lookback (EMA 200); abaixo disso usa o batch
+
+    def __init__(self, tamanho_historico=2000):
+        self.tamanho_historico = tamanho_historico
+        self._estados = {}    # (par, tf) -> _EstadoIndicadores no último candle fechado
+        self._historico = {}  # (par, tf) -> {timestamp: valores} dos candles fechados
+        self._ordem = {}      # (par, tf) -> deque de timestamps (para descartar os antigos)
+        self._travas = {}
+        self._trava_travas = threading.Lock()
+
+    def _trava(self, chave):
+        with self._trava_travas:
+            if chave not in self._travas:
+                self._travas[chave] = threading.Lock()
+            return self._travas[chave]
+
+    def esquecer(self, par, timeframe):
+        chave = (par, timeframe)
+        with self._trava(chave):
+            self._estados.pop(chave, None)
+            self._historico.pop(chave, None)
+            self._ordem.pop(chave, None)
+
+    def adicionar_todos(self, df, par, timeframe):
+        if len(df) < self.MIN_CANDLES or 'timestamp' not in df.columns:
+            return Calculadora.adicionar_todos(df)
+
+        df = df.loc[:, ~df.columns.duplicated()]
+        try:
+            timestamps = df['timestamp'].to_numpy(dtype=float)
+            with self._trava((par, timeframe)):
+                valores = self._calcular(
+                    (par, timeframe), timestamps,
+                    df['high'].to_numpy(dtype=float), df['low'].to_numpy(dtype=float),
+                    df['close'].to_numpy(dtype=float), df['volume'].to_numpy(dtype=float)
+                )
+        except Exception as e:
+            print(f"⚠️ Erro Calculadora Incremental ({par} {timeframe}): {e}")
+            self.esquecer(par, timeframe)
+            return Calculadora.adicionar_todos(df)
+
+        if valores is None:  # Janela anterior ao estado guardado
+            return Calculadora.adicionar_todos(df)
+
+        novos = pd.DataFrame(np.array(valores, dtype=float), columns=COLUNAS_INCREMENTAIS, index=df.index)
+        df = pd.concat([df.drop(columns=COLUNAS_INCREMENTAIS, errors='ignore'), novos], axis=1)
+        df.fillna(0, inplace=True)
+        return df
+
+    def _calcular(self, chave, ts, high, low, close, volume):
+        n = len(ts)
+        estado = self._estados.get(chave)
+        historico = self._historico.get(chave)
+
+        if estado is not None:
+            ultimo = self._ordem[chave][-1]
+            if ts[-1] < ultimo:
+                return None
+            # Continua do estado só se a janela cobre o último fechado e o histórico cobre a janela
+            inicio = int(np.searchsorted(ts, ultimo))
+            if inicio >= n or ts[inicio] != ultimo or ts[0] not in historico:
+                estado = None
+            else:
+                inicio += 1
+
+        if estado is None:
+            estado = _EstadoIndicadores()
+            historico = {}
+            self._estados[chave] = estado
+            self._historico[chave] = historico
+            self._ordem[chave] = deque()
+            inicio = 0
+
+        if inicio == n:
+            # Janela termina no último candle já fechado: nada novo, e passar de novo o contaria duas vezes
+            return [historico[t] for t in ts]
+
+        ordem = self._ordem[chave]
+        for i in range(inicio, n - 1):
+            historico[ts[i]] = estado.passo(high[i], low[i], close[i], volume[i])
+            ordem.append(ts[i])
+        while len(ordem) > self.tamanho_historico:
+            historico.pop(ordem.popleft(), None)
+
+        # Último candle (pode estar aberto): calcula numa cópia do estado
+        provisorio = copy.deepcopy(estado).passo(high[-1], low[-1], close[-1], volume[-1])
+        return [historico[t] for t in ts[:-1]] + [provisorio]
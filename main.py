@@ -10,7 +10,9 @@ from notifier import Notificador
 from binance_connector import BinanceConnector
 from indicators import Calculadora, Estrategia
 from manager import GerenciadorEstado
-from backtester import Backtester
+from backtester import CacheBacktest
+from contexto_mercado import obter_contexto
+from agregacao_candles import agregar_janela
 
 # =============================================
 # CONFIGURAÇÃO INICIAL
@@ -26,6 +28,8 @@ logging.basicConfig(
 # Instâncias Globais
 connector = BinanceConnector()
 estado = GerenciadorEstado()
+cache_backtest = CacheBacktest()  # Backtest por par/timeframe/sinal (só trades ainda em aberto)
+contexto_mercado = obter_contexto(connector)  # BTC/ETHBTC baixados 1x por candle e compartilhados
 
 # Variáveis de Estado
 MODO_OPERACAO = "SPOT"
@@ -38,6 +42,10 @@ TIMEFRAME_MAP = {
     "diario": {"id": "1d", "texto": "Diário"}
 }
 
+# Candles por análise
+LIMITE_OPERACIONAL = 1500  # Timeframe operacional (indicadores + backtest)
+LIMITE_MTF = 100           # Timeframe superior (confirmação)
+
 # Hierarquia Multi-Timeframe
 MTF_HIERARCHY = {
     "5m": "15m",   # 5min -> 15min (confirmação)
@@ -58,11 +66,10 @@ def analisar_contexto_mercado(tf_id):
     """
     try:
         # BTC Analysis
-        df_btc = connector.buscar_candles("BTCUSDT", tf_id, lookback="30 days ago UTC")
+        df_btc = contexto_mercado.btc(tf_id)
         if df_btc is None or len(df_btc) < 50:
             return True, False, 0, 50
             
-        df_btc = Calculadora.adicionar_todos(df_btc)
         candle_btc = df_btc.iloc[-1]
         
         btc_ok = candle_btc['close'] > candle_btc['EMA_21']
@@ -70,10 +77,9 @@ def analisar_contexto_mercado(tf_id):
         btc_rsi = candle_btc.get('RSI_14', 50)
         
         # Alts Strength (ETH/BTC)
-        df_eth = connector.buscar_candles("ETHBTC", tf_id, lookback="15 days ago UTC")
+        df_eth = contexto_mercado.serie("ETHBTC", tf_id)
         alts_ok = False
         if df_eth is not None and len(df_eth) > 20:
-            df_eth = Calculadora.adicionar_todos(df_eth)
             alts_ok = df_eth.iloc[-1]['close'] > df_eth.iloc[-1]['EMA_21']
             
         return btc_ok, alts_ok, btc_price, btc_rsi
@@ -82,9 +88,41 @@ def analisar_contexto_mercado(tf_id):
         logging.error(f"Erro contexto mercado: {e}")
         return True, False, 0, 50
 
-def analisar_par(par, tf_config, btc_ok, btc_rsi):
+def preparar_dados_lote(pares, tf_config):
+    """
+    Baixa os candles de todos os pares (operacional + MTF) de uma vez e calcula
+    os indicadores do universo inteiro numa passada vetorizada.
+    Retorna: {par: (df_operacional, df_superior)} já com indicadores
+    """
+    tf_superior = MTF_HIERARCHY.get(tf_config['id'])
+
+    # Só quem passaria no anti-spam (os outros nem chegam a usar os candles)
+    pares = [p for p in pares if estado.pode_enviar_alerta(p, tf_config['id'])]
+    if not pares:
+        return {}
+
+    brutos = connector.buscar_candles_lote(pares, tf_config['id'], limit=LIMITE_OPERACIONAL)
+    operacional = Calculadora.adicionar_todos_lote(
+        {p: df for p, df in brutos.items() if df is not None and len(df) >= 100}
+    )
+
+    superior = {}
+    if tf_superior:
+        # MTF agregado dos candles operacionais; só baixa quem não tem histórico suficiente
+        superior = {p: agregar_janela(df, tf_config['id'], tf_superior, LIMITE_MTF) for p, df in brutos.items()}
+        faltando = [p for p in pares if superior.get(p) is None]
+        if faltando:
+            superior.update(connector.buscar_candles_lote(faltando, tf_superior, limit=LIMITE_MTF))
+        superior = Calculadora.adicionar_todos_lote(
+            {p: df for p, df in superior.items() if df is not None and len(df) > 20}
+        )
+
+    return {par: (operacional.get(par), superior.get(par)) for par in pares}
+
+def analisar_par(par, tf_config, btc_ok, btc_rsi, dados):
     """
     Analisa um par específico com todos os filtros incluindo MTF
+    dados: (df_operacional, df_superior) já com indicadores (preparar_dados_lote)
     Retorna: diagnóstico completo para dashboard
     """
     # Inicializar diagnóstico
@@ -121,26 +159,16 @@ def analisar_par(par, tf_config, btc_ok, btc_rsi):
 
     # ========== BUSCAR DADOS MULTI-TIMEFRAME ==========
     
+    df_operacional, df_superior = dados
+
     # Dados do timeframe operacional
-    df_operacional = connector.buscar_candles(par, tf_config['id'], lookback="60 days ago UTC")
     if df_operacional is None or len(df_operacional) < 100:
         diagnostico.update({
             "status": "SEM DADOS", 
             "detalhe": "Dados insuficientes"
         })
         return diagnostico
-    
-    # Dados do timeframe superior (MTF)
-    tf_superior = MTF_HIERARCHY.get(tf_config['id'])
-    df_superior = None
-    
-    if tf_superior:
-        df_superior = connector.buscar_candles(par, tf_superior, lookback="100 candles ago UTC")
-        if df_superior is not None and len(df_superior) > 20:
-            df_superior = Calculadora.adicionar_todos(df_superior)
 
-    # ========== CALCULAR INDICADORES ==========
-    df_operacional = Calculadora.adicionar_todos(df_operacional)
     c_atual = df_operacional.iloc[-1]
     diagnostico['preco'] = float(c_atual['close'])
     
@@ -192,7 +220,7 @@ def analisar_par(par, tf_config, btc_ok, btc_rsi):
         return diagnostico
 
     # ========== FILTRO 4: BACKTEST ESTATÍSTICO ==========
-    win_rate, total_trades, saldo_historico = Backtester.simular_sinal_no_passado(df_operacional, sinais[0])
+    win_rate, total_trades, saldo_historico = cache_backtest.simular(df_operacional, par, tf_config['id'], sinais[0])
     diagnostico.update({
         "win_rate": round(win_rate, 1),
         "trades": total_trades,
@@ -362,11 +390,16 @@ def executar_scanner(pares, tf_key):
     }
     
     if operar:
+        # Candles + indicadores de todos os pares numa passada (matriz pares x candles)
+        print("📥 Calculando indicadores do universo em lote...")
+        dados_lote = preparar_dados_lote(pares, tf_config)
+        cache_backtest.manter_apenas(pares)
+
         print("🔄 Iniciando análise paralela...")
         
         with concurrent.futures.ThreadPoolExecutor(max_workers=8) as executor:
             futures = {
-                executor.submit(analisar_par, par, tf_config, btc_ok, btc_rsi): par 
+                executor.submit(analisar_par, par, tf_config, btc_ok, btc_rsi, dados_lote.get(par, (None, None))): par 
                 for par in pares
             }
             
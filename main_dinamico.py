@@ -24,7 +24,7 @@ def main():
     
     # Validação Inicial
     try:
-        connector.client.ping()
+        connector.chamar('ping')
         print("✅ Conectado à Binance Futures")
     except:
         print("❌ Falha na conexão API")
@@ -89,8 +89,6 @@ class TradingBot:
 
     def processar_par(self, par_atual):
         """Processa análise e trading para um par específico"""
-        time.sleep(1)  # Rate limit
-        
         # Obter dados de mercado
         df = self.con.buscar_candles(par_atual, self.TIMEFRAME, mercado="FUTUROS", limit=500)
         if df is None or df.empty:
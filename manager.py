@@ -1,10 +1,15 @@
 # Binance/manager.py (BANQUEIRO SINCRONIZADO)
+import csv
 import json
 import os
+import time
+import atexit
+import threading
 import pandas as pd
+from contextlib import contextmanager
 from datetime import datetime, timedelta
-import time
-import random
+import config
+from diario_trades import DiarioTrades, COLUNAS as COLUNAS_HISTORICO
 
 # Caminhos
 BASE_DIR = os.path.dirname(os.path.abspath(__file__))
@@ -12,106 +17,296 @@ ARQUIVO_ESTADO = os.path.join(BASE_DIR, "bot_state.json")
 ARQUIVO_WALLET = os.path.join(BASE_DIR, "bot_wallet.json")
 ARQUIVO_HISTORICO = os.path.join(BASE_DIR, "trades_history.csv")
 ARQUIVO_MONITOR = os.path.join(BASE_DIR, "monitor_live.json")
+ARQUIVO_ANALISES = os.path.join(BASE_DIR, "analysis_history.csv")
+
+# Documento de estado -> arquivo JSON
+DOCUMENTOS = {"carteira": ARQUIVO_WALLET, "cooldowns": ARQUIVO_ESTADO, "monitor": ARQUIVO_MONITOR}
+
+INTERVALO_GRAVACAO = 1.0  # Segundos entre gravações dos cooldowns/monitor em disco
+GRAVACAO_IMEDIATA = {"carteira"}  # Documentos gravados na hora (dinheiro não espera o próximo ciclo)
+
+
+def _ler_json(arquivo):
+    if not os.path.exists(arquivo):
+        return {}
+    try:
+        with open(arquivo, 'r') as f: return json.load(f)
+    except (OSError, ValueError) as e:
+        print(f"⚠️ Erro ao ler {os.path.basename(arquivo)}: {e}")
+        return {}
+
+
+def _assinatura(arquivo):
+    try:
+        info = os.stat(arquivo)
+        return info.st_mtime_ns, info.st_size
+    except OSError:
+        return None
+
+
+@contextmanager
+def _trava_arquivo(arquivo):
+    """Trava entre processos: arquivo .lock criado com O_EXCL (mesmo esquema do governador_api)"""
+    lock = arquivo + ".lock"
+    while True:
+        try:
+            fd = os.open(lock, os.O_CREAT | os.O_EXCL | os.O_WRONLY)
+            break
+        except FileExistsError:
+            try:
+                # Lock órfão (processo morreu segurando): remove
+                if time.time() - os.path.getmtime(lock) > 5:
+                    os.remove(lock)
+                    continue
+            except OSError:
+                continue
+            time.sleep(0.001)
+    try:
+        yield
+    finally:
+        os.close(fd)
+        try: os.remove(lock)
+        except OSError: pass
+
+
+def _por_par(moedas):
+    return {m.get("par"): json.dumps(m, sort_keys=True, default=str) for m in moedas}
+
+
+class ArmazemEstado:
+    """
+    Carteira, cooldowns e monitor em memória, compartilhados por vários
+    processos (live traders, scanner) através dos mesmos JSON.
+
+    - carteira: toda edição trava o arquivo entre processos, relê se outro
+      processo o alterou (mtime/tamanho) e grava na hora.
+    - cooldowns e monitor: editar só marca como sujo; uma thread grava a cada
+      `intervalo` segundos (e na saída do processo). Antes de gravar, relê o
+      arquivo se ele mudou e mescla: cooldowns pelo envio mais recente,
+      moedas do monitor por par (cada processo só sobrescreve os pares que
+      ele mesmo atualizou).
+
+    Toda gravação é um .tmp seguido de os.replace, para o dashboard nunca ler
+    JSON pela metade. Leituras da carteira só reabrem o arquivo se ele mudou.
+    """
+
+    def __init__(self, intervalo=INTERVALO_GRAVACAO):
+        self.intervalo = intervalo
+        self._trava = threading.RLock()
+        self._trava_disco = threading.Lock()
+        self._dados = {}
+        self._assinaturas = {}
+        for nome in DOCUMENTOS:
+            self._recarregar(nome)
+        self._sujos = set()
+        self._pares_alterados = set()  # Pares do monitor atualizados por este processo desde a última gravação
+        self._parar = threading.Event()
+        self._thread = threading.Thread(target=self._loop, name="gravacao-estado", daemon=True)
+        self._thread.start()
+        atexit.register(self.fechar)
+
+    # --- Disco ---
+
+    def _mudou(self, nome):
+        return _assinatura(DOCUMENTOS[nome]) != self._assinaturas.get(nome)
+
+    def _recarregar(self, nome):
+        arquivo = DOCUMENTOS[nome]
+        self._assinaturas[nome] = _assinatura(arquivo)
+        self._dados[nome] = _ler_json(arquivo)
+
+    def _gravar_arquivo(self, nome):
+        arquivo = DOCUMENTOS[nome]
+        temp = f"{arquivo}.{os.getpid()}.tmp"
+        with open(temp, 'w') as f: json.dump(self._dados[nome], f, indent=4)
+        os.replace(temp, arquivo)
+        self._assinaturas[nome] = _assinatura(arquivo)
+
+    def _mesclar(self, nome, disco, local):
+        """Versão do disco (outros processos) + o que este processo mudou"""
+        if nome == "cooldowns":
+            for par, quando in local.items():
+                if par not in disco or str(quando) > str(disco[par]):
+                    disco[par] = quando
+            return disco
+        # monitor: campos gerais do último a gravar, moedas mescladas por par
+        mescla = dict(local)
+        locais = {m.get("par"): m for m in local.get("moedas", [])}
+        moedas = [m for m in disco.get("moedas", []) if m.get("par") not in self._pares_alterados]
+        moedas.extend(locais[par] for par in locais if par in self._pares_alterados)
+        mescla["moedas"] = moedas
+        return mescla
+
+    # --- API ---
+
+    @contextmanager
+    def ler(self, nome):
+        """Documento para leitura (não alterar)"""
+        with self._trava:
+            if nome in GRAVACAO_IMEDIATA and self._mudou(nome):
+                self._recarregar(nome)
+            yield self._dados[nome]
+
+    @contextmanager
+    def editar(self, nome):
+        """Documento para alteração (carteira: gravada na hora; resto: na próxima gravação)"""
+        with self._trava:
+            if nome in GRAVACAO_IMEDIATA:
+                with _trava_arquivo(DOCUMENTOS[nome]):
+                    if self._mudou(nome):
+                        self._recarregar(nome)
+                    try:
+                        yield self._dados[nome]
+                    except BaseException:
+                        self._recarregar(nome)  # Descarta a edição pela metade
+                        raise
+                    self._gravar_arquivo(nome)
+                return
+            antes = _por_par(self._dados[nome].get("moedas", [])) if nome == "monitor" else None
+            yield self._dados[nome]
+            if antes is not None:
+                depois = _por_par(self._dados[nome].get("moedas", []))
+                self._pares_alterados.update(par for par, m in depois.items() if antes.get(par) != m)
+            self._sujos.add(nome)
+
+    def _loop(self):
+        while not self._parar.wait(self.intervalo):
+            self.gravar()
+
+    def gravar(self):
+        """Grava agora os documentos alterados desde a última gravação"""
+        with self._trava_disco:
+            with self._trava:
+                pendentes = list(self._sujos)
+            for nome in pendentes:
+                try:
+                    with self._trava, _trava_arquivo(DOCUMENTOS[nome]):
+                        if self._mudou(nome):
+                            self._dados[nome] = self._mesclar(nome, _ler_json(DOCUMENTOS[nome]), self._dados[nome])
+                        self._gravar_arquivo(nome)
+                        self._sujos.discard(nome)
+                        if nome == "monitor":
+                            self._pares_alterados.clear()
+                except OSError as e:
+                    # Ex.: arquivo aberto por outro programa no Windows; tenta de novo no próximo ciclo
+                    print(f"⚠️ Erro ao gravar {os.path.basename(DOCUMENTOS[nome])}: {e}")
+
+    def fechar(self):
+        self._parar.set()
+        if self._thread.is_alive() and self._thread is not threading.current_thread():
+            self._thread.join(timeout=5)
+        self.gravar()
+
+
+_armazem_padrao = None
+_trava_padrao = threading.Lock()
+
+
+def armazem_padrao():
+    """
+    Armazém único do processo (todos os GerenciadorEstado enxergam a mesma
+    carteira): o banco SQLite compartilhado se config.USAR_BANCO_SQLITE,
+    senão os JSON com gravação atrasada.
+    """
+    global _armazem_padrao
+    with _trava_padrao:
+        if _armazem_padrao is None:
+            if config.USAR_BANCO_SQLITE:
+                from banco_dados import banco_padrao
+                _armazem_padrao = banco_padrao()
+            else:
+                _armazem_padrao = ArmazemEstado()
+        return _armazem_padrao
+
 
 class GerenciadorEstado:
     def __init__(self, saldo_inicial=None):
         """
         saldo_inicial: Se fornecido (via API Binance), atualiza o cofre.
         """
-        self.dados = self._carregar_json(ARQUIVO_ESTADO)
+        self._armazem = armazem_padrao()
+        # No modo SQLite o banco também guarda os trades (mesma API do diário)
+        self.diario = self._armazem if config.USAR_BANCO_SQLITE else DiarioTrades(ARQUIVO_HISTORICO)
         self._garantir_carteira(saldo_inicial)
-        self._inicializar_historico()
+        if not config.USAR_BANCO_SQLITE:
+            self._inicializar_historico()
         
         # Sincroniza saldo inicial se fornecido (Conexão Real)
         if saldo_inicial is not None:
             self.sincronizar_saldo_real(saldo_inicial)
 
-    def _carregar_json(self, arquivo):
-        for _ in range(10):
-            if os.path.exists(arquivo):
-                try:
-                    with open(arquivo, 'r') as f: return json.load(f)
-                except: time.sleep(0.1)
-            else: return {}
-        return {}
-
-    def _salvar_json(self, arquivo, dados):
-        for _ in range(10):
-            try:
-                with open(arquivo, 'w') as f: json.dump(dados, f, indent=4)
-                return
-            except: time.sleep(random.uniform(0.05, 0.2))
-
     def _garantir_carteira(self, saldo_inicial):
-        if not os.path.exists(ARQUIVO_WALLET):
+        with self._armazem.editar("carteira") as carteira:
+            if carteira:
+                return
             val = saldo_inicial if saldo_inicial else 0.0
             # data_referencia serve para saber quando resetar o PnL diário
-            carteira = {
+            carteira.update({
                 "saldo": val, 
                 "saldo_inicial_dia": val, 
                 "em_uso": 0.0,
                 "data_referencia": datetime.now().strftime("%Y-%m-%d")
-            }
-            self._salvar_json(ARQUIVO_WALLET, carteira)
+            })
 
     def _inicializar_historico(self):
         if not os.path.exists(ARQUIVO_HISTORICO):
-            pd.DataFrame(columns=[
-                "data", "par", "lado", "preco", "qtd", "valor_usdt", "pnl_usd", "pnl_pct", "tipo", "saldo_total"
-            ]).to_csv(ARQUIVO_HISTORICO, index=False)
+            pd.DataFrame(columns=COLUNAS_HISTORICO).to_csv(ARQUIVO_HISTORICO, index=False)
+
+    def salvar(self):
+        """Força a gravação do estado pendente (a thread e a saída do processo já fazem isso)"""
+        self._armazem.gravar()
 
     # --- GESTÃO FINANCEIRA ---
     
     def sincronizar_saldo_real(self, saldo_real_binance):
         """Atualiza o cofre com o que realmente tem na Binance"""
-        carteira = self._carregar_json(ARQUIVO_WALLET)
-        
-        # Verifica virada de dia para resetar meta diária
-        hoje = datetime.now().strftime("%Y-%m-%d")
-        if carteira.get("data_referencia") != hoje:
-            print(f"📅 NOVO DIA DETECTADO! Resetando Saldo Inicial de Referência: ${saldo_real_binance:.2f}")
-            carteira["saldo_inicial_dia"] = saldo_real_binance
-            carteira["data_referencia"] = hoje
-        
-        # Se não tivermos trades abertos (em_uso == 0), o saldo real é o saldo total
-        if carteira.get("em_uso", 0) == 0:
-            carteira["saldo"] = saldo_real_binance
-        
-        # Se for a primeira vez
-        if carteira.get("saldo_inicial_dia") == 0:
-             carteira["saldo_inicial_dia"] = saldo_real_binance
-
-        self._salvar_json(ARQUIVO_WALLET, carteira)
+        with self._armazem.editar("carteira") as carteira:
+            # Verifica virada de dia para resetar meta diária
+            hoje = datetime.now().strftime("%Y-%m-%d")
+            if carteira.get("data_referencia") != hoje:
+                print(f"📅 NOVO DIA DETECTADO! Resetando Saldo Inicial de Referência: ${saldo_real_binance:.2f}")
+                carteira["saldo_inicial_dia"] = saldo_real_binance
+                carteira["data_referencia"] = hoje
+            
+            # Se não tivermos trades abertos (em_uso == 0), o saldo real é o saldo total
+            if carteira.get("em_uso", 0) == 0:
+                carteira["saldo"] = saldo_real_binance
+            
+            # Se for a primeira vez
+            if carteira.get("saldo_inicial_dia") == 0:
+                 carteira["saldo_inicial_dia"] = saldo_real_binance
 
     def obter_saldo_disponivel(self):
-        c = self._carregar_json(ARQUIVO_WALLET)
-        return c.get("saldo", 0.0)
+        with self._armazem.ler("carteira") as carteira:
+            return carteira.get("saldo", 0.0)
 
     def reservar_capital(self):
         """Pega TUDO (All-In)"""
-        carteira = self._carregar_json(ARQUIVO_WALLET)
-        disponivel = carteira.get("saldo", 0.0)
-        
-        if disponivel < 5: return 0.0 # Mínimo da Binance
-        
-        valor_reserva = disponivel
-        carteira["saldo"] = 0.0
-        carteira["em_uso"] = valor_reserva
-        self._salvar_json(ARQUIVO_WALLET, carteira)
-        return valor_reserva
+        with self._armazem.editar("carteira") as carteira:
+            disponivel = carteira.get("saldo", 0.0)
+            
+            if disponivel < 5: return 0.0 # Mínimo da Binance
+            
+            valor_reserva = disponivel
+            carteira["saldo"] = 0.0
+            carteira["em_uso"] = valor_reserva
+            return valor_reserva
 
     def devolver_capital(self, valor_retornado):
         """Devolve ao cofre"""
-        carteira = self._carregar_json(ARQUIVO_WALLET)
-        carteira["saldo"] = valor_retornado
-        carteira["em_uso"] = 0.0
-        self._salvar_json(ARQUIVO_WALLET, carteira)
-        return valor_retornado
+        with self._armazem.editar("carteira") as carteira:
+            carteira["saldo"] = valor_retornado
+            carteira["em_uso"] = 0.0
+            return valor_retornado
+
+    def _patrimonio(self):
+        with self._armazem.ler("carteira") as c:
+            total = c.get("saldo", 0) + c.get("em_uso", 0)
+            return total, c.get("saldo_inicial_dia", total)
 
     # --- LOGS E DASHBOARD ---
     def registrar_trade(self, par, lado, preco, qtd, valor_usdt, tipo, pnl_usd=0, pnl_pct=0):
-        c = self._carregar_json(ARQUIVO_WALLET)
-        total = c.get("saldo", 0) + c.get("em_uso", 0)
+        total, _ = self._patrimonio()
         
         novo = {
             "data": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
@@ -120,44 +315,54 @@ class GerenciadorEstado:
             "tipo": tipo, "saldo_total": total
         }
         try:
-            df = pd.read_csv(ARQUIVO_HISTORICO)
-            df = pd.concat([df, pd.DataFrame([novo])], ignore_index=True)
-            df.to_csv(ARQUIVO_HISTORICO, index=False)
-        except: pass
+            self.diario.registrar(novo)
+        except Exception as e:
+            print(f"⚠️ Erro ao registrar trade no diário: {e}")
+
+    def registrar_analise(self, par, preco, adx, sinal, confianca):
+        """Linha do analysis_history (hora, timestamp, par, preço, ADX, sinal, confiança)"""
+        agora = time.time()
+        hora = datetime.fromtimestamp(agora).strftime("%H:%M:%S")
+        try:
+            if config.USAR_BANCO_SQLITE:
+                self._armazem.registrar_analise(hora, agora, par, preco, adx, sinal, confianca)
+            else:
+                with open(ARQUIVO_ANALISES, 'a', newline='') as f:
+                    csv.writer(f, lineterminator='\n').writerow([hora, agora, par, preco, adx, sinal, confianca])
+        except Exception as e:
+            print(f"⚠️ Erro ao registrar análise: {e}")
 
     def atualizar_monitor(self, dados_par):
         try:
-            monitor = self._carregar_json(ARQUIVO_MONITOR)
-            if "moedas" not in monitor: monitor["moedas"] = []
-            
-            novas = [m for m in monitor["moedas"] if m["par"] != dados_par[0]["par"]]
-            novas.extend(dados_par)
-            
-            c = self._carregar_json(ARQUIVO_WALLET)
-            total = c.get("saldo", 0) + c.get("em_uso", 0)
+            total, saldo_ini = self._patrimonio()
             
             # Adiciona dados de performance diária para o Dashboard
-            saldo_ini = c.get("saldo_inicial_dia", total)
             lucro_dia = total - saldo_ini
             pct_dia = (lucro_dia / saldo_ini * 100) if saldo_ini > 0 else 0
 
-            monitor["moedas"] = novas
-            monitor["ultima_atualizacao"] = datetime.now().strftime("%H:%M:%S")
-            monitor["saldo_total"] = total
-            monitor["lucro_dia_usd"] = lucro_dia
-            monitor["lucro_dia_pct"] = pct_dia
-            
-            self._salvar_json(ARQUIVO_MONITOR, monitor)
+            with self._armazem.editar("monitor") as monitor:
+                if "moedas" not in monitor: monitor["moedas"] = []
+                
+                novas = [m for m in monitor["moedas"] if m["par"] != dados_par[0]["par"]]
+                novas.extend(dados_par)
+
+                monitor["moedas"] = novas
+                monitor["ultima_atualizacao"] = datetime.now().strftime("%H:%M:%S")
+                monitor["saldo_total"] = total
+                monitor["lucro_dia_usd"] = lucro_dia
+                monitor["lucro_dia_pct"] = pct_dia
         except: pass
         
     def pode_enviar_alerta(self, par, timeframe):
-        if par in self.dados:
+        with self._armazem.ler("cooldowns") as cooldowns:
+            ultimo = cooldowns.get(par)
+        if ultimo:
             try:
-                ultimo = datetime.fromisoformat(self.dados[par])
+                ultimo = datetime.fromisoformat(ultimo)
                 if datetime.now() - ultimo < timedelta(minutes=2): return False
             except: pass
         return True
 
     def registrar_envio(self, par):
-        self.dados[par] = datetime.now().isoformat()
-        self._salvar_json(ARQUIVO_ESTADO, self.dados)
\ No newline at end of file
+        with self._armazem.editar("cooldowns") as cooldowns:
+            cooldowns[par] = datetime.now().isoformat()
@@ -0,0 +1,109 @@
+# Binance/rotulagem.py (ROTULAGEM POR BARREIRA TRIPLA VETORIZADA)
+"""
+Rótulos de "primeiro toque" para os datasets de treino.
+
+Para cada candle i, a entrada é o close[i] e o futuro são os candles
+i+1 .. i+horizonte. Cada barreira (take profit, stop) é uma fração do preço
+de entrada: escalar (percentual fixo) ou um array por linha (ex.: múltiplos
+do ATR, ver barreiras_atr). O futuro inteiro vira uma matriz
+(linhas x horizonte) via sliding_window_view e o primeiro toque de todas as
+linhas é achado de uma vez, sem loop em Python.
+
+Convenções dos datasets:
+    rotular_long        1 = TP do long antes do stop, 0 = resto
+    rotular_long_short  1 = WIN LONG, 2 = WIN SHORT, 0 = resto
+Linhas sem `horizonte` candles de futuro recebem 0.
+"""
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+
+TP, STOP, TEMPO = 1, -1, 0  # Resultados de barreira_tripla
+
+
+def _janelas_futuro(x, horizonte):
+    """Matriz (n - horizonte, horizonte): linha i = x[i+1 .. i+horizonte]"""
+    return sliding_window_view(np.asarray(x, dtype=float)[1:], horizonte)
+
+
+def _por_linha(valor, m):
+    """Barreira escalar ou por linha -> coluna (m, 1) para broadcast com as janelas"""
+    valor = np.asarray(valor, dtype=float)
+    return valor if valor.ndim == 0 else valor[:m, None]
+
+
+def barreiras_atr(close, atr, mult_lucro, mult_stop):
+    """Barreiras em fração do preço a partir de múltiplos do ATR: (lucro, stop)"""
+    close = np.asarray(close, dtype=float)
+    atr = np.asarray(atr, dtype=float)
+    return mult_lucro * atr / close, mult_stop * atr / close
+
+
+def _toques(close, high, low, lucro, stop, horizonte, lado):
+    """Matrizes booleanas (toque_tp, toque_stop) de cada linha válida em cada passo"""
+    close = np.asarray(close, dtype=float)
+    m = len(close) - horizonte
+    entrada = close[:m, None]
+    lucro, stop = _por_linha(lucro, m), _por_linha(stop, m)
+    altas, baixas = _janelas_futuro(high, horizonte), _janelas_futuro(low, horizonte)
+
+    if lado == 'long':
+        return altas >= entrada * (1 + lucro), baixas <= entrada * (1 - stop)
+    return baixas <= entrada * (1 - lucro), altas >= entrada * (1 + stop)
+
+
+def _primeiro(matriz):
+    """(houve, passo) do primeiro True de cada linha; passo começa em 1"""
+    houve = matriz.any(axis=1)
+    return houve, np.where(houve, matriz.argmax(axis=1) + 1, 0)
+
+
+def barreira_tripla(close, high, low, lucro, stop, horizonte, lado='long', stop_encerra=True):
+    """
+    Primeiro toque de cada candle para um lado ('long' ou 'short').
+    stop_encerra=True: barreira tripla clássica; o stop encerra o trade e, se TP e
+      stop caem no mesmo candle, vale o stop (cenário pessimista).
+    stop_encerra=False: o stop só anula o candle em que toca; o trade segue e
+      ganha no primeiro candle que toca o TP sem tocar o stop.
+    Retorna (resultado, passo): resultado TP/STOP/TEMPO por linha, passo 1..horizonte
+    do toque (0 = sem toque). As últimas `horizonte` linhas saem como TEMPO.
+    """
+    n = len(close)
+    resultado = np.zeros(n, dtype=np.int8)
+    passo = np.zeros(n, dtype=np.int64)
+    m = n - horizonte
+    if m <= 0:
+        return resultado, passo
+
+    toque_tp, toque_stop = _toques(close, high, low, lucro, stop, horizonte, lado)
+    if stop_encerra:
+        houve, primeiro = _primeiro(toque_tp | toque_stop)
+        foi_stop = toque_stop[np.arange(m), np.maximum(primeiro - 1, 0)]
+        resultado[:m] = np.where(houve, np.where(foi_stop, STOP, TP), TEMPO)
+    else:
+        houve, primeiro = _primeiro(toque_tp & ~toque_stop)
+        resultado[:m] = np.where(houve, TP, np.where(toque_stop.any(axis=1), STOP, TEMPO))
+        primeiro = np.where(houve, primeiro, 0)
+    passo[:m] = primeiro
+    return resultado, passo
+
+
+def rotular_long(close, high, low, lucro, stop, horizonte):
+    """1 = bateu o TP do long antes do stop dentro do horizonte, 0 = resto"""
+    resultado, _ = barreira_tripla(close, high, low, lucro, stop, horizonte, 'long')
+    return (resultado == TP).astype(np.int64)
+
+
+def rotular_long_short(close, high, low, lucro, stop, horizonte, stop_encerra=True, prioridade='long'):
+    """
+    1 = WIN LONG, 2 = WIN SHORT, 0 = nenhum.
+    prioridade='long':     o long é avaliado no horizonte inteiro; short só se o long não ganhou.
+    prioridade='primeiro': vale quem ganhar primeiro; no mesmo candle, o long.
+    """
+    long_res, long_passo = barreira_tripla(close, high, low, lucro, stop, horizonte, 'long', stop_encerra)
+    short_res, short_passo = barreira_tripla(close, high, low, lucro, stop, horizonte, 'short', stop_encerra)
+    ganha_long, ganha_short = long_res == TP, short_res == TP
+
+    if prioridade == 'primeiro':
+        short_antes = ganha_short & (~ganha_long | (short_passo < long_passo))
+        return np.where(short_antes, 2, np.where(ganha_long, 1, 0)).astype(np.int64)
+    return np.where(ganha_long, 1, np.where(ganha_short, 2, 0)).astype(np.int64)
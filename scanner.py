@@ -1,6 +1,6 @@
 # Binance/scanner.py (VERSÃO DINÂMICA V2.0)
 import pandas as pd
-import time
+import numpy as np
 from binance_connector import BinanceConnector
 
 class ScannerCrypto:
@@ -18,7 +18,7 @@ class ScannerCrypto:
         print("\n🛰️ Satélite: Escaneando o mercado inteiro (24h)...")
         try:
             # Pega dados de 24h de TODOS os pares de Futuros
-            tickers = self.connector.client.futures_ticker()
+            tickers = self.connector.chamar('futures_ticker')
             df = pd.DataFrame(tickers)
             
             # Filtros Básicos
@@ -55,47 +55,40 @@ class ScannerCrypto:
         # 1. Atualiza a lista dinamicamente
         moedas_alvo = self.buscar_top_moedas_explosivas()
         
-        ranking = []
         print(f"\n🔍 Analisando profundamente as {len(moedas_alvo)} eleitas...")
         
-        for par in moedas_alvo:
-            try:
-                # Busca dados detalhados (Candles 15m) para ver o "agora"
-                df = self.connector.buscar_candles(par, '15m', mercado="FUTUROS", limit=50)
-                
-                if df is None or len(df) < 30: continue
+        # Busca dados detalhados (Candles 15m) de todas de uma vez (asyncio)
+        candles = self.connector.buscar_candles_lote(moedas_alvo, '15m', limit=50)
+        
+        validos = [p for p in moedas_alvo if candles.get(p) is not None and len(candles[p]) >= 30]
+        if not validos:
+            return pd.DataFrame()
 
-                # Cálculos de Volatilidade Recente (Últimos 75 min)
-                # A variação de 24h pode ser velha. Aqui vemos quem está mexendo AGORA.
-                preco_atual = df.iloc[-1]['close']
-                df['amplitude'] = (df['high'] - df['low']) / df['low'] * 100
-                volatilidade_recente = df['amplitude'].tail(5).mean()
-                
-                # Volume Power
-                vol_media = df['volume'].rolling(20).mean().iloc[-1]
-                vol_atual = df.iloc[-1]['volume']
-                vol_power = vol_atual / vol_media if vol_media > 0 else 0
-                
-                # Pontuação Final
-                score = volatilidade_recente * vol_power 
+        # Matriz (pares, últimos 20 candles): o universo inteiro numa passada
+        m = {c: np.vstack([candles[p][c].to_numpy(dtype=float)[-20:] for p in validos])
+             for c in ('high', 'low', 'close', 'volume')}
 
-                ranking.append({
-                    'par': par,
-                    'preco': preco_atual,
-                    'volatilidade_pct': volatilidade_recente,
-                    'explosao_volume': vol_power,
-                    'score': score
-                })
-                
-                time.sleep(0.1) # Respeita limite da API
-                
-            except Exception as e:
-                pass
+        # Cálculos de Volatilidade Recente (Últimos 75 min)
+        # A variação de 24h pode ser velha. Aqui vemos quem está mexendo AGORA.
+        amplitude = (m['high'] - m['low']) / m['low'] * 100
+        volatilidade_recente = amplitude[:, -5:].mean(axis=1)
+        
+        # Volume Power (volume atual / média de 20)
+        vol_media = m['volume'].mean(axis=1)
+        vol_atual = m['volume'][:, -1]
+        vol_power = np.divide(vol_atual, vol_media, out=np.zeros_like(vol_atual), where=vol_media > 0)
+        
+        # Pontuação Final
+        ranking = pd.DataFrame({
+            'par': validos,
+            'preco': m['close'][:, -1],
+            'volatilidade_pct': volatilidade_recente,
+            'explosao_volume': vol_power,
+            'score': volatilidade_recente * vol_power
+        })
 
         # Ordena do Melhor para o Pior
-        df_rank = pd.DataFrame(ranking)
-        if not df_rank.empty:
-            df_rank = df_rank.sort_values('score', ascending=False)
+        df_rank = ranking.sort_values('score', ascending=False)
         
         return df_rank
 
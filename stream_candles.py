@@ -0,0 +1,127 @@
+# Binance/stream_candles.py (CANDLES AO VIVO VIA WEBSOCKET)
+import time
+import threading
+from collections import deque
+import pandas as pd
+from binance import ThreadedWebsocketManager
+import config
+from cache_candles import COLUNAS_CANDLE, INTERVALOS_MS
+
+
+class StreamCandles:
+    """
+    Mantém um buffer circular de OHLCV por (par, timeframe) alimentado pelo
+    stream combinado de klines da Binance Futures.
+    O buffer nasce com os candles do REST e depois só é atualizado pelo socket.
+    """
+
+    def __init__(self, connector, tamanho=500, tolerancia_seg=60):
+        self.connector = connector
+        self.tamanho = tamanho
+        self.tolerancia_seg = tolerancia_seg  # Sem mensagem há mais que isso = buffer velho
+        self._buffers = {}   # (par, tf) -> deque[(t, o, h, l, c, v)]
+        self._ultima_msg = {}
+        self._trava = threading.Lock()
+        self._twm = None
+        self._sockets = []
+
+    def iniciar(self, pares, timeframe):
+        """Semeia os buffers via REST e assina o stream combinado dos pares"""
+        novos = [p for p in pares if not self.acompanha(p, timeframe)]
+        if not novos:
+            return
+
+        for par in novos:
+            df = self.connector.buscar_candles(par, timeframe, limit=self.tamanho)
+            with self._trava:
+                self._buffers[(par, timeframe)] = deque(maxlen=self.tamanho)
+                self._ultima_msg[(par, timeframe)] = time.time()
+            self.semear(par, timeframe, df)
+
+        if self._twm is None:
+            self._twm = ThreadedWebsocketManager(config.BINANCE_API_KEY, config.BINANCE_API_SECRET)
+            self._twm.start()
+
+        streams = [f"{par.lower()}@kline_{timeframe}" for par in novos]
+        self._sockets.append(
+            self._twm.start_futures_multiplex_socket(callback=self._ao_receber, streams=streams)
+        )
+        print(f"📡 Stream ativo: {len(novos)} pares ({timeframe})")
+
+    def acompanha(self, par, timeframe):
+        return (par, timeframe) in self._buffers
+
+    def semear(self, par, timeframe, df):
+        """Recarrega o buffer com candles do REST, preservando o que o socket já trouxe depois"""
+        if df is None or df.empty:
+            return
+        linhas = list(df[COLUNAS_CANDLE].itertuples(index=False, name=None))
+        with self._trava:
+            buffer = self._buffers.get((par, timeframe))
+            if buffer is None:
+                return
+            recentes = [c for c in buffer if c[0] > linhas[-1][0]]
+            buffer.clear()
+            buffer.extend(linhas + recentes)
+
+    def _ao_receber(self, msg):
+        try:
+            dados = msg.get('data', msg)
+            if dados.get('e') != 'kline':
+                if dados.get('e') == 'error':
+                    print(f"⚠️ Erro no stream: {dados.get('m')}")
+                return
+
+            k = dados['k']
+            chave = (k['s'], k['i'])
+            candle = (float(k['t']), float(k['o']), float(k['h']),
+                      float(k['l']), float(k['c']), float(k['v']))
+
+            with self._trava:
+                buffer = self._buffers.get(chave)
+                if buffer is None:
+                    return
+                self._ultima_msg[chave] = time.time()
+
+                # Mesmo candle (ainda aberto) substitui; candle novo entra no fim
+                if buffer and buffer[-1][0] == candle[0]:
+                    buffer[-1] = candle
+                elif not buffer or candle[0] > buffer[-1][0]:
+                    # Pulou candle (reconexão): descarta e deixa o REST re-semear
+                    passo = INTERVALOS_MS.get(k['i'])
+                    if buffer and passo and candle[0] - buffer[-1][0] > passo:
+                        buffer.clear()
+                    buffer.append(candle)
+        except Exception as e:
+            print(f"⚠️ Mensagem de stream inválida: {e}")
+
+    def candles(self, par, timeframe, limit):
+        """
+        Últimos `limit` candles do buffer no formato de _tratar_df.
+        Retorna None se o par não está no stream, se o buffer é curto ou se o
+        socket parou de mandar dados (o connector cai para o REST e re-semeia).
+        """
+        chave = (par, timeframe)
+        with self._trava:
+            buffer = self._buffers.get(chave)
+            if buffer is None or len(buffer) < limit:
+                return None
+
+            if time.time() - self._ultima_msg.get(chave, 0) > self.tolerancia_seg:
+                return None
+
+            linhas = list(buffer)[-limit:]
+
+        return pd.DataFrame(linhas, columns=COLUNAS_CANDLE)
+
+    def parar(self):
+        if self._twm is not None:
+            try:
+                self._twm.stop()
+            except Exception as e:
+                print(f"⚠️ Erro ao parar stream: {e}")
+        self._twm = None
+        self._sockets = []
+        with self._trava:
+            self._buffers.clear()
+            self._ultima_msg.clear()
@@ -1,6 +1,6 @@
 # Binance/technical_analyzer.py
 import pandas as pd
-import pandas_ta as ta
+import indicadores_numpy as K
 
 class AnalisadorTecnico:
     def adicionar_indicadores_completos(self, df):
@@ -9,19 +9,28 @@ class AnalisadorTecnico:
             # Garante que temos dados suficientes
             if len(df) < 50: return df
 
-            # Indicadores de Tendência
-            df.ta.ema(length=9, append=True)
-            df.ta.ema(length=21, append=True)
-            df.ta.ema(length=200, append=True)
-            df.ta.adx(length=14, append=True)
+            close = df['close'].to_numpy(dtype=float)
+            high = df['high'].to_numpy(dtype=float)
+            low = df['low'].to_numpy(dtype=float)
+            colunas = {}
+
+            # Indicadores de Tendência (EMA só entra se houver candles suficientes, como no pandas_ta)
+            for n in (9, 21, 200):
+                if len(df) >= n:
+                    colunas[f'EMA_{n}'] = K.ema(close, n)
+            colunas['ADX_14'], colunas['DMP_14'], colunas['DMN_14'] = K.adx(high, low, close, 14)
 
             # Indicadores de Momentum
-            df.ta.rsi(length=14, append=True)
-            df.ta.macd(fast=12, slow=26, signal=9, append=True)
+            colunas['RSI_14'] = K.rsi(close, 14)
+            colunas['MACD_12_26_9'], colunas['MACDh_12_26_9'], colunas['MACDs_12_26_9'] = K.macd(close, 12, 26, 9)
             
             # Volatilidade
-            df.ta.atr(length=14, append=True)
-            df.ta.bbands(length=20, std=2, append=True)
+            colunas['ATRr_14'] = K.atr(high, low, close, 14)
+            (colunas['BBL_20_2.0'], colunas['BBM_20_2.0'], colunas['BBU_20_2.0'],
+             colunas['BBB_20_2.0'], colunas['BBP_20_2.0']) = K.bbands(close, 20, 2.0)
+
+            novos = pd.DataFrame(colunas, index=df.index)
+            df = pd.concat([df.drop(columns=list(colunas), errors='ignore'), novos], axis=1)
 
             return df
         except Exception as e:
@@ -0,0 +1,42 @@
+# tests/test_calculadora_incremental.py (INCREMENTAL x BATCH)
+import os
+import sys
+import numpy as np
+import pandas as pd
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from indicators import Calculadora, CalculadoraIncremental, COLUNAS_INCREMENTAIS
+
+
+def gerar_candles(n, semente=7):
+    rng = np.random.default_rng(semente)
+    close = 100 * np.exp(np.cumsum(rng.normal(0, 0.003, n)))
+    open_ = np.r_[close[0], close[:-1]]
+    return pd.DataFrame({
+        'timestamp': np.arange(n, dtype=float) * 900_000,
+        'open': open_,
+        'high': np.maximum(open_, close) * (1 + rng.uniform(0, 0.002, n)),
+        'low': np.minimum(open_, close) * (1 - rng.uniform(0, 0.002, n)),
+        'close': close,
+        'volume': rng.uniform(100, 10_000, n),
+    })
+
+
+def test_mesma_janela_duas_vezes():
+    calc = CalculadoraIncremental()
+    df = gerar_candles(400)
+    primeira = calc.adicionar_todos(df, "BTCUSDT", "15m")
+    segunda = calc.adicionar_todos(df, "BTCUSDT", "15m")
+    pd.testing.assert_frame_equal(primeira, segunda)
+
+
+def test_janela_termina_no_ultimo_fechado():
+    # O candle 399 entra no estado quando a janela seguinte chega até o 400
+    calc = CalculadoraIncremental()
+    df = gerar_candles(401)
+    calc.adicionar_todos(df, "BTCUSDT", "15m")
+    fechados = df.iloc[:-1]
+    resultado = calc.adicionar_todos(fechados, "BTCUSDT", "15m")
+    esperado = Calculadora.adicionar_todos(fechados.copy())
+    np.testing.assert_allclose(resultado[COLUNAS_INCREMENTAIS].iloc[-1].to_numpy(float),
+                               esperado[COLUNAS_INCREMENTAIS].iloc[-1].to_numpy(float), rtol=1e-9, atol=1e-9)
@@ -4,6 +4,7 @@ from sklearn.model_selection import train_test_split
 from sklearn.ensemble import RandomForestClassifier
 from sklearn.metrics import classification_report, confusion_matrix
 import joblib
+from armazem_dataset import carregar_dataset
 
 # --- CONFIGURAÇÕES ---
 ARQUIVO_DATASET = "dataset_treino_v1.csv"
@@ -12,7 +13,7 @@ ARQUIVO_MODELO = "modelo_ia_v1.pkl"
 def treinar():
     print("🧠 Carregando os dados para estudo...")
     try:
-        df = pd.read_csv(ARQUIVO_DATASET)
+        df = carregar_dataset(ARQUIVO_DATASET)
     except FileNotFoundError:
         print("❌ Erro: Arquivo 'dataset_treino_v1.csv' não encontrado.")
         print("   Rode o script 'gerar_dataset.py' primeiro!")
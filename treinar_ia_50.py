@@ -5,6 +5,7 @@ from sklearn.model_selection import train_test_split
 from sklearn.ensemble import HistGradientBoostingClassifier # <--- O NOVO MOTOR
 from sklearn.utils import class_weight
 import joblib
+from armazem_dataset import carregar_dataset
 
 ARQUIVO = "dataset_50_coins_norm.csv"
 ARQUIVO_MODELO = "modelo_ia_v5.pkl"
@@ -12,7 +13,7 @@ ARQUIVO_MODELO = "modelo_ia_v5.pkl"
 def treinar():
     print("🧠 Carregando Cérebro GBT (50 Moedas)...")
     try:
-        df = pd.read_csv(ARQUIVO)
+        df = carregar_dataset(ARQUIVO)
     except:
         print("❌ Rode o gerar_dataset_50.py primeiro!")
         return
@@ -4,6 +4,7 @@ import numpy as np
 from sklearn.model_selection import train_test_split
 from sklearn.ensemble import RandomForestClassifier
 import joblib
+from armazem_dataset import carregar_dataset
 
 ARQUIVO = "dataset_universe.csv"
 ARQUIVO_MODELO = "modelo_ia_v5.pkl" # Sobrescreve o antigo V5
@@ -11,7 +12,7 @@ ARQUIVO_MODELO = "modelo_ia_v5.pkl" # Sobrescreve o antigo V5
 def treinar():
     print("🧠 Treinando CÉREBRO GENERALISTA (10 Moedas)...")
     try:
-        df = pd.read_csv(ARQUIVO)
+        df = carregar_dataset(ARQUIVO)
     except:
         print("❌ Arquivo não encontrado!")
         return